@@ -0,0 +1,340 @@
+import math
+import os
+import time
+from array import array
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+
+from job_store import DATE_FORMAT, parse_timestamp
+
+if TYPE_CHECKING:
+    from calibration_history import CalibrationHistory
+
+# -------------------------
+# Configuration
+# -------------------------
+# Robust z-score above which a job or calibration snapshot is a candidate (Iglewicz & Hoaglin)
+ANOMALY_Z_THRESHOLD = float(os.getenv("ANOMALY_Z_THRESHOLD", "3.5"))
+# Jobs a backend needs before its queue and run times are screened
+ANOMALY_MIN_SAMPLES = int(os.getenv("ANOMALY_MIN_SAMPLES", "20"))
+# Width of the sliding window in which ERROR jobs count as a burst, and the fewest errors that do
+ANOMALY_ERROR_WINDOW = float(os.getenv("ANOMALY_ERROR_WINDOW", "3600"))
+ANOMALY_ERROR_BURST = int(os.getenv("ANOMALY_ERROR_BURST", "5"))
+# Calibration snapshots this far back from the newest one form its baseline
+ANOMALY_CALIBRATION_DAYS = float(os.getenv("ANOMALY_CALIBRATION_DAYS", "30"))
+ANOMALY_CALIBRATION_MIN_SNAPSHOTS = 5
+
+# Make the MAD (and the mean absolute deviation, used when over half the samples are
+# identical) consistent estimators of the standard deviation for normal data
+MAD_SCALE = 0.6745
+MEAN_AD_SCALE = 0.7979
+# Calibration medians screened for regressions: +1 when a rise is worse, -1 when a drop is
+CALIBRATION_METRICS = {"T1": -1, "T2": -1, "readout_error": 1, "2q_error": 1, "sx_error": 1}
+SEVERITIES = ("low", "medium", "high")
+
+
+def _seconds(value) -> float:
+    """"12.5s" (as in status_and_usage) or a number, NaN when unknown"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str) and value.endswith("s"):
+        try:
+            return float(value[:-1])
+        except ValueError:
+            pass
+    return math.nan
+
+
+def _format_time(ts: float) -> str:
+    return time.strftime(DATE_FORMAT, time.gmtime(ts))
+
+
+def severity(score: float) -> str:
+    """score is how many times over its threshold a candidate is"""
+    return "high" if score >= 2 else "medium" if score >= 1.5 else "low"
+
+
+def robust_z(values, baseline):
+    """(values - median) in robust standard deviations of baseline; None when baseline has no spread"""
+    import numpy as np
+
+    median = np.median(baseline)
+    mad = np.median(np.abs(baseline - median))
+    if mad > 0:
+        return MAD_SCALE * (values - median) / mad, float(median)
+    mean_ad = np.mean(np.abs(baseline - median))
+    if mean_ad > 0:
+        return MEAN_AD_SCALE * (values - median) / mean_ad, float(median)
+    return None, float(median)
+
+
+class _BackendJobs:
+    """Columns of one backend's jobs; a job that changes state is updated in place"""
+
+    __slots__ = ("ids", "index", "submitted", "pending", "elapsed", "errors")
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.submitted = array("d")
+        self.pending = array("d")
+        self.elapsed = array("d")
+        self.errors = array("b")
+
+    def set(self, job_id: str, submitted: float, pending: float, elapsed: float, error: bool) -> bool:
+        i = self.index.get(job_id)
+        if i is None:
+            self.index[job_id] = len(self.ids)
+            self.ids.append(job_id)
+            self.submitted.append(submitted)
+            self.pending.append(pending)
+            self.elapsed.append(elapsed)
+            self.errors.append(error)
+            return True
+        row = (self.submitted[i], self.pending[i], self.elapsed[i], self.errors[i])
+        # NaN != NaN, so compare the representations
+        if repr(row) == repr((submitted, pending, elapsed, int(error))):
+            return False
+        self.submitted[i], self.pending[i], self.elapsed[i], self.errors[i] = submitted, pending, elapsed, error
+        return True
+
+    def remove(self, job_id: str) -> bool:
+        """Drops a job by moving the last row into its place"""
+        i = self.index.pop(job_id, None)
+        if i is None:
+            return False
+        last = len(self.ids) - 1
+        if i != last:
+            self.ids[i] = self.ids[last]
+            self.index[self.ids[i]] = i
+            for column in (self.submitted, self.pending, self.elapsed, self.errors):
+                column[i] = column[last]
+        self.ids.pop()
+        for column in (self.submitted, self.pending, self.elapsed, self.errors):
+            column.pop()
+        return True
+
+
+class AnomalyDetector:
+    """Screens ingested jobs for statistical anomalies so only a few candidates need explaining.
+
+    Queue (pending_time) and run (elapsed_time of COMPLETED jobs) times are compared with
+    their backend's median in robust z-scores (MAD based, of log seconds); ERROR jobs are searched for
+    windows holding far more errors than the backend's overall error rate predicts.
+    Results are recomputed only after new ingestions.
+    """
+
+    def __init__(
+        self,
+        z_threshold: float = ANOMALY_Z_THRESHOLD,
+        min_samples: int = ANOMALY_MIN_SAMPLES,
+        error_window: float = ANOMALY_ERROR_WINDOW,
+        error_burst: int = ANOMALY_ERROR_BURST,
+    ):
+        self.z_threshold = z_threshold
+        self.min_samples = min_samples
+        self.error_window = error_window
+        self.error_burst = error_burst
+        self._backends: Dict[str, _BackendJobs] = {}
+        self._job_backend: Dict[str, str] = {}
+        self.version = 0
+        self._screened: Optional[tuple] = None
+
+    # -------------------------
+    # Ingestion
+    # -------------------------
+    def ingest(self, record: dict):
+        job_id = record.get("job_id")
+        if not job_id or "error" in record:
+            return
+        submitted = parse_timestamp(record.get("submitted"))
+        status = record.get("status")
+        usage = record.get("status_and_usage") or {}
+        elapsed = float(record.get("elapsed_time") or 0)
+        backend = self._job_backend.setdefault(job_id, record.get("backend") or "Unknown")
+        jobs = self._backends.get(backend)
+        if jobs is None:
+            jobs = self._backends[backend] = _BackendJobs()
+        if jobs.set(
+            job_id,
+            submitted if submitted is not None else math.nan,
+            _seconds(usage.get("pending_time")),
+            elapsed if status == "COMPLETED" and elapsed > 0 else math.nan,
+            status == "ERROR",
+        ):
+            self.version += 1
+
+    def ingest_many(self, records: Iterable[dict]):
+        for record in records:
+            self.ingest(record)
+
+    def remove_many(self, job_ids: Iterable[str]):
+        """Drops jobs deleted upstream"""
+        for job_id in job_ids:
+            backend = self._job_backend.pop(job_id, None)
+            if backend is not None and self._backends[backend].remove(job_id):
+                self.version += 1
+
+    # -------------------------
+    # Screening
+    # -------------------------
+    def screen_jobs(self) -> List[dict]:
+        """Queue time, run time and error burst candidates of every backend"""
+        if self._screened is None or self._screened[0] != self.version:
+            candidates = []
+            for backend, jobs in self._backends.items():
+                candidates += self._time_outliers(backend, jobs)
+                candidates += self._error_bursts(backend, jobs)
+            self._screened = (self.version, candidates)
+        return self._screened[1]
+
+    def _time_outliers(self, backend: str, jobs: _BackendJobs) -> List[dict]:
+        import numpy as np
+
+        candidates = []
+        submitted = np.array(jobs.submitted)
+        for kind, column, label in (("queue_time", jobs.pending, "in the queue"), ("run_time", jobs.elapsed, "running")):
+            values = np.array(column)
+            known = np.isfinite(values)
+            if kind == "queue_time":
+                # A job that started before it was created points at clock or history problems
+                for i in np.flatnonzero(known & (values < 0)):
+                    candidates.append({
+                        "kind": "inconsistent_timeline",
+                        "job_id": jobs.ids[i],
+                        "backend": backend,
+                        "submitted": _format_time(submitted[i]) if np.isfinite(submitted[i]) else None,
+                        "value_seconds": round(float(values[i]), 2),
+                        "severity": "high",
+                        "score": 2.0,
+                        "detail": f"Started running {-values[i]:.0f}s before it was created",
+                    })
+                known &= values >= 0
+            if known.sum() < self.min_samples:
+                continue
+            # Waits and run times are right-skewed, so they are compared on a log scale
+            logs = np.log1p(values[known])
+            z, median = robust_z(logs, logs)
+            if z is None:
+                continue
+            median = math.expm1(median)
+            rows = np.flatnonzero(known)
+            for j in np.flatnonzero(z > self.z_threshold):
+                i, score = rows[j], float(z[j]) / self.z_threshold
+                candidates.append({
+                    "kind": kind,
+                    "job_id": jobs.ids[i],
+                    "backend": backend,
+                    "submitted": _format_time(submitted[i]) if np.isfinite(submitted[i]) else None,
+                    "value_seconds": round(float(values[i]), 2),
+                    "backend_median_seconds": round(median, 2),
+                    "robust_z": round(float(z[j]), 2),
+                    "severity": severity(score),
+                    "score": round(score, 3),
+                    "detail": (
+                        f"Spent {values[i]:.0f}s {label} on {backend} against a backend median of {median:.0f}s "
+                        f"(robust z-score {z[j]:.1f})"
+                    ),
+                })
+        return candidates
+
+    def _error_bursts(self, backend: str, jobs: _BackendJobs) -> List[dict]:
+        import numpy as np
+
+        submitted = np.array(jobs.submitted)
+        errors = np.array(jobs.errors, dtype=bool) & np.isfinite(submitted)
+        if errors.sum() < self.error_burst:
+            return []
+        order = np.argsort(submitted[errors], kind="stable")
+        times = submitted[errors][order]
+        ids = np.flatnonzero(errors)[order]
+        all_times = np.sort(submitted[np.isfinite(submitted)])
+        # Errors a window would hold if they arrived at the backend's overall rate
+        span = max(self.error_window, all_times[-1] - all_times[0])
+        expected = times.size / span * self.error_window
+        needed = max(self.error_burst, expected + 3 * math.sqrt(expected))
+
+        ends = np.searchsorted(times, times + self.error_window, side="right")
+        counts = ends - np.arange(times.size)
+        candidates, next_free = [], 0
+        for i in np.flatnonzero(counts >= needed):
+            if i < next_free:
+                continue  # Overlaps the burst already reported
+            end = ends[i]
+            jobs_in_window = int(np.searchsorted(all_times, times[i] + self.error_window, side="right")
+                                 - np.searchsorted(all_times, times[i], side="left"))
+            score = float(counts[i]) / needed
+            candidates.append({
+                "kind": "error_burst",
+                "backend": backend,
+                "start": _format_time(times[i]),
+                "end": _format_time(times[end - 1]),
+                "errors": int(counts[i]),
+                "jobs": jobs_in_window,
+                "expected_errors": round(float(expected), 2),
+                "job_ids": [jobs.ids[j] for j in ids[i:end][:20]],
+                "severity": severity(score),
+                "score": round(score, 3),
+                "detail": (
+                    f"{counts[i]} of {jobs_in_window} jobs on {backend} failed within "
+                    f"{self.error_window / 60:.0f} min, where {expected:.1f} errors would be typical"
+                ),
+            })
+            next_free = end
+        return candidates
+
+    def stats(self) -> dict:
+        return {
+            "jobs": len(self._job_backend),
+            "backends": len(self._backends),
+            "candidates": len(self._screened[1]) if self._screened else None,
+        }
+
+
+def calibration_regressions(
+    history: "CalibrationHistory",
+    z_threshold: float = ANOMALY_Z_THRESHOLD,
+    days: float = ANOMALY_CALIBRATION_DAYS,
+) -> List[dict]:
+    """Backends whose newest archived calibration is much worse than their recent snapshots"""
+    import numpy as np
+
+    candidates = []
+    for backend in history.backends():
+        for metric, worse in CALIBRATION_METRICS.items():
+            try:
+                found = history.series(backend, metric, -math.inf, math.inf)
+            except ValueError:
+                continue  # Metric not reported by this backend
+            if found is None or not len(found[0]):
+                continue
+            times, values = found
+            recent = np.isfinite(values) & (times >= times[-1] - days * 86400)
+            if not np.isfinite(values[-1]) or recent.sum() <= ANOMALY_CALIBRATION_MIN_SNAPSHOTS:
+                continue
+            recent[-1] = False
+            z, median = robust_z(values[-1:], values[recent])
+            if z is None or worse * z[0] <= z_threshold:
+                continue
+            score = float(worse * z[0]) / z_threshold
+            change = values[-1] / median - 1 if median else math.inf
+            candidates.append({
+                "kind": "calibration_regression",
+                "backend": backend,
+                "metric": metric,
+                "snapshot": _format_time(times[-1]),
+                "latest": float(values[-1]),
+                "baseline_median": median,
+                "baseline_snapshots": int(recent.sum()),
+                "robust_z": round(float(z[0]), 2),
+                "severity": severity(score),
+                "score": round(score, 3),
+                "detail": (
+                    f"Median {metric} on {backend} is {values[-1]:.4g} in the latest calibration, "
+                    f"{change:+.0%} against the {median:.4g} of the previous {days:.0f} days"
+                ),
+            })
+    return candidates
+
+
+def rank_candidates(candidates: List[dict]) -> List[dict]:
+    return sorted(candidates, key=lambda c: (SEVERITIES.index(c["severity"]), c["score"]), reverse=True)
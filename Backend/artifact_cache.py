@@ -0,0 +1,183 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+from instrumentation import cache_event
+from serialization import encode_json
+
+logger = logging.getLogger("quantum-tracker")
+
+# -------------------------
+# Configuration
+# -------------------------
+ARTIFACT_CACHE_DIR = os.getenv(
+    "ARTIFACT_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "artifacts")
+)
+ARTIFACT_CACHE_MAX_BYTES = int(os.getenv("ARTIFACT_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+
+class ArtifactCache:
+    """Content-addressed on-disk cache for immutable job artifacts, bounded by LRU eviction.
+
+    Blobs are stored once per SHA-256 digest under objects/; an SQLite index maps
+    keys (e.g. "<job_id>:result") to digests and tracks last access for eviction. The bytes
+    on disk are kept as a running total in the same index, so workers sharing the directory
+    see one figure.
+    """
+
+    def __init__(self, root: str = ARTIFACT_CACHE_DIR, max_bytes: int = ARTIFACT_CACHE_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(root, "index.sqlite3"), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS artifacts ("
+                "key TEXT PRIMARY KEY, digest TEXT NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_artifacts_access ON artifacts (last_access)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_artifacts_digest ON artifacts (digest)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS usage (id INTEGER PRIMARY KEY CHECK (id = 0), bytes INTEGER NOT NULL)"
+            )
+            # Indexes from before the running total: count their blobs once
+            self._conn.execute(
+                "INSERT OR IGNORE INTO usage (id, bytes) SELECT 0, COALESCE(SUM(size), 0) "
+                "FROM (SELECT MAX(size) AS size FROM artifacts GROUP BY digest)"
+            )
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.root, "objects", digest[:2], digest)
+
+    # -------------------------
+    # Blocking API
+    # -------------------------
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute("SELECT digest FROM artifacts WHERE key = ?", (key,)).fetchone()
+            if row:
+                with self._conn:
+                    self._conn.execute("UPDATE artifacts SET last_access = ? WHERE key = ?", (time.time(), key))
+        # Keys look like "<job_id>:result"; the artifact kind labels the metric
+        kind = key.rsplit(":", 1)[-1]
+        if not row:
+            self.misses += 1
+            cache_event("artifacts", kind, "misses")
+            return None
+        try:
+            with open(self._blob_path(row[0]), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            self.misses += 1
+            cache_event("artifacts", kind, "misses")
+            self.delete(key)
+            return None
+        self.hits += 1
+        cache_event("artifacts", kind, "hits")
+        return data
+
+    def put(self, key: str, data: bytes):
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        with self._lock, self._conn:
+            previous = self._conn.execute("SELECT digest, size FROM artifacts WHERE key = ?", (key,)).fetchone()
+            stored = self._referenced(digest)
+            self._conn.execute(
+                "INSERT INTO artifacts (key, digest, size, last_access) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET digest = excluded.digest, size = excluded.size, "
+                "last_access = excluded.last_access",
+                (key, digest, len(data), time.time()),
+            )
+            if not stored:
+                self._add_usage(len(data))
+            if previous and previous[0] != digest:
+                self._release(*previous)
+            total = self._usage()
+        if total > self.max_bytes:
+            self._evict()
+
+    def delete(self, key: str):
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT digest, size FROM artifacts WHERE key = ?", (key,)).fetchone()
+            self._conn.execute("DELETE FROM artifacts WHERE key = ?", (key,))
+            if row:
+                self._release(*row)
+
+    def _referenced(self, digest: str) -> bool:
+        return self._conn.execute("SELECT 1 FROM artifacts WHERE digest = ? LIMIT 1", (digest,)).fetchone() is not None
+
+    def _usage(self) -> int:
+        return self._conn.execute("SELECT bytes FROM usage WHERE id = 0").fetchone()[0]
+
+    def _add_usage(self, delta: int):
+        self._conn.execute("UPDATE usage SET bytes = MAX(bytes + ?, 0) WHERE id = 0", (delta,))
+
+    def _release(self, digest: str, size: int):
+        """Drops the blob and its bytes from the total once no key refers to it"""
+        if self._referenced(digest):
+            return
+        self._add_usage(-size)
+        try:
+            os.remove(self._blob_path(digest))
+        except FileNotFoundError:
+            pass
+
+    def size(self) -> int:
+        """Bytes on disk; blobs shared by several keys are counted once"""
+        with self._lock:
+            return self._usage()
+
+    def _evict(self):
+        with self._lock, self._conn:
+            total = self._usage()
+            if total <= self.max_bytes:
+                return
+            rows = self._conn.execute("SELECT key, digest, size FROM artifacts ORDER BY last_access").fetchall()
+            for key, digest, size in rows:
+                if total <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM artifacts WHERE key = ?", (key,))
+                self._release(digest, size)
+                total = self._usage()
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM artifacts").fetchone()[0]
+        return {
+            "entries": entries,
+            "bytes": self.size(),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    # -------------------------
+    # Async JSON helpers
+    # -------------------------
+    async def get_json(self, key: str) -> Optional[Any]:
+        data = await asyncio.to_thread(self.get, key)
+        return json.loads(data) if data is not None else None
+
+    async def put_json(self, key: str, value: Any) -> bytes:
+        """Stores value encoded as responses encode it; returns those bytes"""
+        data = encode_json(value)
+        await asyncio.to_thread(self.put, key, data)
+        return data
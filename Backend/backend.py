@@ -1,18 +1,81 @@
 import logging
 import hashlib
+import hmac
+import json
 import os
-from datetime import timezone
-from typing import Any, Optional, List
+import random
+import time
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Optional, List
 import asyncio
+from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from qiskit_ibm_runtime import QiskitRuntimeService, Sampler, Options
-from qiskit.circuit.library import RealAmplitudes
-from qiskit import QuantumCircuit
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 
+from sdk_executor import SDKExecutor, call_accessor, collect_failures, report_failure, safe_call
+from job_store import (
+    JobStore,
+    JobSync,
+    StoreFollower,
+    JOB_SYNC_ENABLED,
+    JOB_SYNC_INTERVAL,
+    DATE_FORMAT,
+    TERMINAL_STATUSES,
+    parse_timestamp,
+)
+from ttl_cache import TieredTTLCache
+from artifact_cache import ArtifactCache
+from ibm_cloud_client import IBMCloudClient
+from rest_jobs import JOB_LIST_SOURCE, iter_rest_jobs, rest_job_fields
+from event_stream import EventHub, BackendStatusPoller, StatusSnapshotFollower, BACKEND_POLL_INTERVAL, sse_events
+from shared_state import LeaderElection, SharedJSONCache, open_shared_cache
+from metrics_engine import MetricsEngine, WINDOWS
+from queue_eta import QueueETA
+from conditional import decode_since, encode_since, etag_headers, make_etag, not_modified
+from serialization import (
+    JSON,
+    content_encoding,
+    encode_document,
+    encode_json,
+    encode_records,
+    encode_stored,
+    encoded_response,
+    fragments,
+    join_array,
+    merge_objects,
+    negotiate,
+    respond,
+)
+from dashboard_summary import DashboardRollup, SUMMARY_WINDOWS, parse_tz
+from anomalies import AnomalyDetector, calibration_regressions, rank_candidates
+from upstream_scheduler import LaneMiddleware, is_rate_limited
+from instrumentation import (
+    InstrumentationMiddleware,
+    TimedRoute,
+    api_speed_ms,
+    profiler,
+    registry,
+    slow_traces,
+    span,
+    upstream,
+)
+from job_streaming import (
+    NDJSON_MEDIA_TYPE,
+    decode_cursor,
+    stream_converted,
+    stream_from_store,
+)
+
+# qiskit, qiskit_ibm_runtime and numpy are imported on first use so workers boot fast
+if TYPE_CHECKING:
+    from batch_submit import BatchSubmitter
+    from calibration import CalibrationArrays
+    from calibration_history import CalibrationHistory
+
 # Load environment variables from .env file
 # Load environment variables from .env file
 load_dotenv()
@@ -29,6 +92,40 @@ os.environ["REQUESTS_CA_BUNDLE"] = certifi.where()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("quantum-tracker")
 
+# Blocking SDK accessors run here so the event loop stays free while
+# hundreds of jobs are converted concurrently (see SDK_* env vars)
+sdk_executor = SDKExecutor()
+
+# Backend objects, status, configuration and calibration each expire on their own TTL
+backend_cache = TieredTTLCache()
+
+# Job records, rendered backend snapshots and the sync lease are shared by every worker,
+# so upstream traffic does not grow with the number of uvicorn workers
+shared_cache = open_shared_cache()
+shared_json = SharedJSONCache(shared_cache)
+leader = LeaderElection(shared_cache)
+
+# Summaries, results, circuits and inputs of finished jobs never change, so they are kept on disk
+artifact_cache = ArtifactCache()
+
+# Batch submissions reuse transpiled circuits per (circuit hash, backend, optimization level);
+# created on the first batch since it pulls in the transpiler
+batch_submitter: Optional["BatchSubmitter"] = None
+
+# Calibration snapshots archived per backend for trend queries; the leader appends a
+# snapshot whenever a backend's properties report a new last_update_date
+calibration_history: Optional["CalibrationHistory"] = None
+CALIBRATION_ARCHIVE_INTERVAL = float(os.getenv("CALIBRATION_ARCHIVE_INTERVAL", "900"))
+CALIBRATION_HISTORY_DAYS = 30
+
+# Batch results are kept per idempotency key so a client retrying a slow submission does not submit twice
+SUBMIT_IDEMPOTENCY_TTL = float(os.getenv("SUBMIT_IDEMPOTENCY_TTL", "86400"))
+SUBMISSION_PENDING = b"pending"
+
+# The debug endpoints expose stack samples and request paths; they answer only requests whose
+# X-Debug-Token header carries this token, and are off (404) while it is unset
+DEBUG_API_TOKEN = os.getenv("DEBUG_API_TOKEN", "")
+
 # -------------------------
 # IBM Quantum Credentials
 # -------------------------
@@ -36,33 +133,49 @@ TOKEN = os.getenv("IBM_QUANTUM_TOKEN", "")
 INSTANCE = os.getenv("IBM_QUANTUM_INSTANCE", "")
 CHANNEL = os.getenv("IBM_QUANTUM_CHANNEL", "ibm_cloud")
 
-# Only attempt to connect if credentials are provided
+SERVICE_CONNECT_RETRIES = int(os.getenv("SERVICE_CONNECT_RETRIES", "5"))
+SERVICE_CONNECT_BACKOFF = float(os.getenv("SERVICE_CONNECT_BACKOFF", "2"))
+
+# The service is connected in the background once the app has started (see lifespan),
+# so a slow IAM endpoint never blocks worker boot; endpoints return 503 until then
 service = None
-if TOKEN and INSTANCE:
-    try:
-        service = QiskitRuntimeService(
-            channel=CHANNEL,
-            token=TOKEN,
-            instance=INSTANCE,
-        )
-        logger.info("✅ Connected to IBM Quantum Runtime service")
-    except Exception as e:
-        logger.exception("❌ Failed to connect to IBM Quantum: %s", e)
-        logger.warning("⚠️  Running without live IBM Quantum connection - API endpoints may fail")
-else:
+service_status = "connecting" if TOKEN and INSTANCE else "disabled"
+service_error: Optional[str] = None
+STARTED_AT = time.time()
+
+if not (TOKEN and INSTANCE):
     logger.warning("⚠️  IBM Quantum credentials not found in environment variables")
     logger.warning("⚠️  Set IBM_QUANTUM_TOKEN and IBM_QUANTUM_INSTANCE in .env file")
     logger.warning("⚠️  Running without live IBM Quantum connection - API endpoints may fail")
 
-# -------------------------
-# Startup Check (Merged from debug_ibm.py)
-# -------------------------
-if service:
+# Listing views read the REST jobs endpoint directly instead of hydrating RuntimeJob objects
+cloud_client = None
+if TOKEN and INSTANCE and CHANNEL == "ibm_cloud" and JOB_LIST_SOURCE == "rest":
+    # REST calls share the SDK's rate limit and priority lanes
+    cloud_client = IBMCloudClient(TOKEN, INSTANCE, scheduler=sdk_executor.scheduler)
+
+
+def connect_service():
+    """Connects to IBM Quantum and discovers backends (blocking; runs off the event loop)"""
+    from qiskit_ibm_runtime import QiskitRuntimeService
+
+    connected = QiskitRuntimeService(
+        channel=CHANNEL,
+        token=TOKEN,
+        instance=INSTANCE,
+    )
+    logger.info("✅ Connected to IBM Quantum Runtime service")
+
+    # -------------------------
+    # Startup Check (Merged from debug_ibm.py)
+    # -------------------------
     try:
-        backends = service.backends()
+        backends = connected.backends()
+        backend_cache.set("backends", "*", backends)
         logger.info(f"✅ Found {len(backends)} available backends: {[b.name for b in backends]}")
     except Exception as e:
         logger.error(f"❌ Failed to fetch backends on startup: {e}")
+    return connected
 
 # -------------------------
 # Pydantic Models
@@ -73,10 +186,225 @@ class JobSubmission(BaseModel):
     params: Optional[dict] = {}
 
 
+# Templates are built in-process before transpilation, so their size is bounded by the
+# largest device rather than left to the caller
+class BatchCircuit(BaseModel):
+    qasm: Optional[str] = None
+    template: Optional[str] = None
+    num_qubits: int = Field(2, ge=1, le=1200)
+    reps: int = Field(1, ge=1, le=20)
+    parameter_values: Optional[List[List[float]]] = None
+
+
+class BatchSubmission(BaseModel):
+    backend: str
+    circuits: List[BatchCircuit]
+    shots: int = Field(1024, ge=1, le=100_000)
+    optimization_level: int = Field(1, ge=0, le=3)
+    # Retries carrying the same key get the first submission's jobs instead of new ones
+    idempotency_key: Optional[str] = Field(None, min_length=1, max_length=128)
+
+
+class RecommendRequest(BaseModel):
+    # Either the gate mix of the circuit, or its OpenQASM source to derive it from
+    num_qubits: Optional[int] = None
+    two_qubit_gates: int = 0
+    single_qubit_gates: int = 0
+    measurements: Optional[int] = None
+    qasm: Optional[str] = None
+    fidelity_weight: float = 1.0
+    turnaround_weight: float = 1.0
+    include_simulators: bool = False
+    limit: int = 5
+
+
+# -------------------------
+# Background Sync
+# -------------------------
+# Jobs are mirrored into a local store so list/metrics requests become local queries
+job_store: Optional[JobStore] = None
+job_sync: Optional[JobSync] = None
+
+# Job transitions and backend status deltas for /api/stream, fed by one shared poller
+event_hub = EventHub()
+
+# Running aggregates behind /api/metrics, updated as the sync ingests jobs
+metrics_engine = MetricsEngine()
+
+# Queue wait sketches per backend behind /api/backends/{name}/eta, fed by the same changes
+queue_eta = QueueETA()
+
+# Robust outlier screening behind /api/anomalies, so the AI flow only explains a few candidates
+anomaly_detector = AnomalyDetector()
+
+# Status histograms behind /api/dashboard/summary, so the dashboard needs no raw job list to chart
+dashboard_rollup = DashboardRollup()
+
+
+background_tasks: List[asyncio.Task] = []
+# Loops of this worker's current role (leader: upstream sync; follower: shared state)
+role_tasks: List[asyncio.Task] = []
+status_poller: Optional[BackendStatusPoller] = None
+
+STATUS_SNAPSHOT_KEY = "backends:status"
+# The store is served while the leader's last sync is at most this old
+STORE_MAX_AGE = max(4 * JOB_SYNC_INTERVAL, 60)
+
+
+async def share_status_snapshot(snapshot: dict):
+    await shared_json.set_json(STATUS_SNAPSHOT_KEY, snapshot, ttl=BACKEND_POLL_INTERVAL * 4)
+
+
+def switch_role(is_leader: bool):
+    """Runs upstream loops on the leader; other workers tail the shared store and status snapshot"""
+    global job_sync, status_poller
+    for task in role_tasks:
+        task.cancel()
+    role_tasks.clear()
+    job_sync = None
+
+    previous = status_poller
+    if is_leader:
+        status_poller = BackendStatusPoller(
+            event_hub, get_backends, get_backend_status, on_snapshot=share_status_snapshot
+        )
+    else:
+        status_poller = StatusSnapshotFollower(event_hub, lambda: shared_json.get_json(STATUS_SNAPSHOT_KEY))
+    if previous:
+        status_poller.snapshot = previous.snapshot
+    status_poller.listeners.append(queue_eta.observe_depths)
+    role_tasks.append(asyncio.create_task(status_poller.run()))
+
+    if job_store:
+        if is_leader:
+            job_sync = JobSync(job_store, service, lambda job: job_to_dict(job, lite=True), sdk_executor.run)
+            changes = job_sync
+        else:
+            changes = StoreFollower(job_store)
+        changes.listeners.append(metrics_engine.ingest_many)
+        changes.listeners.append(queue_eta.ingest_many)
+        changes.listeners.append(anomaly_detector.ingest_many)
+        changes.listeners.append(dashboard_rollup.ingest_many)
+        changes.listeners.append(event_hub.observe_changes)
+        changes.transition_listeners.append(event_hub.publish_job_changes)
+        for aggregate in (metrics_engine, queue_eta, anomaly_detector, dashboard_rollup):
+            changes.removal_listeners.append(aggregate.remove_many)
+        role_tasks.append(asyncio.create_task(changes.run()))
+
+    if is_leader:
+        role_tasks.append(asyncio.create_task(archive_calibrations()))
+
+
+def start_service_tasks():
+    """Opens the shared job store and joins the leader election once the service is available"""
+    global job_store
+    if JOB_SYNC_ENABLED:
+        job_store = JobStore()
+        stored = job_store.list_jobs(limit=None)
+        metrics_engine.ingest_many(stored)
+        queue_eta.ingest_many(stored)
+        anomaly_detector.ingest_many(stored)
+        dashboard_rollup.ingest_many(stored)
+        logger.info(f"🗄️ Job store at {job_store.path} ({job_store.count()} jobs cached)")
+        # Stream event ids carry the store's version, so clients can resume on any worker
+        event_hub.attach(job_store.store_id, job_store.version())
+    if switch_role not in leader.listeners:
+        leader.listeners.append(switch_role)
+    background_tasks.append(asyncio.create_task(leader.run()))
+
+
+async def initialize_service():
+    """Connects in the background, retrying with jittered exponential backoff"""
+    global service, service_status, service_error
+    for attempt in range(SERVICE_CONNECT_RETRIES + 1):
+        try:
+            service = await asyncio.to_thread(connect_service)
+            service_status, service_error = "connected", None
+            logger.info(f"🚀 Service ready {time.time() - STARTED_AT:.1f}s after startup")
+            start_service_tasks()
+            return
+        except Exception as e:
+            service_error = str(e)
+            logger.exception("❌ Failed to connect to IBM Quantum: %s", e)
+            if attempt == SERVICE_CONNECT_RETRIES:
+                break
+            await asyncio.sleep(random.uniform(0, SERVICE_CONNECT_BACKOFF * (2 ** attempt)))
+    service_status = "failed"
+    logger.warning("⚠️  Running without live IBM Quantum connection - API endpoints may fail")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global service_status
+    if service:
+        # Already provided (e.g. a fake service in the benchmarks)
+        service_status = "connected"
+        start_service_tasks()
+    elif TOKEN and INSTANCE:
+        background_tasks.append(asyncio.create_task(initialize_service()))
+    if cloud_client:
+        cloud_client.start()
+    yield
+    tasks = list(background_tasks) + role_tasks
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    background_tasks.clear()
+    role_tasks.clear()
+    await asyncio.to_thread(leader.release)
+    if cloud_client:
+        await cloud_client.close()
+    if job_store:
+        job_store.close()
+
+
+def store_ready() -> bool:
+    # Any worker serves from the shared store once the leader has synced it recently
+    return job_store is not None and job_store.synced_within(STORE_MAX_AGE)
+
+
+def get_calibration_history() -> "CalibrationHistory":
+    global calibration_history
+    if calibration_history is None:
+        from calibration_history import CalibrationHistory
+        calibration_history = CalibrationHistory()
+    return calibration_history
+
+
+async def archive_calibrations():
+    """Appends each backend's calibration to the history when its properties change (leader only)"""
+    while True:
+        try:
+            history = get_calibration_history()
+            for backend in await get_backends():
+                if getattr(backend, "simulator", False):
+                    continue
+                calibration = await backend_cache.get_or_load(
+                    "properties", backend.name, lambda backend=backend: sdk_executor.run(load_calibration, backend)
+                )
+                if calibration is not None and await asyncio.to_thread(history.append, backend.name, calibration):
+                    logger.info(f"📈 Archived {backend.name} calibration of {calibration.last_update_date}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"❌ Calibration archive failed: {e}")
+        await asyncio.sleep(CALIBRATION_ARCHIVE_INTERVAL)
+
+
+def get_batch_submitter() -> "BatchSubmitter":
+    global batch_submitter
+    if batch_submitter is None:
+        from batch_submit import BatchSubmitter
+        batch_submitter = BatchSubmitter(sdk_executor.run)
+    return batch_submitter
+
+
 # -------------------------
 # FastAPI app
 # -------------------------
-app = FastAPI(title="IBM Quantum Job Tracker")
+app = FastAPI(title="IBM Quantum Job Tracker", lifespan=lifespan)
+# Every route records its endpoint and serialization time in the request trace
+app.router.route_class = TimedRoute
 
 app.add_middleware(
     CORSMiddleware,
@@ -85,6 +413,20 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Listings and feeds the dashboard refreshes on a timer; any other API request is a user
+# waiting on a detail view or an action. Background tasks keep the default "background" lane.
+DASHBOARD_PATHS = {
+    "/api/jobs", "/api/jobs/stream", "/api/metrics", "/api/dashboard/summary", "/api/backends", "/api/stream"
+}
+
+
+def request_lane(method: str, path: str) -> str:
+    return "dashboard" if path.rstrip("/") in DASHBOARD_PATHS else "interactive"
+
+
+app.add_middleware(LaneMiddleware, classify=request_lane)
+# Outermost: latency histograms, Server-Timing header and slow request profiles
+app.add_middleware(InstrumentationMiddleware)
 
 # -------------------------
 # Helpers
@@ -124,223 +466,283 @@ def mask_user_id(user_id: str) -> str:
     return f"user_{hashed[:6]}"
 
 
-def safe_call(obj, attr):
+# Accessors read for every job; depending on the SDK version each may hit the network
+JOB_ACCESSORS = (
+    "job_id",
+    "program_id",
+    "instance",
+    "user",
+    "status",
+    "creation_date",
+    "end_date",
+    "status_history",
+    "metrics",
+)
+
+
+def fetch_job_fields(job, accessors=JOB_ACCESSORS) -> dict:
+    """Accessor values, None for those that failed; the failed ones are listed under "failed"."""
+    fields, failed = {}, []
+    for attr in accessors:
+        # upstream() has to see the exception to count the call as an error
+        try:
+            with upstream(f"{type(job).__name__}.{attr}"):
+                fields[attr] = call_accessor(job, attr)
+        except Exception as e:
+            if is_rate_limited(e):
+                raise
+            fields[attr] = None
+            failed.append(attr)
+    fields["failed"] = failed
+    return fields
+
+
+# Times each accessor itself, so the SDK executor does not time the call as a whole
+fetch_job_fields.instrumented = True
+
+
+def local_backend_name(job) -> str:
+    """Backend name from attributes already on the job object (no network request)"""
+    if hasattr(job, "_backend_id"):
+        return str(job._backend_id) if job._backend_id else "Unknown"
+    if hasattr(job, "backend") and not callable(job.backend):
+        return str(job.backend) if job.backend else "Unknown"
+    return "Unknown"
+
+
+def region_from_instance(instance: Optional[str]) -> str:
+    # Region extraction (Best effort based on common CRN patterns)
+    if instance:
+        if "us-east" in instance: return "US East"
+        elif "eu-de" in instance: return "Europe (Frankfurt)"
+        elif "osaka" in instance: return "Asia Pacific (Osaka)"
+        elif "tokyo" in instance: return "Asia Pacific (Tokyo)"
+        elif "sydney" in instance: return "Asia Pacific (Sydney)"
+    return "Global"
+
+
+def running_since(status_history):
+    """Datetime of the first RUNNING transition in status_history, if any"""
+    for h in status_history or []:
+        # h can be a dict or an object depending on the SDK version/backend
+        h_status_raw = getattr(h, 'status', h.get('status') if isinstance(h, dict) else None)
+        h_time = getattr(h, 'datetime', h.get('datetime') if isinstance(h, dict) else None)
+        if normalize_status(h_status_raw) == "RUNNING" and h_time:
+            return h_time
+    return None
+
+
+JOB_RESOURCES = ("result", "circuit", "inputs")
+
+
+def job_resource_links(job_id: str) -> dict:
+    return {kind: f"/api/jobs/{job_id}/{kind}" for kind in JOB_RESOURCES}
+
+
+def job_inputs_payload(inputs: dict) -> dict:
+    pubs = inputs.get('pubs', [])
+    observables = inputs.get('observables', [])
+    return {
+        "pubs": str(pubs) if pubs else "N/A",
+        "observables": str(observables) if observables else "N/A",
+    }
+
+
+async def job_circuit_payload(job, inputs: dict) -> dict:
+    # Circuit Details (Diagram, Qasm, Qiskit)
+    qasm_str = "N/A"
+    qiskit_str = "N/A"
+    circuits = inputs.get('circuits', [])
+    if not circuits and 'circuit' in inputs:
+        circuits = [inputs['circuit']]
+
+    if circuits and len(circuits) > 0:
+        try:
+            target_circuit = circuits[0]
+            qasm_str = target_circuit.qasm() if hasattr(target_circuit, 'qasm') else "N/A"
+            qiskit_str = str(target_circuit)
+        except Exception as circ_e:
+            logger.debug(f"Error parsing circuit: {circ_e}")
+
+    return {
+        "diagram": await sdk_executor.call(job, "image"),  # Current image logic placeholder
+        "qasm": qasm_str,
+        "qiskit": qiskit_str
+    }
+
+
+async def job_result_payload(job, job_id: str, status: str):
+    if status != "COMPLETED":
+        return "N/A"
     try:
-        val = getattr(obj, attr, None)
-        return val() if callable(val) else val
-    except Exception:
-        return None
+        # result() is a blocking call, so it runs on the SDK worker pool
+        job_result = await sdk_executor.run(job.result)
+        if hasattr(job_result, 'get_counts'):
+            return job_result.get_counts()
+        # Fallback for complex result objects (SamplerV2/EstimatorV2)
+        return str(job_result)
+    except Exception as res_e:
+        logger.error(f"Error fetching results for job {job_id}: {res_e}")
+        return f"Error: {str(res_e)}"
+
+
+def job_summary(fields: dict, backend_name: str, is_simulator: bool = False) -> dict:
+    """Summary record shared by the SDK and REST listing paths, built from accessor values"""
+    # -------------------------
+    # 1. Basic Metadata
+    # -------------------------
+    job_id = fields["job_id"]
+    program_id = fields["program_id"]
+    instance = fields["instance"]
+    raw_user = fields["user"] or instance or "default"
+    masked_user = mask_user_id(str(raw_user))
+
+    # Fallback for simulator detection based on name
+    if "simulator" in str(backend_name).lower():
+        is_simulator = True
+        
+    mode = "Simulator" if is_simulator else "Real Quantum Computer"
+    
+    region = region_from_instance(instance)
+
+    # -------------------------
+    # 2. Status & Timeline
+    # -------------------------
+    status = normalize_status(fields["status"])
+    created = fields["creation_date"]
+    completed = fields["end_date"]
+    
+    # Format dates
+    created_iso = created.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S") if created else "N/A"
+    completed_iso = completed.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S") if completed else "N/A"
+    
+    # Calculate Total Completion Time
+    total_completion_time = "N/A"
+    if created and completed:
+        diff = completed - created
+        total_completion_time = f"{round(diff.total_seconds(), 2)}s"
+
+    # Calculate Pending and In Progress times from status history
+    status_history = fields["status_history"] or []
+    pending_time = "N/A"
+    in_progress_time = "N/A"
+    
+    in_progress_dt = running_since(status_history)
+    if in_progress_dt:
+        in_progress_time = in_progress_dt.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
 
+    if in_progress_dt and created:
+        pending_time = f"{round((in_progress_dt - created).total_seconds(), 2)}s"
 
-async def job_to_dict(job, lite: bool = False) -> dict:
+    # -------------------------
+    # 3. Usage & Metrics
+    # -------------------------
+    metrics = fields["metrics"] or {}
+    usage = metrics.get('usage', {})
+    qiskit_runtime_usage = f"{usage.get('seconds', 0)}s"
+    elapsed_seconds = diff.total_seconds() if created and completed else 0
+    qpu_seconds = usage.get('seconds', 0)
+
+    summary = {
+        "job_id": job_id,
+        "user": masked_user,
+        "region": region,
+        "program": program_id,
+        "instance": instance,
+        "mode": mode,
+        "quantum_computer": backend_name,
+        "backend": backend_name,
+        "submitted": created_iso,
+        "elapsed_time": elapsed_seconds,
+        "qpu_seconds": qpu_seconds,
+        "logs": "Logs available.",
+        "status": status,
+        "status_history": status_history,
+        "status_and_usage": {
+            "status": status,
+            "total_completion_time": total_completion_time,
+            "actual_qr_usage": usage,
+            "created": created_iso,
+            "pending_time": pending_time,
+            "in_progress": in_progress_time,
+            "qiskit_runtime_usage": qiskit_runtime_usage,
+            "completed": completed_iso,
+        },
+    }
+    return summary
+
+
+def lite_job_record(summary: dict) -> dict:
+    return {
+        **summary,
+        "logs": "Detailed logs not available in list view.",
+        "pubs": "N/A",
+        "result": "N/A",
+        "observables": "N/A",
+        "circuit": {
+            "diagram": None,
+            "qasm": "N/A",
+            "qiskit": "N/A"
+        }
+    }
+
+
+async def job_to_dict(job, lite: bool = False, details: bool = True) -> dict:
     try:
         # 🔍 Debug: Log available job attributes
         # logger.debug(f"[DEBUG] Job attributes: {dir(job)}")
 
-        # -------------------------
-        # 1. Basic Metadata
-        # -------------------------
-        job_id = safe_call(job, "job_id")
-        program_id = safe_call(job, "program_id")
-        instance = safe_call(job, "instance")
-        raw_user = safe_call(job, "user") or instance or "default"
-        masked_user = mask_user_id(str(raw_user))
+        # All SDK accessors are read in one worker call, off the event loop
+        fields = await sdk_executor.run(fetch_job_fields, job)
+        for attr in fields["failed"]:
+            report_failure(attr)
+
+        job_id = fields["job_id"]
 
         # -------------------------
-        # 2. Backend / Environment
+        # 1. Backend / Environment
         # -------------------------
         # OPTIMIZATION: Avoid calling job.backend() which triggers a network request
         backend_name = "Unknown"
         is_simulator = False
 
         # Fast path: Check internal attributes first
-        if hasattr(job, "_backend_id"): 
-            backend_name = str(job._backend_id) if job._backend_id else "Unknown"
-        elif hasattr(job, "backend") and not callable(job.backend):
-            backend_name = str(job.backend) if job.backend else "Unknown"
-        
+        backend_name = local_backend_name(job)
+
         # Slow path: Only fetch full backend object if NOT in lite mode
         if backend_name == "Unknown" and not lite:
             try:
-                backend = job.backend()
+                backend = await sdk_executor.run(job.backend)
                 backend_name = safe_call(backend, "name") or "Unknown"
                 is_simulator = getattr(backend, "simulator", False) if backend else False
             except Exception:
-                pass # Keep as Unknown if fetch fails
-
-        # Fallback for simulator detection based on name
-        if "simulator" in str(backend_name).lower():
-            is_simulator = True
-            
-        mode = "Simulator" if is_simulator else "Real Quantum Computer"
-        
-        # Region extraction (Best effort based on common CRN patterns)
-        region = "Global"
-        if instance:
-            if "us-east" in instance: region = "US East"
-            elif "eu-de" in instance: region = "Europe (Frankfurt)"
-            elif "osaka" in instance: region = "Asia Pacific (Osaka)"
-            elif "tokyo" in instance: region = "Asia Pacific (Tokyo)"
-            elif "sydney" in instance: region = "Asia Pacific (Sydney)"
+                report_failure("backend")  # Keep as Unknown if fetch fails
 
-        # -------------------------
-        # 3. Status & Timeline
-        # -------------------------
-        status = normalize_status(safe_call(job, "status"))
-        created = safe_call(job, "creation_date")
-        completed = safe_call(job, "end_date")
-        
-        # Format dates
-        created_iso = created.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S") if created else "N/A"
-        completed_iso = completed.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S") if completed else "N/A"
-        
-        # Calculate Total Completion Time
-        total_completion_time = "N/A"
-        if created and completed:
-            diff = completed - created
-            total_completion_time = f"{round(diff.total_seconds(), 2)}s"
-
-        # Calculate Pending and In Progress times from status history
-        status_history = safe_call(job, "status_history") or []
-        pending_time = "N/A"
-        in_progress_time = "N/A"
-        
-        in_progress_dt = None
-        for h in status_history:
-            # h can be a dict or an object depending on the SDK version/backend
-            h_status_raw = getattr(h, 'status', h.get('status') if isinstance(h, dict) else None)
-            h_status = normalize_status(h_status_raw)
-            h_time = getattr(h, 'datetime', h.get('datetime') if isinstance(h, dict) else None)
-            
-            if h_status == "RUNNING" and h_time:
-                in_progress_dt = h_time
-                in_progress_time = h_time.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
-                break
-        
-        if in_progress_dt and created:
-            pending_time = f"{round((in_progress_dt - created).total_seconds(), 2)}s"
-
-        # -------------------------
-        # 4. Usage & Metrics
-        # -------------------------
-        metrics = safe_call(job, "metrics") or {}
-        usage = metrics.get('usage', {})
-        qiskit_runtime_usage = f"{usage.get('seconds', 0)}s"
-        elapsed_seconds = diff.total_seconds() if created and completed else 0
-        qpu_seconds = usage.get('seconds', 0)
+        with span("convert"):
+            summary = job_summary(fields, backend_name, is_simulator)
+        status = summary["status"]
 
         # If lite mode, skip heavy details
         if lite:
-             return {
-                "job_id": job_id,
-                "user": masked_user,
-                "region": region,
-                "program": program_id,
-                "instance": instance,
-                "mode": mode,
-                "quantum_computer": backend_name,
-                "backend": backend_name,
-                "submitted": created_iso,
-                "elapsed_time": elapsed_seconds,
-                "qpu_seconds": qpu_seconds,
-                "logs": "Detailed logs not available in list view.",
-                "status": status,
-                "status_history": status_history,
-                "status_and_usage": {
-                    "status": status,
-                    "total_completion_time": total_completion_time,
-                    "actual_qr_usage": usage,
-                    "created": created_iso,
-                    "pending_time": pending_time,
-                    "in_progress": in_progress_time,
-                    "qiskit_runtime_usage": qiskit_runtime_usage,
-                    "completed": completed_iso,
-                },
-                "pubs": "N/A",
-                "result": "N/A",
-                "observables": "N/A",
-                "circuit": {
-                    "diagram": None,
-                    "qasm": "N/A",
-                    "qiskit": "N/A"
-                }
-            }
+            return lite_job_record(summary)
+
+        # Summary only: inputs, result and circuit are fetched lazily from sub-resources
+        if not details:
+            return {**summary, "resources": job_resource_links(job_id)}
 
         # -------------------------
-        # 5. Inputs (PUBs, Observables, Circuits)
-        # -------------------------
-        inputs = safe_call(job, "inputs") or {}
-        pubs = inputs.get('pubs', [])
-        observables = inputs.get('observables', [])
-        
-        # Circuit Details (Diagram, Qasm, Qiskit)
-        qasm_str = "N/A"
-        qiskit_str = "N/A"
-        circuits = inputs.get('circuits', [])
-        if not circuits and 'circuit' in inputs:
-            circuits = [inputs['circuit']]
-            
-        if circuits and len(circuits) > 0:
-            try:
-                target_circuit = circuits[0]
-                qasm_str = target_circuit.qasm() if hasattr(target_circuit, 'qasm') else "N/A"
-                qiskit_str = str(target_circuit)
-            except Exception as circ_e:
-                logger.debug(f"Error parsing circuit: {circ_e}")
-        
-        # -------------------------
-        # 6. Result
+        # 2. Inputs (PUBs, Observables, Circuits)
         # -------------------------
-        result_payload = "N/A"
-        if status == "COMPLETED":
-            try:
-                # result() is a blocking call, so we use to_thread to keep it async-friendly
-                job_result = await asyncio.to_thread(job.result)
-                if hasattr(job_result, 'get_counts'):
-                    result_payload = job_result.get_counts()
-                else:
-                    # Fallback for complex result objects (SamplerV2/EstimatorV2)
-                    result_payload = str(job_result)
-            except Exception as res_e:
-                logger.error(f"Error fetching results for job {job_id}: {res_e}")
-                result_payload = f"Error: {str(res_e)}"
+        inputs = await sdk_executor.call(job, "inputs") or {}
 
         # -------------------------
-        # 7. Final Payload Construction
+        # 3. Final Payload Construction
         # -------------------------
         return {
-            "job_id": job_id,
-            "user": masked_user,
-            "region": region,
-            "program": program_id,
-            "instance": instance,
-            "mode": mode,
-            "quantum_computer": backend_name,
-            "backend": backend_name,
-            "submitted": created_iso,
-            "elapsed_time": elapsed_seconds,
-            "qpu_seconds": qpu_seconds,
-            "logs": "Logs available.",
-            "status": status,
-            "status_history": status_history,
-            "status_and_usage": {
-                "status": status,
-                "total_completion_time": total_completion_time,
-                "actual_qr_usage": usage,
-                "created": created_iso,
-                "pending_time": pending_time,
-                "in_progress": in_progress_time,
-                "qiskit_runtime_usage": qiskit_runtime_usage,
-                "completed": completed_iso,
-            },
-            "pubs": str(pubs) if pubs else "N/A",
-            "result": result_payload,
-            "observables": str(observables) if observables else "N/A",
-            "circuit": {
-                "diagram": safe_call(job, "image"), # Current image logic placeholder
-                "qasm": qasm_str,
-                "qiskit": qiskit_str
-            }
+            **summary,
+            **job_inputs_payload(inputs),
+            "result": await job_result_payload(job, job_id, status),
+            "circuit": await job_circuit_payload(job, inputs),
         }
     except Exception as e:
         logger.exception(f"❌ Error processing job: {e}")
@@ -348,18 +750,109 @@ async def job_to_dict(job, lite: bool = False) -> dict:
 
 
 
-import numpy as np
+# -------------------------
+# Field Projection
+# -------------------------
+def _epoch(dt) -> Optional[float]:
+    return dt.timestamp() if dt else None
 
-def calculate_median(values):
-    if not values:
-        return None
-    return float(np.median(values))
 
-def backend_to_dict(backend, detailed: bool = False) -> dict:
+def _elapsed(f) -> float:
+    created, completed = f["creation_date"], f["end_date"]
+    return (completed - created).total_seconds() if created and completed else 0
+
+
+def _pending_seconds(f) -> Optional[float]:
+    running = running_since(f["status_history"])
+    created = f["creation_date"]
+    return round((running - created).total_seconds(), 2) if running and created else None
+
+
+# field -> (SDK accessors it needs, how to compute it from the fetched values).
+# Date fields yield datetimes here; render_projection formats them per output format.
+JOB_PROJECTIONS = {
+    "job_id": (("job_id",), lambda job, f: f["job_id"]),
+    "user": (("user", "instance"), lambda job, f: mask_user_id(str(f["user"] or f["instance"] or "default"))),
+    "region": (("instance",), lambda job, f: region_from_instance(f["instance"])),
+    "program": (("program_id",), lambda job, f: f["program_id"]),
+    "instance": (("instance",), lambda job, f: f["instance"]),
+    "backend": ((), lambda job, f: local_backend_name(job)),
+    "mode": ((), lambda job, f: "Simulator" if "simulator" in local_backend_name(job).lower() else "Real Quantum Computer"),
+    "status": (("status",), lambda job, f: normalize_status(f["status"])),
+    "submitted": (("creation_date",), lambda job, f: f["creation_date"]),
+    "completed": (("end_date",), lambda job, f: f["end_date"]),
+    "elapsed_time": (("creation_date", "end_date"), lambda job, f: _elapsed(f)),
+    "pending_time": (("creation_date", "status_history"), lambda job, f: _pending_seconds(f)),
+    "qpu_seconds": (("metrics",), lambda job, f: ((f["metrics"] or {}).get("usage") or {}).get("seconds", 0)),
+    "status_history": (("status_history",), lambda job, f: f["status_history"] or []),
+}
+DATE_FIELDS = {"submitted", "completed"}
+# Returned by format=columnar when no fields= are given
+DEFAULT_PROJECTION = tuple(name for name in JOB_PROJECTIONS if name != "status_history")
+
+
+def parse_fields(fields: Optional[str]) -> tuple:
+    if not fields:
+        return DEFAULT_PROJECTION
+    names = tuple(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in names if name not in JOB_PROJECTIONS]
+    if unknown:
+        raise ValueError(f"Unknown field(s) {unknown}; available: {list(JOB_PROJECTIONS)}")
+    return names
+
+
+async def project_job(job, names: tuple) -> dict:
+    """Computes only the requested fields, calling only the SDK accessors they need"""
+    accessors = tuple(dict.fromkeys(a for name in names for a in JOB_PROJECTIONS[name][0]))
     try:
-        # 1. Basic Status & Config (Fast)
-        status_obj = backend.status()
-        config = backend.configuration()
+        fetched = await sdk_executor.run(fetch_job_fields, job, accessors) if accessors else {}
+        return {name: JOB_PROJECTIONS[name][1](job, fetched) for name in names}
+    except Exception as e:
+        logger.error(f"Error projecting job: {e}")
+        return {"job_id": safe_call(job, "job_id"), "error": str(e)}
+
+
+def project_record(record: dict, names: tuple) -> dict:
+    """Same projection applied to a lite record from the job store"""
+    usage = record.get("status_and_usage") or {}
+    pending = usage.get("pending_time")
+    values = {
+        **record,
+        "submitted": parse_timestamp(record.get("submitted")),
+        "completed": parse_timestamp(usage.get("completed")),
+        "pending_time": float(pending[:-1]) if pending and pending.endswith("s") else None,
+    }
+    return {name: values.get(name) for name in names}
+
+
+def render_projection(rows: List[dict], names: tuple, columnar: bool):
+    """Row dicts with date strings, or {field: [values]} columns with epoch timestamps"""
+    def render_date(value):
+        if isinstance(value, (int, float)):
+            return value if columnar else datetime.fromtimestamp(value, timezone.utc).strftime(DATE_FORMAT)
+        if value is None:
+            return None if columnar else "N/A"
+        return _epoch(value) if columnar else value.astimezone(timezone.utc).strftime(DATE_FORMAT)
+
+    dates = [name for name in names if name in DATE_FIELDS]
+    for row in rows:
+        for name in dates:
+            if name in row:
+                row[name] = render_date(row[name])
+    if not columnar:
+        return rows
+    return {
+        "fields": list(names),
+        "count": len(rows),
+        "columns": {name: [row.get(name) for row in rows] for name in names},
+    }
+
+
+def backend_to_dict(backend, detailed: bool = False, status_obj=None, config=None, calibration=None) -> dict:
+    try:
+        # 1. Basic Status & Config (Fast) - may be passed in pre-fetched from the cache
+        status_obj = status_obj or backend.status()
+        config = config or backend.configuration()
         
         # Safe attribute access
         def get_attr(obj, name, default=None):
@@ -393,125 +886,69 @@ def backend_to_dict(backend, detailed: bool = False) -> dict:
             return base_info
 
         # 2. Detailed Calibration Data (Slow - requires fetching properties)
-        props = backend.properties()
-        if not props:
-            base_info["calibration_message"] = "No calibration data available"
-            return base_info
+        if calibration is None:
+            props = backend.properties()
+            if not props:
+                base_info["calibration_message"] = "No calibration data available"
+                return base_info
+            from calibration import CalibrationArrays
+            calibration = CalibrationArrays(props)
 
-        # Extract Qubit Metrics (T1, T2, Readout)
-        t1s = []
-        t2s = []
-        readout_errs = []
-        
-        qubit_data = [] # For Table View
-        
-        for i, qubits_props in enumerate(props.qubits):
-            # Qiskit properties structure: list of Nduv objects
-            q_map = {item.name: item.value for item in qubits_props}
-            
-            t1 = q_map.get("T1", 0)
-            t2 = q_map.get("T2", 0)
-            ro = q_map.get("readout_error", 0)
-            
-            # Convert units if necessary (T1/T2 usually in us or s, let's normalize to us for display if < 1)
-            # Standard Qiskit unit is often seconds. Let's convert to microseconds (us) for readability if needed.
-            # However, looking at the logs: "T1: 48.53 us". Qiskit parser handles units. 
-            # The raw .value is likely in the unit specified by .unit. 
-            # We will trust the raw value for stats but might need normalization. 
-            # Actually, standardizing on microseconds (us) is good for T1/T2.
-            
-            # Helper to find item with name and get value + unit
-            def get_prop_val(name):
-                for item in qubits_props:
-                    if item.name == name:
-                        return item.value, item.unit
-                return None, None
-            
-            val_t1, unit_t1 = get_prop_val("T1")
-            val_t2, unit_t2 = get_prop_val("T2")
-            
-            # Normalize to microseconds
-            if unit_t1 == "s": val_t1 *= 1e6
-            if unit_t1 == "ns": val_t1 /= 1e3
-            if unit_t2 == "s": val_t2 *= 1e6
-            if unit_t2 == "ns": val_t2 /= 1e3
-            
-            if val_t1: t1s.append(val_t1)
-            if val_t2: t2s.append(val_t2)
-            if ro: readout_errs.append(ro)
-            
-            qubit_data.append({
-                "qubit": i,
-                "T1": val_t1,
-                "T2": val_t2,
-                "readout_error": ro,
-                # Add other specific props if needed
-            })
-
-        # Extract Gate Metrics (2Q error, SX, CZ)
-        # Gates are in props.gates
-        gate_metrics = {
-            "2q_error": [],
-            "sx_error": [],
-            "cz_error": [],
-            "ecr_error": []
-        }
-        
-        gate_data = []
-        
-        for gate in props.gates:
-            name = gate.name # e.g., 'cx0_1', 'sx0', 'ecr1_2'
-            # Find gate error
-            error = 0
-            for param in gate.parameters:
-                if param.name == "gate_error":
-                    error = param.value
-                    break
-            
-            gate_info = {
-                "name": name,
-                "qubits": gate.qubits,
-                "error": error,
-                "gate": gate.gate # 'cx', 'sx', 'ecr'
-            }
-            gate_data.append(gate_info)
-
-            # Categorize
-            if getattr(gate, 'qubits') and len(gate.qubits) == 2:
-                gate_metrics["2q_error"].append(error)
-                if gate.gate == "cz": gate_metrics["cz_error"].append(error)
-                if gate.gate == "ecr": gate_metrics["ecr_error"].append(error)
-            elif gate.gate == "sx":
-                gate_metrics["sx_error"].append(error)
-
-        # Merge specific gate errors for "2Q error" (generic)
-        # Some backends use ECR, some CX, some CZ.
-        all_2q = gate_metrics["2q_error"]
-        
-        # Calculate Medians
-        metrics = {
-            "T1 (median)": f"{calculate_median(t1s):.2f} us",
-            "T2 (median)": f"{calculate_median(t2s):.2f} us",
-            "Readout error (median)": f"{calculate_median(readout_errs):.4e}",
-            "2Q error (median)": f"{calculate_median(all_2q):.4e}" if all_2q else "N/A",
-            "2Q error (best)": f"{min(all_2q):.4e}" if all_2q else "N/A",
-            "SX error (median)": f"{calculate_median(gate_metrics['sx_error']):.4e}" if gate_metrics['sx_error'] else "N/A",
-            "CZ error (median)": f"{calculate_median(gate_metrics['cz_error']):.4e}" if gate_metrics['cz_error'] else "N/A",
-        }
-
-        # Calibration Data for Visualization
-        calibration_data = {
-            "qubits": qubit_data, # For table/map
-            "gates": gate_data,   # For map connectivity
-            "metrics": metrics    # Summary stats
-        }
-        
-        return {**base_info, **metrics, "calibration_data": calibration_data}
+        # Qubit and gate metrics come from one columnar extraction of the properties
+        return {**base_info, **calibration.metrics(), "calibration_data": calibration.to_dict()}
 
     except Exception as e:
         logger.error(f"Error processing backend {backend}: {e}")
         return {"name": getattr(backend, "name", "Unknown"), "error": str(e)}
 
+async def get_backends() -> list:
+    return await backend_cache.get_or_load("backends", "*", lambda: sdk_executor.run(service.backends))
+
+
+async def get_backend_status(backend):
+    return await backend_cache.get_or_load("status", backend.name, lambda: sdk_executor.run(backend.status))
+
+
+def load_calibration(backend) -> Optional["CalibrationArrays"]:
+    """Fetches backend properties and extracts them into arrays (blocking)"""
+    from calibration import CalibrationArrays
+
+    props = backend.properties()
+    return CalibrationArrays(props) if props else None
+
+
+async def cached_backend_document(backend, detailed: bool = False) -> bytes:
+    """JSON-encoded backend_to_dict with status/configuration/properties served from backend_cache"""
+    name = backend.name
+    try:
+        status_obj, config = await asyncio.gather(
+            get_backend_status(backend),
+            backend_cache.get_or_load("configuration", name, lambda: sdk_executor.run(backend.configuration)),
+        )
+        calibration = b"{}"
+        if detailed:
+            # Rendered and encoded once per properties TTL across all workers
+            calibration = await shared_json.get_or_load_raw(
+                f"backends:calibration:{name}", backend_cache.ttls["properties"], lambda: render_calibration(backend)
+            )
+    except Exception as e:
+        logger.error(f"Error processing backend {backend}: {e}")
+        return encode_json({"name": name, "error": str(e)})
+    info = backend_to_dict(backend, detailed=False, status_obj=status_obj, config=config)
+    # The calibration arrays are spliced in as cached bytes rather than decoded and re-encoded
+    return merge_objects(encode_json(info), calibration) if "error" not in info else encode_json(info)
+
+
+async def render_calibration(backend) -> bytes:
+    """Calibration metrics and arrays as merged into the detailed backend payload, encoded"""
+    calibration = await backend_cache.get_or_load(
+        "properties", backend.name, lambda: sdk_executor.run(load_calibration, backend)
+    )
+    if calibration is None:
+        return encode_json({"calibration_message": "No calibration data available"})
+    return encode_json({**calibration.metrics(), "calibration_data": calibration.to_dict()})
+
+
 async def calculate_metrics(job_list: list) -> dict:
     try:
         total_jobs = len(job_list)
@@ -528,7 +965,7 @@ async def calculate_metrics(job_list: list) -> dict:
             "avg_wait_time": avg_wait_time,
             "success_rate": round(success_rate, 2),
             "open_sessions": len(unique_users),
-            "api_speed": 0  # You can measure request duration here if needed
+            "api_speed": api_speed_ms(),
         }
     except Exception as e:
         logger.exception(f"❌ Error calculating metrics: {e}")
@@ -538,6 +975,29 @@ async def calculate_metrics(job_list: list) -> dict:
 # -------------------------
 # API Routes
 # -------------------------
+async def fetch_jobs(limit: int, status: Optional[str] = None, skip: int = 0) -> list:
+    if status:
+        return await sdk_executor.run(service.jobs, limit=limit, skip=skip, status=status)
+    return await sdk_executor.run(service.jobs, limit=limit, skip=skip)
+
+
+def rest_job_to_dict(row: dict) -> dict:
+    """Lite job record built from a REST jobs row, without a RuntimeJob"""
+    with span("convert"):
+        return lite_job_record(job_summary(rest_job_fields(row, INSTANCE), row.get("backend") or "Unknown"))
+
+
+async def fetch_rest_jobs(limit: int, status: Optional[str] = None) -> Optional[list]:
+    """Lite records via the REST fast path, or None when it is unavailable"""
+    if not cloud_client:
+        return None
+    try:
+        return [rest_job_to_dict(row) async for row in iter_rest_jobs(cloud_client, limit, status)]
+    except Exception as e:
+        logger.warning(f"⚠️  REST job listing failed, falling back to the SDK: {e}")
+        return None
+
+
 @app.post("/api/jobs")
 def create_job(submission: JobSubmission):
     if not service:
@@ -546,6 +1006,9 @@ def create_job(submission: JobSubmission):
             detail={"error": "IBM Quantum service not available. Please configure credentials in .env file."}
         )
     try:
+        from qiskit import QuantumCircuit
+        from qiskit_ibm_runtime import Sampler, Options
+
         logger.info(f"Received job submission: {submission}")
         
         # Use a simulator by default
@@ -575,65 +1038,330 @@ def create_job(submission: JobSubmission):
         raise HTTPException(status_code=500, detail={"error": str(e)})
 
 
+@app.post("/api/jobs/batch")
+async def create_batch(submission: BatchSubmission, request: Request):
+    """Submits many circuits, deduplicated and packed into as few Sampler jobs as possible.
+
+    The Idempotency-Key header (or idempotency_key) names the submission; a retry with the
+    same key returns the first submission's jobs, or 409 while it is still being submitted.
+    Submissions without a key are not recorded, since no retry could ever name them.
+    """
+    if not service:
+        raise HTTPException(
+            status_code=503,
+            detail={"error": "IBM Quantum service not available. Please configure credentials in .env file."}
+        )
+    if not submission.circuits:
+        raise HTTPException(status_code=400, detail={"error": "circuits must not be empty"})
+    key = request.headers.get("idempotency-key") or submission.idempotency_key
+    claim = f"submissions:{key}" if key else None
+
+    async def release_claim():
+        if claim:
+            await asyncio.to_thread(shared_cache.delete_if, claim, SUBMISSION_PENDING)
+
+    if claim and not await asyncio.to_thread(shared_cache.add, claim, SUBMISSION_PENDING, SUBMIT_IDEMPOTENCY_TTL):
+        previous = await asyncio.to_thread(shared_cache.get, claim)
+        if previous and previous != SUBMISSION_PENDING:
+            return {**json.loads(previous), "replayed": True}
+        raise HTTPException(
+            status_code=409,
+            detail={"error": "A submission with this idempotency key is in progress", "idempotency_key": key}
+        )
+    try:
+        name = submission.backend
+        backend = await backend_cache.get_or_load("backends", name, lambda: sdk_executor.run(service.backend, name))
+        result = await get_batch_submitter().submit(
+            backend, submission.circuits, submission.shots, submission.optimization_level
+        )
+    except asyncio.TimeoutError:
+        # The Sampler call may still create the job, so the key stays claimed until it expires
+        logger.error(f"⏱️ Batch submission {key} timed out; its jobs may still have been created")
+        raise HTTPException(
+            status_code=504,
+            detail={"error": "Submission timed out; check the job list before retrying", "idempotency_key": key}
+        )
+    except ValueError as e:
+        await release_claim()
+        raise HTTPException(status_code=400, detail={"error": str(e)})
+    except Exception as e:
+        await release_claim()
+        logger.exception("Error creating batch: %s", e)
+        if "not found" in str(e).lower():
+            raise HTTPException(status_code=404, detail="Backend not found")
+        raise HTTPException(status_code=500, detail={"error": str(e)})
+    if claim:
+        result["idempotency_key"] = key
+        await asyncio.to_thread(shared_cache.set, claim, encode_json(result), SUBMIT_IDEMPOTENCY_TTL)
+    return result
+
+
+async def jobs_delta(cursor: Optional[tuple], limit: int, status: Optional[str]) -> dict:
+    """?since= response: jobs changed or created after the cursor plus ids to drop, or a full
+    listing ("full": true) when the cursor is empty, from another store or too far behind"""
+    if not store_ready():
+        records = await fetch_rest_jobs(limit, status)
+        if records is None:
+            records = await asyncio.gather(*[job_to_dict(job, lite=True) for job in await fetch_jobs(limit, status)])
+        # No store version to resume from: the next poll gets a full listing again
+        return {"cursor": None, "full": True, "jobs": records, "removed": []}
+    version = job_store.version()
+    if cursor and cursor[0] == job_store.store_id and cursor[1] <= version:
+        found = await asyncio.to_thread(job_store.changes_since, cursor[1], limit, status)
+        if found is not None:
+            version, changed, removed = found
+            return {"cursor": encode_since(job_store.store_id, version), "full": False, "jobs": changed, "removed": removed}
+    records = job_store.list_jobs(limit=limit, status=status)
+    return {"cursor": encode_since(job_store.store_id, version), "full": True, "jobs": records, "removed": []}
+
+
 @app.get("/api/jobs")
-async def list_jobs(limit: int = 20, status: Optional[str] = None, lite: bool = False):
+async def list_jobs(
+    request: Request,
+    limit: int = 20,
+    status: Optional[str] = None,
+    lite: bool = False,
+    fields: Optional[str] = None,
+    format: str = "rows",
+    since: Optional[str] = None,
+):
+    """Job listing. Responses served from the synced store carry an ETag derived from the
+    store version and answer a matching If-None-Match with 304. since= (empty on the first
+    poll, then the returned cursor) switches to {"cursor", "full", "jobs", "removed"} deltas
+    of lite records. Encoded as JSON or, with Accept: application/msgpack, MessagePack."""
     if not service:
         raise HTTPException(
             status_code=503,
             detail={"error": "IBM Quantum service not available. Please configure credentials in .env file."}
         )
+    if format not in ("rows", "columnar"):
+        raise HTTPException(status_code=400, detail={"error": "format must be 'rows' or 'columnar'"})
+    projected = bool(fields) or format == "columnar"
     try:
-        jobs = service.jobs(limit=limit, status=status) if status else service.jobs(limit=limit)
-        job_tasks = [job_to_dict(job, lite=lite) for job in jobs]
-        return await asyncio.gather(*job_tasks)
+        names = parse_fields(fields) if projected else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail={"error": str(e)})
+    if since is not None:
+        if projected:
+            raise HTTPException(status_code=400, detail={"error": "since returns lite records; drop fields and format"})
+        try:
+            cursor = decode_since(since)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail={"error": str(e)})
+
+    media_type = negotiate(request)
+    headers = None
+    if store_ready() and (lite or projected or since is not None):
+        etag = make_etag(
+            job_store.store_id, job_store.version(), request.url.query, media_type, content_encoding(request)
+        )
+        cached = not_modified(request, etag)
+        if cached:
+            return cached
+        headers = etag_headers(etag)
+    try:
+        if since is not None:
+            return respond(request, await jobs_delta(cursor, limit, status), headers)
+
+        # fields= / format=columnar: compute only the requested attributes
+        if projected:
+            if store_ready():
+                records = job_store.list_jobs(limit=limit, status=status)
+            else:
+                records = await fetch_rest_jobs(limit, status)
+            if records is not None:
+                rows = [project_record(r, names) for r in records]
+            else:
+                jobs = await fetch_jobs(limit, status)
+                rows = await asyncio.gather(*[project_job(job, names) for job in jobs])
+            return respond(request, render_projection(rows, names, columnar=format == "columnar"), headers)
+
+        # Lite listings are served from the synced store (as stored), else the REST jobs endpoint
+        if lite and store_ready():
+            rows = job_store.page(limit=limit, status=status)
+            with span("encode"):
+                body = encode_stored([(job_id, payload) for _, job_id, payload in rows], media_type)
+            return encoded_response(request, body, media_type, headers=headers)
+        kind = "rest"
+        records = await fetch_rest_jobs(limit, status) if lite else None
+        if records is None:
+            kind = "lite" if lite else "full"
+            jobs = await fetch_jobs(limit, status)
+            records = await asyncio.gather(*[job_to_dict(job, lite=lite) for job in jobs])
+        with span("encode"):
+            body = encode_records(records, media_type, kind)
+        return encoded_response(request, body, media_type)
     except Exception as e:
         logger.exception("Error listing jobs: %s", e)
         raise HTTPException(status_code=500, detail={"error": str(e)})
 
 
+@app.get("/api/jobs/stream")
+async def stream_jobs(
+    limit: int = 1000, status: Optional[str] = None, lite: bool = True, cursor: Optional[str] = None
+):
+    """NDJSON job listing: one job per line as soon as it is converted, then a
+    final {"next_cursor": ...} line to pass back as ?cursor= for the next page"""
+    if not service:
+        raise HTTPException(
+            status_code=503,
+            detail={"error": "IBM Quantum service not available. Please configure credentials in .env file."}
+        )
+    try:
+        kind, value = decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail={"error": str(e)})
+    from_store = lite and store_ready()
+    if kind == "s" and not from_store:
+        # A store keyset means nothing to the upstream listing; restarting at offset 0 would
+        # silently repeat pages the client already has
+        raise HTTPException(
+            status_code=400,
+            detail={"error": "Cursor cannot be resumed on this listing; restart without a cursor"}
+        )
+    try:
+        if from_store and kind != "o":
+            return StreamingResponse(stream_from_store(job_store, limit, status, value), media_type=NDJSON_MEDIA_TYPE)
+
+        offset = value if kind == "o" else 0
+        jobs = await fetch_jobs(limit, status, skip=offset)
+        next_offset = offset + len(jobs) if len(jobs) == limit else None
+        return StreamingResponse(
+            stream_converted(
+                jobs,
+                lambda job: job_to_dict(job, lite=lite),
+                window=sdk_executor.max_concurrency * 2,
+                next_offset=next_offset,
+            ),
+            media_type=NDJSON_MEDIA_TYPE,
+        )
+    except Exception as e:
+        logger.exception("Error streaming jobs: %s", e)
+        raise HTTPException(status_code=500, detail={"error": str(e)})
+
+
+async def build_job_artifact(job, job_id: str, kind: str) -> tuple:
+    """Returns (payload, status) for one lazily fetched part of a job"""
+    if kind == "summary":
+        payload = await job_to_dict(job, details=False)
+        return payload, payload.get("status")
+
+    status = normalize_status(await sdk_executor.call(job, "status"))
+    payload = {"job_id": job_id, "status": status}
+    if kind == "result":
+        payload["result"] = await job_result_payload(job, job_id, status)
+        return payload, status
+    inputs = await sdk_executor.call(job, "inputs") or {}
+    if kind == "circuit":
+        payload["circuit"] = await job_circuit_payload(job, inputs)
+    else:
+        payload.update(job_inputs_payload(inputs))
+    return payload, status
+
+
+async def get_job_artifact(job_id: str, kind: str) -> bytes:
+    """JSON-encoded artifact; cached ones are served as stored, without decoding"""
+    key = f"{job_id}:{kind}"
+    cached = await asyncio.to_thread(artifact_cache.get, key)
+    if cached is not None:
+        return cached
+
+    job = await sdk_executor.run(service.job, job_id)
+    with collect_failures() as failures:
+        payload, status = await build_job_artifact(job, job_id, kind)
+    # Only finished artifacts built without any failed accessor are immutable enough to keep;
+    # a None read through a transient failure would otherwise be cached for good
+    failed = failures or "error" in payload or str(payload.get("result", "")).startswith("Error:")
+    if failures:
+        logger.info(f"Not caching {key}: {', '.join(failures)} could not be fetched")
+    if status in TERMINAL_STATUSES and not failed:
+        # Stored exactly as returned, so a later hit serves the same bytes as this miss
+        return await artifact_cache.put_json(key, payload)
+    return encode_json(payload)
+
+
+def artifact_response(request: Request, job_id: str, kind: str, data: bytes):
+    media_type = negotiate(request)
+    return encoded_response(request, encode_document(data, media_type, f"{job_id}:{kind}"), media_type)
+
+
 @app.get("/api/jobs/{job_id}")
-async def get_job(job_id: str):
+async def get_job(request: Request, job_id: str, full: bool = False):
+    """Job summary with links to its result, circuit and inputs; full=true inlines them"""
     if not service:
         raise HTTPException(
             status_code=503,
             detail={"error": "IBM Quantum service not available. Please configure credentials in .env file."}
         )
     try:
-        job = service.job(job_id)
-        return await job_to_dict(job, lite=False)
+        if full:
+            job = await sdk_executor.run(service.job, job_id)
+            return respond(request, await job_to_dict(job, lite=False))
+        return artifact_response(request, job_id, "summary", await get_job_artifact(job_id, "summary"))
     except Exception as e:
         logger.exception("Error fetching job %s: %s", job_id, e)
         raise HTTPException(status_code=404, detail={"error": str(e)})
 
 
+@app.get("/api/jobs/{job_id}/{kind}")
+async def get_job_detail(request: Request, job_id: str, kind: str):
+    if not service:
+        raise HTTPException(
+            status_code=503,
+            detail={"error": "IBM Quantum service not available. Please configure credentials in .env file."}
+        )
+    if kind not in JOB_RESOURCES:
+        raise HTTPException(status_code=404, detail={"error": f"Unknown job resource '{kind}'"})
+    try:
+        return artifact_response(request, job_id, kind, await get_job_artifact(job_id, kind))
+    except Exception as e:
+        logger.exception("Error fetching %s of job %s: %s", kind, job_id, e)
+        raise HTTPException(status_code=404, detail={"error": str(e)})
+
+
 @app.get("/api/backends")
-def list_backends():
+async def list_backends(request: Request):
     if not service:
         raise HTTPException(
             status_code=503,
             detail={"error": "IBM Quantum service not available. Please configure credentials in .env file."}
         )
+    async def load() -> bytes:
+        backends = await get_backends()
+        return join_array(await asyncio.gather(*[cached_backend_document(b) for b in backends]), JSON)
+
     try:
-        backends = service.backends()
-        return [backend_to_dict(b, detailed=False) for b in backends]
+        data = await shared_json.get_or_load_raw("backends:list", backend_cache.ttls["status"], load)
     except Exception as e:
         logger.exception("Error listing backends: %s", e)
         raise HTTPException(status_code=500, detail={"error": str(e)})
+    media_type = negotiate(request)
+    # The list has no version of its own; it is small, so its content is the tag
+    etag = make_etag(data, media_type, content_encoding(request))
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    return encoded_response(request, encode_document(data, media_type, "backends:list"), media_type, headers=etag_headers(etag))
 
 
 @app.get("/api/backends/{name}")
-def get_backend_details(name: str):
+async def get_backend_details(request: Request, name: str):
     if not service:
         raise HTTPException(
             status_code=503,
             detail={"error": "IBM Quantum service not available. Please configure credentials in .env file."}
         )
-    try:
-        # Fetch specific backend (this might be slightly inefficient if we could cache, but safe)
-        backend = service.backend(name)
+    async def load() -> bytes:
+        backend = await backend_cache.get_or_load("backends", name, lambda: sdk_executor.run(service.backend, name))
         if not backend:
              raise HTTPException(status_code=404, detail="Backend not found")
-        return backend_to_dict(backend, detailed=True)
+        return await cached_backend_document(backend, detailed=True)
+
+    try:
+        key = f"backends:detail:{name}"
+        data = await shared_json.get_or_load_raw(key, backend_cache.ttls["status"], load)
+        media_type = negotiate(request)
+        return encoded_response(request, encode_document(data, media_type, key), media_type)
     except Exception as e:
         logger.exception(f"Error fetching backend {name}: {e}")
         # Check if it was a 404 from Qiskit
@@ -642,19 +1370,409 @@ def get_backend_details(name: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/backends/{name}/connectivity")
+async def get_backend_connectivity(request: Request, name: str):
+    """Coupling graph annotated with the latest calibration, with its best chains and subgraphs.
+
+    Built once per calibration snapshot and shared across workers; the ETag only changes
+    with a new calibration (its timestamp, or its values when it has none).
+    """
+    if not service:
+        raise HTTPException(
+            status_code=503,
+            detail={"error": "IBM Quantum service not available. Please configure credentials in .env file."}
+        )
+    from connectivity import CONNECTIVITY_CACHE_TTL, ConnectivityGraph
+
+    try:
+        backend = await backend_cache.get_or_load("backends", name, lambda: sdk_executor.run(service.backend, name))
+        if not backend:
+            raise HTTPException(status_code=404, detail="Backend not found")
+        config, calibration = await asyncio.gather(
+            backend_cache.get_or_load("configuration", name, lambda: sdk_executor.run(backend.configuration)),
+            backend_cache.get_or_load("properties", name, lambda: sdk_executor.run(load_calibration, backend)),
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception(f"Error fetching backend {name}: {e}")
+        if "not found" in str(e).lower():
+            raise HTTPException(status_code=404, detail="Backend not found")
+        raise HTTPException(status_code=500, detail={"error": str(e)})
+    if calibration is None:
+        raise HTTPException(status_code=404, detail={"error": f"No calibration data for {name}"})
+
+    stamp = calibration.last_update_date
+    coupling_map = getattr(config, "coupling_map", None)
+    # Without a timestamp the snapshot is identified by its values (and the coupling map), so
+    # the key and ETag still change whenever the graph would
+    if stamp:
+        version = stamp.isoformat()
+    else:
+        version = make_etag(calibration.fingerprint(), list(coupling_map or [])).strip('"')
+    key = f"backends:connectivity:{name}:{version}"
+    media_type = negotiate(request)
+    etag = make_etag(key, media_type, content_encoding(request))
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    def render() -> bytes:
+        graph = ConnectivityGraph(calibration, coupling_map)
+        return encode_json({"backend": name, **graph.to_dict()})
+
+    data = await shared_json.get_or_load_raw(key, CONNECTIVITY_CACHE_TTL, lambda: asyncio.to_thread(render))
+    return encoded_response(request, encode_document(data, media_type, key), media_type, headers=etag_headers(etag))
+
+
+async def recommendation_candidates(include_simulators: bool) -> List[dict]:
+    """Status, calibration medians and ETA of every backend, from cached and archived snapshots"""
+    from calibration_history import calibration_medians
+    from recommend import MEDIAN_FIELDS
+
+    backends = [
+        b for b in await get_backends() if include_simulators or not getattr(b, "simulator", False)
+    ]
+    history = get_calibration_history()
+    archived = await asyncio.to_thread(lambda: {b.name: history.latest_medians(b.name) for b in backends})
+
+    async def candidate(backend) -> dict:
+        name = backend.name
+        status = (status_poller.snapshot if status_poller else {}).get(name)
+        if status is None:
+            status_obj = await get_backend_status(backend)
+            status = {field: getattr(status_obj, field, None) for field in ("operational", "pending_jobs")}
+        if archived.get(name):
+            medians = archived[name][1]
+        else:
+            # Not archived yet: medians of the cached properties (one load per properties TTL)
+            calibration = await backend_cache.get_or_load(
+                "properties", name, lambda: sdk_executor.run(load_calibration, backend)
+            )
+            medians = calibration_medians(calibration) if calibration else {}
+        eta = queue_eta.predict(name, status.get("pending_jobs"))["eta_seconds"]
+        return {
+            "name": name,
+            "qubit_count": backend.num_qubits,
+            "operational": status.get("operational"),
+            "pending_jobs": status.get("pending_jobs"),
+            "eta_seconds": eta["p50"] if eta else None,
+            **{field: medians[field] if medians.get(field) == medians.get(field) else None for field in MEDIAN_FIELDS},
+        }
+
+    results = await asyncio.gather(*[candidate(b) for b in backends], return_exceptions=True)
+    candidates = []
+    for backend, result in zip(backends, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error reading snapshots of backend {backend.name}: {result}")
+            continue
+        candidates.append(result)
+    return candidates
+
+
+@app.post("/api/backends/recommend")
+async def recommend_backends(request: RecommendRequest):
+    """Ranks operational backends for a circuit by estimated fidelity and expected turnaround"""
+    if not service:
+        raise HTTPException(
+            status_code=503,
+            detail={"error": "IBM Quantum service not available. Please configure credentials in .env file."}
+        )
+    from recommend import circuit_profile, qasm_profile, rank_backends
+
+    try:
+        if request.qasm:
+            circuit = await asyncio.to_thread(qasm_profile, request.qasm)
+        elif request.num_qubits:
+            circuit = circuit_profile(
+                request.num_qubits, request.two_qubit_gates, request.single_qubit_gates, request.measurements
+            )
+        else:
+            raise ValueError("Provide num_qubits (with the gate mix) or qasm")
+    except Exception as e:
+        raise HTTPException(status_code=400, detail={"error": str(e)})
+
+    try:
+        candidates = await recommendation_candidates(request.include_simulators)
+        ranking = rank_backends(candidates, circuit, request.fidelity_weight, request.turnaround_weight)
+    except Exception as e:
+        logger.exception("Error ranking backends: %s", e)
+        raise HTTPException(status_code=500, detail={"error": str(e)})
+    return {
+        "circuit": circuit,
+        "weights": {"fidelity": request.fidelity_weight, "turnaround": request.turnaround_weight},
+        "recommended": ranking["ranked"][: max(request.limit, 0)],
+        "excluded": ranking["excluded"],
+    }
+
+
+@app.get("/api/backends/{name}/eta")
+async def get_backend_eta(name: str, pending_jobs: Optional[int] = None):
+    """Predicted queue wait for a job submitted now, from the backend's wait sketches"""
+    if not service:
+        raise HTTPException(
+            status_code=503,
+            detail={"error": "IBM Quantum service not available. Please configure credentials in .env file."}
+        )
+    if pending_jobs is None:
+        pending_jobs = ((status_poller.snapshot if status_poller else {}).get(name) or {}).get("pending_jobs")
+    if pending_jobs is None:
+        try:
+            backend = await backend_cache.get_or_load("backends", name, lambda: sdk_executor.run(service.backend, name))
+            pending_jobs = getattr(await get_backend_status(backend), "pending_jobs", None)
+        except Exception as e:
+            logger.error(f"Error fetching status of backend {name}: {e}")
+            if "not found" in str(e).lower():
+                raise HTTPException(status_code=404, detail="Backend not found")
+    return {"backend": name, "pending_jobs": pending_jobs, **queue_eta.predict(name, pending_jobs)}
+
+
+def parse_query_time(value: str) -> float:
+    """ISO 8601 query parameter to a UTC epoch; naive values are taken as UTC"""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return (parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)).timestamp()
+
+
+@app.get("/api/backends/{name}/calibration/history")
+async def get_calibration_trend(
+    name: str,
+    metric: str = "T1",
+    qubit: Optional[str] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    buckets: int = 200,
+):
+    """Archived calibration of a backend downsampled to min/median/max per time bucket.
+
+    qubit selects one qubit ("12") or, for gate errors, one gate ("12_13"); without it each
+    snapshot contributes its median across qubits/gates. Served from disk, no upstream calls.
+    """
+    from calibration_history import CALIBRATION_HISTORY_MAX_BUCKETS
+
+    if not 1 <= buckets <= CALIBRATION_HISTORY_MAX_BUCKETS:
+        raise HTTPException(
+            status_code=400, detail={"error": f"buckets must be between 1 and {CALIBRATION_HISTORY_MAX_BUCKETS}"}
+        )
+    try:
+        end_ts = parse_query_time(end) if end else time.time()
+        start_ts = parse_query_time(start) if start else end_ts - CALIBRATION_HISTORY_DAYS * 86400
+    except ValueError:
+        raise HTTPException(status_code=400, detail={"error": "start and end must be ISO 8601 datetimes"})
+    if start_ts >= end_ts:
+        raise HTTPException(status_code=400, detail={"error": "start must be before end"})
+
+    history = get_calibration_history()
+    try:
+        trend = await asyncio.to_thread(history.query, name, metric, start_ts, end_ts, buckets, qubit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail={"error": str(e)})
+    if trend is None:
+        raise HTTPException(status_code=404, detail={"error": f"No calibration history for {name}"})
+    return trend
+
 
 @app.get("/api/metrics")
-async def get_metrics():
+async def get_metrics(window: Optional[str] = None):
     if not service:
         raise HTTPException(
             status_code=503,
             detail={"error": "IBM Quantum service not available. Please configure credentials in .env file."}
         )
+    if window and window not in WINDOWS:
+        raise HTTPException(status_code=400, detail={"error": f"window must be one of {list(WINDOWS)}"})
     try:
-        jobs = service.jobs()
+        if store_ready():
+            return metrics_engine.snapshot(window)
+        jobs = await sdk_executor.run(service.jobs)
         job_tasks = [job_to_dict(job, lite=True) for job in jobs]
         job_data = await asyncio.gather(*job_tasks)
+        if window:
+            engine = MetricsEngine()
+            engine.ingest_many(job_data)
+            return engine.snapshot(window)
         return await calculate_metrics(job_data)
     except Exception as e:
         logger.exception("Error fetching metrics: %s", e)
-        raise HTTPException(status_code=500, detail={"error": str(e)})
\ No newline at end of file
+        raise HTTPException(status_code=500, detail={"error": str(e)})
+
+
+@app.get("/api/dashboard/summary")
+async def get_dashboard_summary(window: Optional[str] = None, tz: Optional[str] = None):
+    """Job counts per status for the last 12 hours, 7 days, 4 weeks and 6 months, and today's
+    completions per backend; window limits the response to one of them. Buckets follow the
+    IANA zone tz (UTC by default), as the dashboard labels them in its server's local time."""
+    if not service:
+        raise HTTPException(
+            status_code=503,
+            detail={"error": "IBM Quantum service not available. Please configure credentials in .env file."}
+        )
+    if window and window not in SUMMARY_WINDOWS:
+        raise HTTPException(status_code=400, detail={"error": f"window must be one of {list(SUMMARY_WINDOWS)}"})
+    try:
+        zone = parse_tz(tz)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail={"error": str(e)})
+    windows = (window,) if window else SUMMARY_WINDOWS
+    try:
+        if store_ready():
+            return dashboard_rollup.summary(windows, tz=zone)
+        jobs = await sdk_executor.run(service.jobs)
+        rollup = DashboardRollup()
+        rollup.ingest_many(await asyncio.gather(*[job_to_dict(job, lite=True) for job in jobs]))
+        return rollup.summary(windows, tz=zone)
+    except Exception as e:
+        logger.exception("Error building dashboard summary: %s", e)
+        raise HTTPException(status_code=500, detail={"error": str(e)})
+
+
+@app.get("/api/anomalies")
+async def get_anomalies(limit: int = 25, since: Optional[str] = None, kind: Optional[str] = None):
+    """Jobs, error bursts and calibration regressions that stand out statistically, worst first.
+
+    Queue and run times are screened per backend with robust z-scores, ERROR jobs for bursts
+    and the calibration archive for regressions, so callers get a few candidates to explain
+    instead of the whole job history.
+    """
+    if not service:
+        raise HTTPException(
+            status_code=503,
+            detail={"error": "IBM Quantum service not available. Please configure credentials in .env file."}
+        )
+    if limit < 1:
+        raise HTTPException(status_code=400, detail={"error": "limit must be positive"})
+    try:
+        since_ts = parse_query_time(since) if since else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail={"error": "since must be an ISO 8601 datetime"})
+    try:
+        detector = anomaly_detector
+        if not store_ready():
+            jobs = await sdk_executor.run(service.jobs)
+            detector = AnomalyDetector()
+            detector.ingest_many(await asyncio.gather(*[job_to_dict(job, lite=True) for job in jobs]))
+        with span("screen"):
+            candidates = list(detector.screen_jobs())
+        candidates += await asyncio.to_thread(calibration_regressions, get_calibration_history())
+    except Exception as e:
+        logger.exception("Error screening anomalies: %s", e)
+        raise HTTPException(status_code=500, detail={"error": str(e)})
+
+    if kind:
+        candidates = [c for c in candidates if c["kind"] == kind]
+    if since_ts is not None:
+        candidates = [
+            c for c in candidates
+            if (parse_timestamp(c.get("submitted") or c.get("end") or c.get("snapshot")) or 0) >= since_ts
+        ]
+    counts = {}
+    for candidate in candidates:
+        counts[candidate["kind"]] = counts.get(candidate["kind"], 0) + 1
+    return {
+        "jobs_screened": detector.stats()["jobs"],
+        "thresholds": {
+            "robust_z": detector.z_threshold,
+            "min_samples": detector.min_samples,
+            "error_window_seconds": detector.error_window,
+            "error_burst": detector.error_burst,
+        },
+        "counts": counts,
+        "candidates": rank_candidates(candidates)[:limit],
+    }
+
+
+@app.get("/api/health")
+def health():
+    """Liveness: the process is up and serving, whether or not IBM Quantum is connected"""
+    return {"status": "ok", "uptime": round(time.time() - STARTED_AT, 3)}
+
+
+@app.get("/api/ready")
+def readiness():
+    """Readiness: 200 once the IBM Quantum service is connected, 503 while connecting or failed"""
+    body = {
+        "ready": service is not None,
+        "service": service_status,
+        "error": service_error,
+        "job_store": store_ready(),
+        "leader": leader.is_leader,
+        "uptime": round(time.time() - STARTED_AT, 3),
+    }
+    return JSONResponse(body, status_code=200 if service is not None else 503)
+
+
+@app.get("/api/cache/stats")
+def get_cache_stats():
+    return {
+        "backends": backend_cache.stats(),
+        "artifacts": artifact_cache.stats(),
+        "transpiled": batch_submitter.cache.stats() if batch_submitter else None,
+        "shared": shared_json.stats(),
+        "calibration_history": calibration_history.stats() if calibration_history else None,
+        "eta": queue_eta.stats(),
+        "anomalies": anomaly_detector.stats(),
+        "dashboard": dashboard_rollup.stats(),
+        "fragments": fragments.stats(),
+    }
+
+
+@app.get("/api/upstream/stats")
+def get_upstream_stats():
+    """Upstream scheduler: queue depth and admission wait per priority lane, adaptive rate, coalesced calls"""
+    return {
+        **sdk_executor.stats(),
+        "rest_retries": cloud_client.retries if cloud_client else None,
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """Prometheus scrape target: request latency per route, upstream calls and cache events"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+
+def check_debug_token(request: Request):
+    """Rejects debug requests unless DEBUG_API_TOKEN is set and matches X-Debug-Token"""
+    if not DEBUG_API_TOKEN:
+        raise HTTPException(status_code=404, detail={"error": "Debug endpoints are disabled. Set DEBUG_API_TOKEN to enable them."})
+    supplied = request.headers.get("x-debug-token", "")
+    if not hmac.compare_digest(supplied.encode(), DEBUG_API_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail={"error": "Invalid or missing X-Debug-Token header"})
+
+
+@app.get("/api/debug/traces")
+def get_slow_traces(request: Request, limit: int = 50):
+    """Span breakdown of the most recent slow requests, newest first"""
+    check_debug_token(request)
+    return {
+        "profiler": {"enabled": profiler.enabled, "interval": profiler.interval, "directory": profiler.directory},
+        "traces": list(reversed(slow_traces))[:max(0, limit)],
+    }
+
+
+@app.post("/api/debug/profiler")
+def toggle_profiler(request: Request, enabled: bool):
+    """Starts or stops the sampling profiler; slow requests then dump folded stacks to PROFILE_DIR"""
+    check_debug_token(request)
+    if enabled:
+        profiler.start()
+    else:
+        profiler.stop()
+    logger.info(f"🔬 Sampling profiler {'enabled' if enabled else 'disabled'}")
+    return {"enabled": profiler.enabled, "interval": profiler.interval, "directory": profiler.directory}
+
+
+@app.get("/api/stream")
+async def stream_events(request: Request, cursor: Optional[str] = None):
+    """Server-sent events: job status transitions and backend status deltas"""
+    if not service:
+        raise HTTPException(
+            status_code=503,
+            detail={"error": "IBM Quantum service not available. Please configure credentials in .env file."}
+        )
+    # EventSource reconnects send the last seen cursor back as Last-Event-ID
+    cursor = cursor or request.headers.get("last-event-id")
+    return StreamingResponse(
+        sse_events(event_hub, cursor, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,214 @@
+import asyncio
+import hashlib
+import logging
+import os
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from qiskit import QuantumCircuit, qasm2
+from qiskit.circuit.library import EfficientSU2, RealAmplitudes
+from qiskit.transpiler import generate_preset_pass_manager
+from qiskit_ibm_runtime import SamplerV2
+
+from ttl_cache import TieredTTLCache
+
+logger = logging.getLogger("quantum-tracker")
+
+# -------------------------
+# Configuration
+# -------------------------
+# PUBs packed into one Sampler call; larger batches are split across several jobs
+SUBMIT_MAX_PUBS_PER_JOB = int(os.getenv("SUBMIT_MAX_PUBS_PER_JOB", "100"))
+# Transpiled circuits stay valid until the backend target changes (roughly daily recalibration)
+TRANSPILE_CACHE_TTL = float(os.getenv("TRANSPILE_CACHE_TTL", "86400"))
+TRANSPILE_CACHE_MAX_ENTRIES = int(os.getenv("TRANSPILE_CACHE_MAX_ENTRIES", "2048"))
+# Seconds a Sampler submission may take; uploads of large batches run well past the SDK call timeout,
+# and giving up early would report a failure for a job that is still being created
+SUBMIT_TIMEOUT = float(os.getenv("SUBMIT_TIMEOUT", "900"))
+
+# Parameterized templates a batch can sweep over
+TEMPLATES = {
+    "real_amplitudes": RealAmplitudes,
+    "efficient_su2": EfficientSU2,
+}
+
+
+# -------------------------
+# Circuit construction
+# -------------------------
+def circuit_hash(circuit: QuantumCircuit) -> str:
+    """Structural hash: register names and sizes, instructions, operands and (symbolic) parameters.
+
+    Register names are part of the circuit's identity: Sampler results are keyed by classical register.
+    """
+    digest = hashlib.sha256(f"{circuit.num_qubits}:{circuit.num_clbits}:{circuit.global_phase}".encode())
+    for kind, registers in (("q", circuit.qregs), ("c", circuit.cregs)):
+        digest.update(("|" + kind + ",".join(f"{reg.name}:{reg.size}" for reg in registers)).encode())
+    for instruction in circuit.data:
+        qubits = ",".join(str(circuit.find_bit(q).index) for q in instruction.qubits)
+        clbits = ",".join(str(circuit.find_bit(c).index) for c in instruction.clbits)
+        params = ",".join(str(p) for p in instruction.operation.params)
+        digest.update(f"|{instruction.operation.name}({params})[{qubits}][{clbits}]".encode())
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=256)
+def parse_qasm(text: str) -> QuantumCircuit:
+    if text.lstrip().startswith("OPENQASM 3"):
+        from qiskit import qasm3
+        return qasm3.loads(text)
+    return qasm2.loads(text)
+
+
+@lru_cache(maxsize=64)
+def build_template(name: str, num_qubits: int, reps: int) -> QuantumCircuit:
+    if name not in TEMPLATES:
+        raise ValueError(f"Unknown template '{name}', expected one of {list(TEMPLATES)}")
+    circuit = TEMPLATES[name](num_qubits, reps=reps).decompose()
+    circuit.measure_all()
+    return circuit
+
+
+def expand_spec(spec: Any) -> Tuple[QuantumCircuit, List[Optional[Tuple[float, ...]]]]:
+    """Returns a spec's circuit and one parameter row per circuit it stands for"""
+    if spec.qasm:
+        circuit = parse_qasm(spec.qasm)
+    elif spec.template:
+        circuit = build_template(spec.template, spec.num_qubits, spec.reps)
+    else:
+        raise ValueError("Each circuit needs either 'qasm' or 'template'")
+
+    if not circuit.num_parameters:
+        return circuit, [None]
+    if not spec.parameter_values:
+        raise ValueError(f"Circuit has {circuit.num_parameters} parameters but no parameter_values were given")
+    rows = []
+    for values in spec.parameter_values:
+        if len(values) != circuit.num_parameters:
+            raise ValueError(f"Expected {circuit.num_parameters} parameter values, got {len(values)}")
+        rows.append(tuple(float(v) for v in values))
+    return circuit, rows
+
+
+# -------------------------
+# Planning
+# -------------------------
+class PlannedPub:
+    """One unique circuit and the distinct parameter rows bound to it"""
+
+    __slots__ = ("circuit_hash", "circuit", "rows", "row_index")
+
+    def __init__(self, circuit_hash: str, circuit: QuantumCircuit):
+        self.circuit_hash = circuit_hash
+        self.circuit = circuit
+        self.rows: List[Tuple[float, ...]] = []
+        self.row_index: Dict[Tuple[float, ...], int] = {}
+
+    def add_row(self, row: Optional[Tuple[float, ...]]) -> Optional[int]:
+        if row is None:
+            return None
+        if row not in self.row_index:
+            self.row_index[row] = len(self.rows)
+            self.rows.append(row)
+        return self.row_index[row]
+
+
+def plan_batch(specs: List[Any]) -> Tuple["OrderedDict[str, PlannedPub]", List[dict]]:
+    """Deduplicates circuits by structural hash; returns unique PUBs and one handle per circuit"""
+    pubs: "OrderedDict[str, PlannedPub]" = OrderedDict()
+    handles: List[dict] = []
+    first_seen: Dict[Tuple[str, Optional[int]], int] = {}
+    for spec in specs:
+        circuit, rows = expand_spec(spec)
+        chash = circuit_hash(circuit)
+        pub = pubs.setdefault(chash, PlannedPub(chash, circuit))
+        for row in rows:
+            parameter_index = pub.add_row(row)
+            index = len(handles)
+            duplicate_of = first_seen.setdefault((chash, parameter_index), index)
+            handles.append({
+                "index": index,
+                "circuit_hash": chash,
+                "parameter_index": parameter_index,
+                "duplicate_of": duplicate_of if duplicate_of != index else None,
+            })
+    return pubs, handles
+
+
+# -------------------------
+# Submission
+# -------------------------
+class BatchSubmitter:
+    """Transpiles unique circuits once per (hash, backend, optimization level) and packs them into Sampler jobs"""
+
+    def __init__(
+        self,
+        run_blocking: Callable[..., Awaitable[Any]],
+        cache: Optional[TieredTTLCache] = None,
+        max_pubs_per_job: int = SUBMIT_MAX_PUBS_PER_JOB,
+    ):
+        self.run_blocking = run_blocking
+        self.cache = cache or TieredTTLCache(
+            {"transpiled": TRANSPILE_CACHE_TTL, "pass_managers": TRANSPILE_CACHE_TTL},
+            max_entries=TRANSPILE_CACHE_MAX_ENTRIES,
+        )
+        self.max_pubs_per_job = max_pubs_per_job
+        self._samplers: Dict[str, SamplerV2] = {}
+
+    async def pass_manager(self, backend, optimization_level: int):
+        return await self.cache.get_or_load(
+            "pass_managers",
+            (backend.name, optimization_level),
+            lambda: self.run_blocking(
+                generate_preset_pass_manager, optimization_level=optimization_level, backend=backend
+            ),
+        )
+
+    async def transpile(self, pub: PlannedPub, backend, optimization_level: int) -> QuantumCircuit:
+        async def load():
+            pm = await self.pass_manager(backend, optimization_level)
+            return await self.run_blocking(pm.run, pub.circuit)
+
+        return await self.cache.get_or_load("transpiled", (pub.circuit_hash, backend.name, optimization_level), load)
+
+    def sampler(self, backend) -> SamplerV2:
+        if backend.name not in self._samplers:
+            self._samplers[backend.name] = SamplerV2(mode=backend)
+        return self._samplers[backend.name]
+
+    async def submit(self, backend, specs: List[Any], shots: int, optimization_level: int) -> dict:
+        pubs, handles = plan_batch(specs)
+        cached = sum(
+            self.cache.get("transpiled", (chash, backend.name, optimization_level))[0] for chash in pubs
+        )
+        planned = list(pubs.values())
+        isa_circuits = await asyncio.gather(*[self.transpile(pub, backend, optimization_level) for pub in planned])
+
+        sampler = self.sampler(backend)
+        jobs, pub_location = [], {}
+        for start in range(0, len(planned), self.max_pubs_per_job):
+            chunk = planned[start:start + self.max_pubs_per_job]
+            runtime_pubs = []
+            for offset, pub in enumerate(chunk):
+                isa = isa_circuits[start + offset]
+                runtime_pubs.append((isa, pub.rows) if pub.rows else (isa,))
+                pub_location[pub.circuit_hash] = (len(jobs), offset)
+            job = await self.run_blocking(sampler.run, runtime_pubs, shots=shots, timeout=SUBMIT_TIMEOUT)
+            job_id = job.job_id()
+            jobs.append({"job_id": job_id, "pubs": len(runtime_pubs)})
+            logger.info(f"🚀 Submitted batch job {job_id} to {backend.name} ({len(runtime_pubs)} PUBs)")
+
+        for handle in handles:
+            job_index, pub_index = pub_location[handle["circuit_hash"]]
+            handle["job_id"] = jobs[job_index]["job_id"]
+            handle["pub_index"] = pub_index
+
+        return {
+            "backend": backend.name,
+            "circuits": len(handles),
+            "unique_circuits": len(pubs),
+            "transpile_cache_hits": cached,
+            "jobs": jobs,
+            "handles": handles,
+        }
@@ -0,0 +1,100 @@
+"""Compares the per-item calibration loop with the columnar CalibrationArrays path.
+
+Run from Backend/:  python -m benchmarks.bench_calibration --qubits 127 156 1000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from calibration import CalibrationArrays
+from benchmarks.fake_runtime import FakeProperties
+
+
+def legacy_extract(props) -> dict:
+    """The loop backend_to_dict used before the columnar path, kept for comparison"""
+    t1s, t2s, readout_errs, qubit_data = [], [], [], []
+    for i, qubits_props in enumerate(props.qubits):
+        q_map = {item.name: item.value for item in qubits_props}
+        ro = q_map.get("readout_error", 0)
+
+        def get_prop_val(name):
+            for item in qubits_props:
+                if item.name == name:
+                    return item.value, item.unit
+            return None, None
+
+        val_t1, unit_t1 = get_prop_val("T1")
+        val_t2, unit_t2 = get_prop_val("T2")
+        if unit_t1 == "s": val_t1 *= 1e6
+        if unit_t1 == "ns": val_t1 /= 1e3
+        if unit_t2 == "s": val_t2 *= 1e6
+        if unit_t2 == "ns": val_t2 /= 1e3
+        if val_t1: t1s.append(val_t1)
+        if val_t2: t2s.append(val_t2)
+        if ro: readout_errs.append(ro)
+        qubit_data.append({"qubit": i, "T1": val_t1, "T2": val_t2, "readout_error": ro})
+
+    two_q, sx, cz, gate_data = [], [], [], []
+    for gate in props.gates:
+        error = 0
+        for param in gate.parameters:
+            if param.name == "gate_error":
+                error = param.value
+                break
+        gate_data.append({"name": gate.name, "qubits": gate.qubits, "error": error, "gate": gate.gate})
+        if gate.qubits and len(gate.qubits) == 2:
+            two_q.append(error)
+            if gate.gate == "cz": cz.append(error)
+        elif gate.gate == "sx":
+            sx.append(error)
+
+    metrics = {
+        "T1 (median)": f"{float(np.median(t1s)):.2f} us",
+        "T2 (median)": f"{float(np.median(t2s)):.2f} us",
+        "Readout error (median)": f"{float(np.median(readout_errs)):.4e}",
+        "2Q error (median)": f"{float(np.median(two_q)):.4e}" if two_q else "N/A",
+        "2Q error (best)": f"{min(two_q):.4e}" if two_q else "N/A",
+        "SX error (median)": f"{float(np.median(sx)):.4e}" if sx else "N/A",
+        "CZ error (median)": f"{float(np.median(cz)):.4e}" if cz else "N/A",
+    }
+    return {"qubits": qubit_data, "gates": gate_data, "metrics": metrics}
+
+
+def columnar_extract(props) -> dict:
+    return CalibrationArrays(props).to_dict()
+
+
+def timeit(fn, props, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(props)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(qubit_counts, repeat: int):
+    print(f"{'qubits':>7} {'gates':>7} {'legacy ms':>10} {'extract ms':>11} {'summary ms':>11} {'cached ms':>10}")
+    for n in qubit_counts:
+        props = FakeProperties(n)
+        assert legacy_extract(props)["metrics"] == columnar_extract(props)["metrics"], "metrics differ"
+        legacy = timeit(legacy_extract, props, repeat)
+        columnar = timeit(columnar_extract, props, repeat)
+        summary = timeit(lambda p: CalibrationArrays(p).metrics(), props, repeat)
+        # backend_cache keeps one CalibrationArrays per properties snapshot, so repeat
+        # detail requests only pay for the memoized to_dict()
+        cached = CalibrationArrays(props)
+        warm = timeit(lambda p: cached.to_dict(), props, repeat)
+        print(
+            f"{n:>7} {len(props.gates):>7} {legacy * 1e3:>10.2f} {columnar * 1e3:>11.2f}"
+            f" {summary * 1e3:>11.2f} {warm * 1e3:>10.4f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--qubits", type=int, nargs="+", default=[27, 127, 156, 1000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    run(args.qubits, args.repeat)
@@ -0,0 +1,66 @@
+"""Archives months of hourly calibration snapshots and times downsampled trend queries.
+
+Run from Backend/:  python -m benchmarks.bench_calibration_history --qubits 133 --days 180
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import timedelta
+
+from benchmarks.fake_runtime import FakeProperties
+from calibration import CalibrationArrays
+from calibration_history import CalibrationHistory
+
+QUERIES = (
+    ("T1", None),
+    ("T1", "7"),
+    ("readout_error", None),
+    ("2q_error", None),
+    ("ecr_error", "0_1"),
+)
+
+
+def directory_bytes(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(path) for f in files)
+
+
+def run(num_qubits: int, days: int, per_day: int, buckets: int, repeat: int):
+    history = CalibrationHistory(tempfile.mkdtemp())
+    snapshots = days * per_day
+    base = FakeProperties(num_qubits).last_update_date
+    start = time.perf_counter()
+    for i in range(snapshots):
+        props = FakeProperties(num_qubits, seed=i % 50)
+        props.last_update_date = base + timedelta(hours=24 * i / per_day)
+        history.append("bench", CalibrationArrays(props))
+    archive_s = time.perf_counter() - start
+    size = directory_bytes(history.root)
+    print(f"{snapshots} snapshots of {num_qubits} qubits archived in {archive_s:.1f}s, {size / 1e6:.1f} MB on disk")
+
+    range_start, range_end = base.timestamp(), (base + timedelta(days=days)).timestamp()
+    print(f"{'metric':<15} {'target':>7} {'buckets':>8} {'cold ms':>8} {'warm ms':>8}")
+    for metric, target in QUERIES:
+        # Cold: a fresh reader, as in a newly started worker
+        reader = CalibrationHistory(history.root)
+        start = time.perf_counter()
+        result = reader.query("bench", metric, range_start, range_end, buckets, target)
+        cold = time.perf_counter() - start
+        warm = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            reader.query("bench", metric, range_start, range_end, buckets, target)
+            warm = min(warm, time.perf_counter() - start)
+        assert result["snapshots"] == snapshots
+        print(f"{metric:<15} {target or '-':>7} {len(result['columns']['time']):>8} {cold * 1e3:>8.2f} {warm * 1e3:>8.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--qubits", type=int, default=133)
+    parser.add_argument("--days", type=int, default=180)
+    parser.add_argument("--per-day", type=int, default=24)
+    parser.add_argument("--buckets", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    run(args.qubits, args.days, args.per_day, args.buckets, args.repeat)
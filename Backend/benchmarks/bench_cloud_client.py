@@ -0,0 +1,65 @@
+"""Times IBMCloudClient's pooled transport against bare requests.get calls on the local REST stub.
+
+Its behaviour (token single-flight, retries, timeouts, refresh backoff) is covered by tests/test_ibm_cloud_client.py.
+
+Run from Backend/:  python -m benchmarks.bench_cloud_client --requests 200
+"""
+import argparse
+import asyncio
+import time
+
+import requests
+
+from ibm_cloud_client import IBMCloudClient
+from benchmarks.stub_ibm_cloud import StubServer
+
+
+def make_client(server: StubServer, **kwargs) -> IBMCloudClient:
+    return IBMCloudClient(
+        "stub-api-key",
+        "crn:v1:bluemix:public:quantum-computing:us-east:a/stub::",
+        base_url=f"{server.url}/api/v1",
+        iam_url=f"{server.url}/identity/token",
+        backoff=0.01,
+        **kwargs,
+    )
+
+
+async def pooled(server: StubServer, num_requests: int) -> float:
+    async with make_client(server) as client:
+        await client.get_token()
+        start = time.perf_counter()
+        for _ in range(num_requests):
+            await client.get_backend_status("ibm_brisbane")
+        return time.perf_counter() - start
+
+
+def unpooled(server: StubServer, num_requests: int) -> float:
+    """The previous transport: a bare requests.get per call"""
+    start = time.perf_counter()
+    for _ in range(num_requests):
+        requests.get(
+            f"{server.url}/api/v1/backends/ibm_brisbane/status", headers={"Authorization": "Bearer token-0"}
+        ).raise_for_status()
+    return time.perf_counter() - start
+
+
+def run(num_requests: int):
+    with StubServer() as server:
+        server.state.connections.clear()
+        bare = unpooled(server, num_requests)
+        bare_connections = len(server.state.connections)
+        server.state.connections.clear()
+        pool = asyncio.run(pooled(server, num_requests))
+        pool_connections = len(server.state.connections)
+
+    print(f"\n{'transport':<22} {'connections':>11} {'total ms':>9} {'per call ms':>12}")
+    print(f"{'requests.get':<22} {bare_connections:>11} {bare * 1e3:>9.1f} {bare / num_requests * 1e3:>12.3f}")
+    print(f"{'pooled httpx':<22} {pool_connections:>11} {pool * 1e3:>9.1f} {pool / num_requests * 1e3:>12.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    run(args.requests)
@@ -0,0 +1,54 @@
+"""Build time and encoded size of the connectivity graph per device size.
+
+Run from Backend/:  python -m benchmarks.bench_connectivity --qubits 27 127 156
+"""
+import argparse
+import time
+
+from benchmarks.fake_runtime import FakeProperties
+from calibration import CalibrationArrays
+from connectivity import CONNECTIVITY_CHAIN_LENGTHS, CONNECTIVITY_SUBGRAPH_SIZES, ConnectivityGraph
+from serialization import encode_json
+
+
+def timed(fn, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(qubit_counts: list, repeat: int):
+    print(f"chains {list(CONNECTIVITY_CHAIN_LENGTHS)}, subgraphs {list(CONNECTIVITY_SUBGRAPH_SIZES)}")
+    print(f"{'qubits':>6} {'edges':>6} {'csr ms':>8} {'chains ms':>10} {'subgraphs ms':>13} {'KiB':>7} {'graph KiB':>10} {'objects KiB':>12}")
+    for n in qubit_counts:
+        calibration = CalibrationArrays(FakeProperties(n))
+        build, graph = timed(lambda: ConnectivityGraph(calibration), repeat)
+        chains, _ = timed(lambda: [graph.best_chains(k) for k in CONNECTIVITY_CHAIN_LENGTHS], repeat)
+        subgraphs, _ = timed(lambda: graph.best_subgraphs(CONNECTIVITY_SUBGRAPH_SIZES), repeat)
+        document = graph.to_dict()
+        size = len(encode_json(document))
+        graph_size = len(encode_json({key: document[key] for key in ("csr", "edges", "nodes")}))
+        # The same graph as one object per qubit and per edge, for comparison
+        objects = {
+            "nodes": [{"id": q, "T1": t1, "T2": t2, "readout_error": ro} for q, (t1, t2, ro) in enumerate(
+                zip(document["nodes"]["T1"], document["nodes"]["T2"], document["nodes"]["readout_error"])
+            )],
+            "links": [{"source": int(a), "target": int(b), "error": e} for (a, b), e in zip(
+                graph.edge_pairs.tolist(), document["edges"]["error"]
+            )],
+        }
+        print(
+            f"{n:>6} {len(graph.edge_pairs):>6} {build * 1e3:>8.2f} {chains * 1e3:>10.2f} {subgraphs * 1e3:>13.2f} "
+            f"{size / 1024:>7.1f} {graph_size / 1024:>10.1f} {len(encode_json(objects)) / 1024:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--qubits", type=int, nargs="+", default=[27, 127, 156])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.qubits, args.repeat)
@@ -0,0 +1,40 @@
+"""Measures lite job conversion throughput against the concurrency cap.
+
+Run from Backend/:  python -m benchmarks.bench_job_executor --jobs 200 --latency 0.02
+"""
+import argparse
+import asyncio
+import time
+
+import backend
+from sdk_executor import SDKExecutor
+from benchmarks.fake_runtime import FakeRuntimeService
+
+
+async def convert_all(jobs):
+    return await asyncio.gather(*[backend.job_to_dict(job, lite=True) for job in jobs])
+
+
+def run(num_jobs: int, latency: float, caps):
+    jobs = FakeRuntimeService(num_jobs=num_jobs, latency=latency).jobs(limit=num_jobs)
+    baseline = None
+    print(f"{'cap':>5} {'seconds':>9} {'jobs/s':>9} {'speedup':>8} {'ideal':>6}")
+    for cap in caps:
+        executor = SDKExecutor(max_workers=cap, max_concurrency=cap)
+        backend.sdk_executor = executor
+        start = time.perf_counter()
+        results = asyncio.run(convert_all(jobs))
+        elapsed = time.perf_counter() - start
+        executor.shutdown()
+        assert all("error" not in r for r in results), "conversion failed"
+        baseline = baseline or elapsed
+        print(f"{cap:>5} {elapsed:>9.3f} {num_jobs / elapsed:>9.1f} {baseline / elapsed:>7.1f}x {cap:>5}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds per SDK accessor call")
+    parser.add_argument("--caps", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    args = parser.parse_args()
+    run(args.jobs, args.latency, args.caps)
@@ -0,0 +1,51 @@
+"""Compares payload size and conversion time of lite rows, fields= projection and columnar output.
+
+Run from Backend/:  python -m benchmarks.bench_projection --jobs 1000
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import backend
+from job_store import json_default
+from benchmarks.fake_runtime import FakeRuntimeService
+
+DASHBOARD_FIELDS = "job_id,status,backend,user,submitted,elapsed_time,qpu_seconds"
+
+
+async def lite(jobs):
+    return await asyncio.gather(*[backend.job_to_dict(job, lite=True) for job in jobs])
+
+
+async def projected(jobs, names, columnar):
+    rows = await asyncio.gather(*[backend.project_job(job, names) for job in jobs])
+    return backend.render_projection(rows, names, columnar=columnar)
+
+
+def measure(label, make_payload, repeat: int = 5):
+    convert = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        payload = asyncio.run(make_payload())
+        convert = min(convert, time.perf_counter() - start)
+    start = time.perf_counter()
+    body = json.dumps(payload, default=json_default).encode()
+    encode = time.perf_counter() - start
+    print(f"{label:<28} {len(body) / 1024:>9.1f} {convert * 1e3:>11.1f} {encode * 1e3:>10.1f}")
+
+
+def run(num_jobs: int):
+    jobs = FakeRuntimeService(num_jobs=num_jobs).jobs(limit=num_jobs)
+    names = backend.parse_fields(DASHBOARD_FIELDS)
+    print(f"{'variant':<28} {'KiB':>9} {'convert ms':>11} {'encode ms':>10}")
+    measure("lite=true", lambda: lite(jobs))
+    measure("fields=<dashboard>", lambda: projected(jobs, names, columnar=False))
+    measure("fields=<dashboard> columnar", lambda: projected(jobs, names, columnar=True))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=1000)
+    args = parser.parse_args()
+    run(args.jobs)
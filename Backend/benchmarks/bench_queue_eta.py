@@ -0,0 +1,80 @@
+"""Compares ETA lookups from the queue wait sketches with scanning job history per request.
+
+Run from Backend/:  python -m benchmarks.bench_queue_eta --jobs 100000
+"""
+import argparse
+import random
+import statistics
+import time
+
+from queue_eta import QUANTILES, QueueETA, depth_bucket, hour_block
+
+BACKENDS = ("ibm_brisbane", "ibm_kyoto", "ibm_torino")
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def synthetic_history(num_jobs: int, seed: int = 0):
+    """Jobs over the last 30 days whose wait grows with the queue depth they joined"""
+    rng = random.Random(seed)
+    now = time.time()
+    records = []
+    for i, submitted in enumerate(sorted(int(now - rng.uniform(0, 30 * 86400)) for _ in range(num_jobs))):
+        depth = rng.randint(0, 300)
+        wait = rng.expovariate(1 / (30 + 4 * depth))
+        records.append({
+            "job_id": f"job{i}",
+            "backend": rng.choice(BACKENDS),
+            "submitted": time.strftime(DATE_FORMAT, time.gmtime(submitted)),
+            "status_and_usage": {"pending_time": f"{round(wait, 2)}s"},
+            "depth": depth,
+            "submitted_ts": submitted,
+        })
+    return records
+
+
+def scan_predict(records: list, backend: str, pending_jobs: int, now: float) -> dict:
+    """What an endpoint without sketches would do: filter history and sort on every request"""
+    hour, depth = hour_block(now), depth_bucket(pending_jobs)
+    waits = sorted(
+        float(r["status_and_usage"]["pending_time"][:-1])
+        for r in records
+        if r["backend"] == backend
+        and depth_bucket(r["depth"]) == depth
+        and hour_block(r["submitted_ts"]) == hour
+    )
+    return {f"p{round(q * 100)}": waits[min(len(waits) - 1, int(q * len(waits)))] for q in QUANTILES} if waits else {}
+
+
+def run(num_jobs: int, repeat: int):
+    records = synthetic_history(num_jobs)
+    eta = QueueETA()
+    start = time.perf_counter()
+    for record in records:
+        # Queue depth as the status poller would have seen it when the job was submitted
+        eta.observe_depths({record["backend"]: {"pending_jobs": record["depth"]}}, now=record["submitted_ts"])
+        eta.ingest(record)
+    ingest = time.perf_counter() - start
+    print(f"{num_jobs} jobs ingested in {ingest:.2f}s ({ingest / num_jobs * 1e6:.1f} us/job), {eta.stats()}")
+
+    now = time.time()
+    sketch_times, scan_times = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        predicted = eta.predict("ibm_brisbane", 120, now=now)
+        sketch_times.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        exact = scan_predict(records, "ibm_brisbane", 120, now)
+        scan_times.append(time.perf_counter() - start)
+    print(f"stratum {predicted['stratum']}, {predicted['samples']} samples")
+    print(f"{'quantile':>9} {'sketch s':>9} {'exact s':>9}")
+    for name, value in predicted["eta_seconds"].items():
+        print(f"{name:>9} {value:>9.1f} {exact.get(name, float('nan')):>9.1f}")
+    print(f"sketch lookup {statistics.median(sketch_times) * 1e3:.3f} ms, history scan {statistics.median(scan_times) * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.jobs, args.repeat)
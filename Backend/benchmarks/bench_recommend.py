@@ -0,0 +1,70 @@
+"""Latency and upstream calls of POST /api/backends/recommend across a large fleet.
+
+Run from Backend/:  python -m benchmarks.bench_recommend --backends 50 --latency 0.05
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+DATA_DIR = tempfile.mkdtemp()
+os.environ.setdefault("JOB_STORE_PATH", os.path.join(DATA_DIR, "jobs.sqlite3"))
+os.environ.setdefault("ARTIFACT_CACHE_DIR", os.path.join(DATA_DIR, "artifacts"))
+os.environ.setdefault("SHARED_CACHE_PATH", os.path.join(DATA_DIR, "shared.sqlite3"))
+os.environ.setdefault("CALIBRATION_HISTORY_DIR", os.path.join(DATA_DIR, "calibration"))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import backend  # noqa: E402
+from benchmarks.fake_runtime import FakeBackend, FakeRuntimeService  # noqa: E402
+
+CALLS = {"count": 0}
+
+
+def counting(method):
+    def wrapper(*args, **kwargs):
+        CALLS["count"] += 1
+        return method(*args, **kwargs)
+    return wrapper
+
+
+for name in ("status", "configuration", "properties"):
+    setattr(FakeBackend, name, counting(getattr(FakeBackend, name)))
+
+CIRCUIT = {"num_qubits": 20, "two_qubit_gates": 60, "single_qubit_gates": 150}
+
+
+def run(num_backends: int, latency: float, requests: int):
+    fleet = {f"ibm_fake{i:03d}": (127, 133, 156)[i % 3] for i in range(num_backends)}
+    backend.service = FakeRuntimeService(num_jobs=500, latency=latency, backends=fleet)
+    with TestClient(backend.app) as client:
+        start = time.perf_counter()
+        cold = client.post("/api/backends/recommend", json=CIRCUIT)
+        cold_s = time.perf_counter() - start
+        cold_calls = CALLS["count"]
+        assert cold.status_code == 200, cold.text
+
+        CALLS["count"] = 0
+        timings = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            response = client.post("/api/backends/recommend", json=CIRCUIT)
+            timings.append(time.perf_counter() - start)
+            assert response.status_code == 200
+        warm_calls = CALLS["count"] / requests
+
+    best = response.json()["recommended"][0]
+    print(f"{num_backends} backends, {latency * 1e3:.0f} ms per upstream call")
+    print(f"cold: {cold_s * 1e3:.0f} ms, {cold_calls} upstream calls")
+    print(f"warm: median {statistics.median(timings) * 1e3:.1f} ms, {warm_calls:.2f} upstream calls per request")
+    print(f"top pick {best['name']} (score {best['score']}, wait {best['expected_wait_seconds']}s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+    run(args.backends, args.latency, args.requests)
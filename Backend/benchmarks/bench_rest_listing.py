@@ -0,0 +1,93 @@
+"""Compares lite job listing through the SDK (RuntimeJob hydration) with the REST fast path.
+
+The REST side is served by the local stub from a recorded fixture of job rows; both
+sides see the same per-request latency. Run from Backend/:
+
+    python -m benchmarks.bench_rest_listing --jobs 500 --latency 0.01
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+import backend
+from benchmarks.bench_cloud_client import make_client
+from benchmarks.fake_runtime import FakeRuntimeService
+from benchmarks.stub_ibm_cloud import StubServer, StubState, job_payload
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "rest_jobs.json")
+COMPARED_FIELDS = ("job_id", "status", "backend", "program", "user", "region", "submitted", "elapsed_time", "qpu_seconds")
+
+
+def record_fixture(num_jobs: int):
+    jobs = FakeRuntimeService(num_jobs=num_jobs).jobs(limit=num_jobs)
+    os.makedirs(os.path.dirname(FIXTURE), exist_ok=True)
+    with open(FIXTURE, "w") as f:
+        # One row per line keeps the recording diffable
+        f.write("[\n" + ",\n".join(json.dumps(job_payload(job)) for job in jobs) + "\n]\n")
+    print(f"Recorded {len(jobs)} REST job rows to {FIXTURE}")
+
+
+async def sdk_listing(service: FakeRuntimeService, limit: int) -> list:
+    jobs = await backend.sdk_executor.run(service.jobs, limit=limit)
+    return await asyncio.gather(*[backend.job_to_dict(job, lite=True) for job in jobs])
+
+
+async def rest_listing(server: StubServer, limit: int, page_size: int) -> tuple:
+    backend.cloud_client = make_client(server)
+    await backend.cloud_client.get_token()
+    requests_before = server.state.requests
+    start = time.perf_counter()
+    records = [
+        backend.rest_job_to_dict(row)
+        async for row in backend.iter_rest_jobs(backend.cloud_client, limit, page_size=page_size)
+    ]
+    elapsed = time.perf_counter() - start
+    await backend.cloud_client.close()
+    return records, elapsed, server.state.requests - requests_before
+
+
+def run(num_jobs: int, latency: float, page_size: int):
+    if not os.path.exists(FIXTURE):
+        record_fixture(max(num_jobs, 500))
+    with open(FIXTURE) as f:
+        rows = json.load(f)
+    num_jobs = min(num_jobs, len(rows))
+
+    service = FakeRuntimeService(num_jobs=len(rows), latency=latency)
+    backend.INSTANCE = service._jobs[0].instance
+    start = time.perf_counter()
+    sdk_records = asyncio.run(sdk_listing(service, num_jobs))
+    sdk_elapsed = time.perf_counter() - start
+
+    state = StubState(fixture=rows)
+    state.delay = latency
+    with StubServer(state) as server:
+        rest_records, rest_elapsed, rest_requests = asyncio.run(rest_listing(server, num_jobs, page_size))
+
+    # Same schema and the same values for the fields listings show
+    assert [sorted(r) for r in rest_records] == [sorted(r) for r in sdk_records]
+    for sdk_record, rest_record in zip(sdk_records, rest_records):
+        for field in COMPARED_FIELDS:
+            assert sdk_record[field] == rest_record[field], (field, sdk_record[field], rest_record[field])
+
+    # service.jobs plus one worker call per job reading every accessor
+    sdk_calls = 1 + num_jobs * 3
+    print(f"{num_jobs} jobs, {latency * 1e3:.0f} ms per upstream request, REST page size {page_size}")
+    print(f"{'path':<10} {'upstream requests':>18} {'total ms':>9}")
+    print(f"{'sdk':<10} {sdk_calls:>18} {sdk_elapsed * 1e3:>9.1f}")
+    print(f"{'rest':<10} {rest_requests:>18} {rest_elapsed * 1e3:>9.1f}")
+    print(f"speedup: {sdk_elapsed / rest_elapsed:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.01)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--record", action="store_true", help="re-record the fixture before running")
+    args = parser.parse_args()
+    if args.record:
+        record_fixture(max(args.jobs, 500))
+    run(args.jobs, args.latency, args.page_size)
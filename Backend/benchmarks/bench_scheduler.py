@@ -0,0 +1,126 @@
+"""Upstream scheduler: interactive latency behind a bulk refresh, 429 adaptation and coalescing.
+
+Run from Backend/:  python -m benchmarks.bench_scheduler --rate 20 --bulk 200
+"""
+import argparse
+import asyncio
+import statistics
+import threading
+import time
+from collections import deque
+
+from sdk_executor import SDKExecutor
+from upstream_scheduler import UpstreamScheduler, lane
+
+
+class TooManyRequests(Exception):
+    status_code = 429
+
+
+class RateLimitedUpstream:
+    """Fake API answering at most `limit` calls per rolling second; the excess gets a 429"""
+
+    def __init__(self, limit: float, latency: float):
+        self.limit = limit
+        self.latency = latency
+        self.accepted = 0
+        self.rejected = 0
+        self._recent = deque()
+        self._lock = threading.Lock()
+
+    def call(self, key):
+        with self._lock:
+            now = time.monotonic()
+            while self._recent and self._recent[0] < now - 1:
+                self._recent.popleft()
+            if len(self._recent) >= self.limit:
+                self.rejected += 1
+                raise TooManyRequests("429 Too Many Requests")
+            self._recent.append(now)
+            self.accepted += 1
+        time.sleep(self.latency)
+        return key
+
+
+async def priority(rate: float, bulk: int, latency: float, lanes: bool) -> list:
+    """Latency of 10 interactive calls issued while a bulk refresh is queued"""
+    executor = SDKExecutor(scheduler=UpstreamScheduler(32, rate_limit=rate, burst=1))
+    upstream = RateLimitedUpstream(float("inf"), latency)
+
+    async def background(i):
+        with lane("background"):
+            await executor.run(upstream.call, ("bulk", i))
+
+    async def interactive(i):
+        with lane("interactive" if lanes else "background"):
+            start = time.perf_counter()
+            await executor.run(upstream.call, ("detail", i))
+            return time.perf_counter() - start
+
+    bulk_tasks = [asyncio.ensure_future(background(i)) for i in range(bulk)]
+    await asyncio.sleep(0.5)
+    timings = await asyncio.gather(*[interactive(i) for i in range(10)])
+    await asyncio.gather(*bulk_tasks)
+    executor.shutdown()
+    return timings
+
+
+async def adaptive(limit: float, calls: int, latency: float) -> dict:
+    """Unlimited scheduler meeting an upstream limit: 429s, settled rate and throughput"""
+    executor = SDKExecutor()
+    upstream = RateLimitedUpstream(limit, latency)
+
+    async def call(i):
+        # The service's own retry: wait a little and try again until it goes through
+        while True:
+            try:
+                return await executor.run(upstream.call, i)
+            except TooManyRequests:
+                await asyncio.sleep(0.2)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[call(i) for i in range(calls)])
+    elapsed = time.perf_counter() - start
+    executor.shutdown()
+    return {
+        "seconds": elapsed,
+        "rejected": upstream.rejected,
+        "throttles": executor.scheduler.throttles,
+        "rate": executor.scheduler.stats()["rate"],
+    }
+
+
+async def coalescing(callers: int, latency: float) -> tuple:
+    executor = SDKExecutor()
+    upstream = RateLimitedUpstream(float("inf"), latency)
+    await asyncio.gather(*[executor.run(upstream.call, "backends") for _ in range(callers)])
+    executor.shutdown()
+    return upstream.accepted, executor.coalesced
+
+
+def run(rate: float, bulk: int, latency: float, limit: float):
+    print(f"{bulk} queued background calls at {rate:g} calls/s, then 10 interactive calls:")
+    for lanes in (False, True):
+        timings = asyncio.run(priority(rate, bulk, latency, lanes))
+        label = "priority lanes" if lanes else "single FIFO lane"
+        print(f"  {label:<17} interactive median {statistics.median(timings) * 1e3:8.1f} ms, max {max(timings) * 1e3:8.1f} ms")
+
+    result = asyncio.run(adaptive(limit, int(limit * 10), latency))
+    print(f"\nUnlimited scheduler vs an upstream allowing {limit:g} calls/s ({int(limit * 10)} calls):")
+    print(
+        f"  {result['seconds']:.1f}s, {result['rejected']} rejected calls, {result['throttles']} throttles, "
+        f"adaptive rate now {result['rate']} calls/s"
+    )
+
+    accepted, coalesced = asyncio.run(coalescing(100, latency))
+    print(f"\n100 concurrent identical calls: {accepted} upstream call(s), {coalesced} coalesced")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rate", type=float, default=20, help="configured UPSTREAM_RATE_LIMIT")
+    parser.add_argument("--bulk", type=int, default=200, help="background calls queued ahead")
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds per upstream call")
+    parser.add_argument("--limit", type=float, default=30, help="calls/s the fake upstream accepts")
+    args = parser.parse_args()
+    run(args.rate, args.bulk, args.latency, args.limit)
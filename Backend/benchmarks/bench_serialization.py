@@ -0,0 +1,82 @@
+"""Serialization CPU per job listing: FastAPI's default encoding vs the serialization layer.
+
+Run from Backend/:  python -m benchmarks.bench_serialization --jobs 1000
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+import backend
+import serialization
+from job_store import TERMINAL_STATUSES, json_default
+from serialization import JSON, MSGPACK, FragmentCache, compress, encode_records, encode_stored
+from benchmarks.fake_runtime import FakeRuntimeService
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def row(label: str, seconds: float, size: int):
+    print(f"{label:<40} {seconds * 1e3:>9.2f} {size / 1024:>9.1f}")
+
+
+def measure_listing(label: str, records: list, repeat: int):
+    """One listing of records: before (jsonable_encoder + json.dumps, as FastAPI does for a
+    returned list) and after (orjson fragments, cold and with the fragment cache warm)"""
+    print(f"\n{label}: {len(records)} records, {sum(r.get('status') in TERMINAL_STATUSES for r in records)} terminal")
+    print(f"{'encoding':<40} {'ms':>9} {'KiB':>9}")
+    before = JSONResponse(jsonable_encoder(records)).body
+    row("before: FastAPI default (JSONResponse)", best_of(lambda: JSONResponse(jsonable_encoder(records)), repeat), len(before))
+
+    for media_type in (JSON, MSGPACK) if serialization.msgpack else (JSON,):
+        name = "msgpack" if media_type == MSGPACK else "json"
+
+        def cold():
+            serialization.fragments = FragmentCache()
+            return encode_records(records, media_type, "bench")
+
+        body = cold()
+        row(f"after: {name} fragments, cold", best_of(cold, repeat), len(body))
+        row(f"after: {name} fragments, warm", best_of(lambda: encode_records(records, media_type, "bench"), repeat), len(body))
+
+    # Lite listings from the job store: the stored JSON text is the fragment
+    stored = [(r.get("job_id"), json.dumps(r, default=json_default)) for r in records]
+    body = encode_stored(stored, JSON)
+    row("after: json from stored payloads", best_of(lambda: encode_stored(stored, JSON), repeat), len(body))
+    if serialization.msgpack:
+        packed = encode_stored(stored, MSGPACK)
+        row("after: msgpack from stored payloads, warm", best_of(lambda: encode_stored(stored, MSGPACK), repeat), len(packed))
+
+    for encoding in ("gzip", "zstd") if serialization.zstandard else ("gzip",):
+        compressed = compress(body, encoding)
+        row(f"compression: {encoding}", best_of(lambda: compress(body, encoding), repeat), len(compressed))
+
+
+async def convert(jobs: list, lite: bool) -> list:
+    return await asyncio.gather(*[backend.job_to_dict(job, lite=lite) for job in jobs])
+
+
+def run(num_jobs: int, repeat: int):
+    print(f"orjson: {serialization.orjson is not None}, msgpack: {serialization.msgpack is not None}, "
+          f"zstandard: {serialization.zstandard is not None}")
+    jobs = FakeRuntimeService(num_jobs=num_jobs).jobs(limit=num_jobs)
+    measure_listing("lite=true", asyncio.run(convert(jobs, lite=True)), repeat)
+    measure_listing("full", asyncio.run(convert(jobs, lite=False)), repeat)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    run(args.jobs, args.repeat)
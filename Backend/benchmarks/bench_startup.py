@@ -0,0 +1,123 @@
+"""Measures cold start: `import backend`, and uvicorn launch to the first healthy /api/health response.
+
+Run from Backend/:  python -m benchmarks.bench_startup --runs 5 [--save]
+
+--save appends the medians to benchmarks/results/startup.jsonl so regressions can be tracked
+across commits.
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS = os.path.join(BACKEND_DIR, "benchmarks", "results", "startup.jsonl")
+
+IMPORT_SNIPPET = (
+    "import time; start = time.perf_counter(); import backend; "
+    "print(time.perf_counter() - start)"
+)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def base_env(credentials: bool) -> dict:
+    env = {**os.environ, "JOB_STORE_PATH": os.path.join(tempfile.mkdtemp(), "jobs.sqlite3")}
+    env["ARTIFACT_CACHE_DIR"] = os.path.join(tempfile.mkdtemp(), "artifacts")
+    if credentials:
+        # Credentials that point at an unreachable proxy: the connection must fail
+        # (and retry) in the background without delaying the first healthy response
+        env.update({
+            "IBM_QUANTUM_TOKEN": "bench-token",
+            "IBM_QUANTUM_INSTANCE": "crn:v1:bluemix:public:quantum-computing:us-east:a/bench::",
+            "HTTPS_PROXY": f"http://127.0.0.1:{free_port()}",
+        })
+    else:
+        env.update({"IBM_QUANTUM_TOKEN": "", "IBM_QUANTUM_INSTANCE": ""})
+    return env
+
+
+def measure_import(env: dict) -> float:
+    out = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET], cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def get(url: str) -> int:
+    try:
+        with urllib.request.urlopen(url, timeout=1) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except OSError:
+        return 0
+
+
+def measure_first_health(env: dict, timeout: float = 60) -> tuple:
+    port = free_port()
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env={**env, "NO_PROXY": "127.0.0.1,localhost"},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            if get(f"http://127.0.0.1:{port}/api/health") == 200:
+                elapsed = time.perf_counter() - start
+                return elapsed, get(f"http://127.0.0.1:{port}/api/ready")
+            time.sleep(0.01)
+        raise TimeoutError("server did not become healthy")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True
+        ).stdout.strip()
+    except OSError:
+        return "unknown"
+
+
+def run(runs: int, save: bool):
+    results = {}
+    print(f"{'scenario':<22} {'import s':>9} {'first health s':>15} {'/api/ready':>11}")
+    for scenario, credentials in (("no credentials", False), ("unreachable IBM", True)):
+        env = base_env(credentials)
+        imports = [measure_import(env) for _ in range(runs)]
+        healths, ready = [], None
+        for _ in range(runs):
+            elapsed, ready = measure_first_health(env)
+            healths.append(elapsed)
+        results[scenario] = {"import_s": statistics.median(imports), "first_health_s": statistics.median(healths)}
+        print(f"{scenario:<22} {results[scenario]['import_s']:>9.3f} {results[scenario]['first_health_s']:>15.3f} {ready:>11}")
+
+    if save:
+        os.makedirs(os.path.dirname(RESULTS), exist_ok=True)
+        with open(RESULTS, "a") as f:
+            f.write(json.dumps({"time": time.time(), "commit": git_commit(), "runs": runs, "results": results}) + "\n")
+        print(f"Saved to {RESULTS}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--save", action="store_true")
+    args = parser.parse_args()
+    run(args.runs, args.save)
@@ -0,0 +1,223 @@
+"""End-to-end route benchmarks against the deterministic fake runtime service.
+
+Run from Backend/:  python -m benchmarks.bench_suite --latency 0.002 [--save] [--compare]
+
+Covers job listings of 100/1000/10000 jobs, metrics, backend detail (cold and warm),
+job detail and concurrent mixed client load, in process through the ASGI app.
+--save appends the results to benchmarks/results/suite.jsonl; --compare checks them
+against the last saved run with the same parameters and exits 1 on a regression.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import tempfile
+import time
+
+DATA_DIR = tempfile.mkdtemp()
+os.environ.setdefault("JOB_STORE_PATH", os.path.join(DATA_DIR, "jobs.sqlite3"))
+os.environ.setdefault("ARTIFACT_CACHE_DIR", os.path.join(DATA_DIR, "artifacts"))
+os.environ.setdefault("SHARED_CACHE_PATH", os.path.join(DATA_DIR, "shared.sqlite3"))
+os.environ.setdefault("CALIBRATION_HISTORY_DIR", os.path.join(DATA_DIR, "calibration"))
+# Routes convert RuntimeJobs on every request instead of answering from the synced store
+os.environ.setdefault("JOB_SYNC_ENABLED", "false")
+# No background status polls adding upstream calls in the middle of a scenario
+os.environ.setdefault("BACKEND_POLL_INTERVAL", "3600")
+
+import httpx  # noqa: E402
+
+import backend  # noqa: E402
+from benchmarks.bench_startup import git_commit  # noqa: E402
+from benchmarks.fake_runtime import DEVICE_FLEET, FakeRuntimeService  # noqa: E402
+
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+RESULTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results", "suite.jsonl")
+DETAIL_BACKEND = "ibm_fez"
+MIN_SCENARIO_SECONDS = 1.0
+MAX_RUNS = 200
+
+
+def upstream_calls() -> int:
+    return sum(backend.service.calls.values())
+
+
+def reset_backend_caches():
+    backend.backend_cache.invalidate()
+    backend.shared_cache.delete(f"backends:detail:{DETAIL_BACKEND}")
+    backend.shared_cache.delete(f"backends:calibration:{DETAIL_BACKEND}")
+    backend.shared_cache.delete("backends:list")
+
+
+async def get_ok(client: httpx.AsyncClient, url: str) -> httpx.Response:
+    response = await client.get(url)
+    assert response.status_code == 200, f"{url}: {response.status_code} {response.text[:200]}"
+    return response
+
+
+def scenarios(num_jobs: int) -> dict:
+    """name -> async callable(client, iteration) making the measured request(s)"""
+    completed = [job.job_id() for job in backend.service._jobs if job._status == "DONE"]
+
+    async def backend_detail_cold(client, i):
+        reset_backend_caches()
+        await get_ok(client, f"/api/backends/{DETAIL_BACKEND}")
+
+    table = {
+        f"list_jobs_lite_{n}": (lambda client, i, n=n: get_ok(client, f"/api/jobs?limit={n}&lite=true"))
+        for n in (100, 1000, 10000) if n <= num_jobs
+    }
+    table.update({
+        "list_jobs_full_100": lambda client, i: get_ok(client, "/api/jobs?limit=100"),
+        "job_detail": lambda client, i: get_ok(client, f"/api/jobs/{completed[i % len(completed)]}"),
+        "metrics": lambda client, i: get_ok(client, "/api/metrics"),
+        "backends_list": lambda client, i: get_ok(client, "/api/backends"),
+        "backend_detail_cold": backend_detail_cold,
+        "backend_detail_warm": lambda client, i: get_ok(client, f"/api/backends/{DETAIL_BACKEND}"),
+    })
+    return table
+
+
+async def measure(request, client: httpx.AsyncClient, repeat: int) -> dict:
+    # One unmeasured run first, so the first scenario does not pay for warming up the process
+    await request(client, repeat)
+    timings, calls = [], []
+    # Fast scenarios repeat for a while longer: their medians are noisy over a handful of runs
+    while len(timings) < repeat or (sum(timings) < MIN_SCENARIO_SECONDS and len(timings) < MAX_RUNS):
+        i = len(timings)
+        before = upstream_calls()
+        start = time.perf_counter()
+        await request(client, i)
+        timings.append(time.perf_counter() - start)
+        calls.append(upstream_calls() - before)
+    return summarize(timings, statistics.mean(calls))
+
+
+async def measure_calculate_metrics(client: httpx.AsyncClient, repeat: int) -> dict:
+    """calculate_metrics alone over the full lite listing (whose conversion is not timed)"""
+    records = (await get_ok(client, f"/api/jobs?limit={len(backend.service._jobs)}&lite=true")).json()
+    timings = []
+    while len(timings) < repeat or (sum(timings) < MIN_SCENARIO_SECONDS and len(timings) < MAX_RUNS):
+        start = time.perf_counter()
+        await backend.calculate_metrics(records)
+        timings.append(time.perf_counter() - start)
+    return summarize(timings, 0)
+
+
+async def measure_concurrent(client: httpx.AsyncClient, clients: int, requests_per_client: int) -> dict:
+    """Clients issuing a dashboard-like mix of requests at the same time"""
+    mix = ["/api/jobs?limit=100&lite=true", "/api/metrics", "/api/backends", f"/api/backends/{DETAIL_BACKEND}"]
+    timings = []
+
+    async def client_loop(c: int):
+        for i in range(requests_per_client):
+            start = time.perf_counter()
+            await get_ok(client, mix[(c + i) % len(mix)])
+            timings.append(time.perf_counter() - start)
+
+    before = upstream_calls()
+    start = time.perf_counter()
+    await asyncio.gather(*[client_loop(c) for c in range(clients)])
+    elapsed = time.perf_counter() - start
+    result = summarize(timings, (upstream_calls() - before) / len(timings))
+    result["requests_per_s"] = round(len(timings) / elapsed, 1)
+    return result
+
+
+def summarize(timings: list, calls: float) -> dict:
+    p95 = statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0]
+    return {
+        "median_ms": round(statistics.median(timings) * 1e3, 2),
+        "p95_ms": round(p95 * 1e3, 2),
+        "upstream_calls": round(calls, 2),
+    }
+
+
+async def run_suite(params: dict, only: list) -> dict:
+    backend.service = FakeRuntimeService(num_jobs=params["jobs"], latency=params["latency"], backends=DEVICE_FLEET)
+    results = {}
+    transport = httpx.ASGITransport(app=backend.app)
+    async with backend.lifespan(backend.app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            # Warm-up: backend objects and configurations, as on a running server
+            await get_ok(client, "/api/backends")
+            for name, request in scenarios(params["jobs"]).items():
+                if not only or name in only:
+                    results[name] = await measure(request, client, params["repeat"])
+                    print_row(name, results[name])
+            if not only or "calculate_metrics" in only:
+                results["calculate_metrics"] = await measure_calculate_metrics(client, params["repeat"])
+                print_row("calculate_metrics", results["calculate_metrics"])
+            if not only or "concurrent_load" in only:
+                results["concurrent_load"] = await measure_concurrent(client, params["clients"], params["repeat"])
+                print_row("concurrent_load", results["concurrent_load"])
+    return results
+
+
+def print_row(name: str, result: dict):
+    rps = f"{result['requests_per_s']:>9.1f}" if "requests_per_s" in result else f"{'':>9}"
+    print(f"{name:<24} {result['median_ms']:>10.2f} {result['p95_ms']:>10.2f} {result['upstream_calls']:>10.2f} {rps}")
+
+
+def last_saved(params: dict):
+    if not os.path.exists(RESULTS):
+        return None
+    with open(RESULTS) as f:
+        runs = [json.loads(line) for line in f if line.strip()]
+    runs = [run for run in runs if run["params"] == params]
+    return runs[-1] if runs else None
+
+
+def compare(results: dict, baseline: dict, threshold: float, min_delta_ms: float) -> bool:
+    """Prints the change of each median against the baseline; returns False on a regression"""
+    print(f"\nvs {baseline['commit']} ({time.strftime('%Y-%m-%d %H:%M', time.localtime(baseline['time']))}):")
+    ok = True
+    for name, result in results.items():
+        before = baseline["results"].get(name)
+        if not before:
+            continue
+        change = result["median_ms"] / before["median_ms"] - 1 if before["median_ms"] else 0.0
+        # Cache entries expiring during a long run add the odd upstream call, so allow a little
+        slower = change > threshold and result["median_ms"] - before["median_ms"] > min_delta_ms
+        regressed = slower or result["upstream_calls"] > before["upstream_calls"] * (1 + threshold) + 0.5
+        ok &= not regressed
+        flag = "REGRESSION" if regressed else ""
+        print(f"{name:<24} {before['median_ms']:>10.2f} -> {result['median_ms']:>10.2f} ms {change:>+8.1%} {flag}")
+    return ok
+
+
+def main(args) -> int:
+    params = {"jobs": args.jobs, "latency": args.latency, "repeat": args.repeat, "clients": args.clients}
+    baseline = last_saved(params) if args.compare else None
+    print(f"{params['jobs']} jobs, {args.latency * 1e3:.1f} ms per upstream call, at least {args.repeat} runs each")
+    print(f"{'scenario':<24} {'median ms':>10} {'p95 ms':>10} {'upstream':>10} {'req/s':>9}")
+    results = asyncio.run(run_suite(params, args.only))
+
+    ok = True
+    if args.compare:
+        if baseline:
+            ok = compare(results, baseline, args.threshold, args.min_delta_ms)
+        else:
+            print("\nNo saved run with these parameters to compare against")
+    if args.save:
+        os.makedirs(os.path.dirname(RESULTS), exist_ok=True)
+        with open(RESULTS, "a") as f:
+            f.write(json.dumps({"time": time.time(), "commit": git_commit(), "params": params, "results": results}) + "\n")
+        print(f"Saved to {RESULTS}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=10000)
+    parser.add_argument("--latency", type=float, default=0.002, help="seconds per upstream call")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--clients", type=int, default=16, help="concurrent clients in concurrent_load")
+    parser.add_argument("--only", nargs="+", default=[], help="scenario names to run")
+    parser.add_argument("--save", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.25, help="median slowdown counted as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0, help="smaller slowdowns are treated as noise")
+    raise SystemExit(main(parser.parse_args()))
@@ -0,0 +1,107 @@
+"""Upstream request rate of a multi-worker deployment as the worker count grows.
+
+Starts the RESP stub, then `uvicorn benchmarks.worker_app:app --workers N` for each N with
+SHARED_CACHE_URL pointing at the stub, drives the same client load at every N, and reports
+the upstream calls per second the fake service saw. With the shared tier and leader
+election that rate should stay flat instead of growing with N. Run from Backend/:
+
+    python -m benchmarks.bench_workers --workers 1 2 4 --duration 20
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+from benchmarks.bench_startup import free_port, get
+from benchmarks.resp_stub import RESPStubServer
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+UPSTREAM_COUNTER = "bench:upstream_calls"
+LOAD_PATHS = ("/api/backends", "/api/backends/ibm_brisbane", "/api/metrics", "/api/jobs?lite=true&limit=50")
+
+
+def drive_load(base: str, duration: float, clients: int) -> int:
+    """Each client loops over LOAD_PATHS until the deadline; returns the number of responses"""
+    deadline = time.perf_counter() + duration
+    counts = [0] * clients
+
+    def client(index: int):
+        while time.perf_counter() < deadline:
+            for path in LOAD_PATHS:
+                try:
+                    with urllib.request.urlopen(base + path, timeout=10) as response:
+                        response.read()
+                except OSError:
+                    pass
+                counts[index] += 1
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(counts)
+
+
+def run_workers(stub: RESPStubServer, workers: int, duration: float, clients: int, warmup: float) -> dict:
+    stub.state.execute([b"FLUSHALL"])
+    port = free_port()
+    data_dir = tempfile.mkdtemp()
+    env = {
+        **os.environ,
+        "SHARED_CACHE_URL": stub.url,
+        "JOB_STORE_PATH": os.path.join(data_dir, "jobs.sqlite3"),
+        "ARTIFACT_CACHE_DIR": os.path.join(data_dir, "artifacts"),
+        "IBM_QUANTUM_TOKEN": "",
+        "IBM_QUANTUM_INSTANCE": "",
+        "JOB_SYNC_INTERVAL": "2",
+        "BACKEND_POLL_INTERVAL": "2",
+        "BACKEND_CACHE_TTL_STATUS": "2",
+    }
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "benchmarks.worker_app:app", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    base = f"http://127.0.0.1:{port}"
+    try:
+        start = time.perf_counter()
+        while get(base + "/api/ready") != 200:
+            if time.perf_counter() - start > 60:
+                raise TimeoutError("workers did not become ready")
+            time.sleep(0.05)
+        # Let the leader fill the store and shared keys before measuring steady state
+        drive_load(base, warmup, clients)
+        before = int(stub.state.execute([b"GET", UPSTREAM_COUNTER.encode()]) or 0)
+        responses = drive_load(base, duration, clients)
+        after = int(stub.state.execute([b"GET", UPSTREAM_COUNTER.encode()]) or 0)
+    finally:
+        proc.terminate()
+        proc.wait()
+    return {"upstream_per_s": (after - before) / duration, "responses_per_s": responses / duration}
+
+
+def run(worker_counts: list, duration: float, clients: int, warmup: float):
+    print(f"{clients} clients, {duration:.0f}s per run, paths: {', '.join(LOAD_PATHS)}")
+    print(f"{'workers':>8} {'upstream calls/s':>17} {'responses/s':>12}")
+    with RESPStubServer() as stub:
+        for workers in worker_counts:
+            result = run_workers(stub, workers, duration, clients, warmup)
+            print(f"{workers:>8} {result['upstream_per_s']:>17.1f} {result['responses_per_s']:>12.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--warmup", type=float, default=5)
+    args = parser.parse_args()
+    run(args.workers, args.duration, args.clients, args.warmup)
@@ -0,0 +1,254 @@
+"""Offline stand-in for QiskitRuntimeService with injectable per-call latency"""
+import random
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from qiskit_ibm_runtime.exceptions import RuntimeJobNotFound
+
+DEFAULT_BACKENDS = {"ibm_brisbane": 127, "ibm_kyoto": 127, "ibm_torino": 133}
+# Falcon, Eagle and Heron sized devices
+DEVICE_FLEET = {"ibm_algiers": 27, "ibm_brisbane": 127, "ibm_kyoto": 127, "ibm_torino": 133, "ibm_fez": 156}
+
+
+class FakeJobStatus:
+    def __init__(self, name: str):
+        self.name = name
+
+
+class FakeCircuit:
+    """GHZ circuit with the two renderings job_circuit_payload reads"""
+
+    def __init__(self, num_qubits: int):
+        self.num_qubits = num_qubits
+
+    def qasm(self) -> str:
+        n = self.num_qubits
+        gates = [f"cx q[{q}],q[{q + 1}];" for q in range(n - 1)]
+        return "\n".join(
+            ["OPENQASM 2.0;", 'include "qelib1.inc";', f"qreg q[{n}];", f"creg c[{n}];", "h q[0];", *gates, "measure q -> c;"]
+        )
+
+    def __str__(self) -> str:
+        return f"GHZ circuit on {self.num_qubits} qubits"
+
+
+class FakeResult:
+    def __init__(self, counts: dict):
+        self._counts = counts
+
+    def get_counts(self) -> dict:
+        return self._counts
+
+
+class FakeJob:
+    def __init__(
+        self,
+        index: int,
+        latency: float = 0.0,
+        rng: Optional[random.Random] = None,
+        backends=tuple(DEFAULT_BACKENDS),
+        calls: Optional[Counter] = None,
+    ):
+        rng = rng or random.Random(index)
+        self.latency = latency
+        self.calls = calls if calls is not None else Counter()
+        self._job_id = f"fake{index:06d}"
+        self._backend_id = rng.choice(list(backends))
+        self.program_id = "sampler"
+        self.instance = "crn:v1:bluemix:public:quantum-computing:us-east:a/fake::"
+        self._status = rng.choice(["DONE", "DONE", "DONE", "ERROR", "CANCELLED", "QUEUED", "RUNNING"])
+        self.creation_date = datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=index)
+        queued = timedelta(seconds=rng.uniform(1, 600))
+        ran = timedelta(seconds=rng.uniform(1, 60))
+        self._running_date = self.creation_date + queued
+        self._end_date = self._running_date + ran if self._status in ("DONE", "ERROR", "CANCELLED") else None
+        self._qpu_seconds = round(ran.total_seconds(), 2)
+        # Derived from the index so adding these kept the rest of the generated jobs unchanged
+        self._num_qubits = 2 + index % 5
+        self._shots = (1024, 4096, 8192)[index % 3]
+
+    def _io(self, call: str):
+        self.calls[f"job.{call}"] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def job_id(self):
+        return self._job_id
+
+    def status(self):
+        self._io("status")
+        return FakeJobStatus(self._status)
+
+    @property
+    def end_date(self):
+        return self._end_date
+
+    def status_history(self):
+        self._io("status_history")
+        history = [{"status": "QUEUED", "datetime": self.creation_date}]
+        if self._status != "QUEUED":
+            history.append({"status": "RUNNING", "datetime": self._running_date})
+        if self._end_date:
+            history.append({"status": self._status, "datetime": self._end_date})
+        return history
+
+    def metrics(self):
+        self._io("metrics")
+        return {"usage": {"seconds": self._qpu_seconds, "quantum_seconds": self._qpu_seconds}}
+
+    def inputs(self):
+        self._io("inputs")
+        circuit = FakeCircuit(self._num_qubits)
+        return {"pubs": [(circuit, None, self._shots)], "circuits": [circuit], "version": 2}
+
+    def result(self):
+        self._io("result")
+        if self._status != "DONE":
+            raise RuntimeError(f"Job {self._job_id} has no result ({self._status})")
+        # Mostly all-zeros and all-ones, as a GHZ state measured on a noisy device
+        rng = random.Random(self._job_id)
+        n = self._num_qubits
+        ghz = int(self._shots * rng.uniform(0.85, 0.95))
+        zeros = ghz // 2 + rng.randint(-20, 20)
+        counts = {"0" * n: zeros, "1" * n: ghz - zeros}
+        for _ in range(self._shots - ghz):
+            noisy = format(rng.getrandbits(n), f"0{n}b")
+            counts[noisy] = counts.get(noisy, 0) + 1
+        return FakeResult(counts)
+
+
+class FakeNduv:
+    def __init__(self, name: str, value: float, unit: str = ""):
+        self.name = name
+        self.value = value
+        self.unit = unit
+
+
+class FakeGate:
+    def __init__(self, gate: str, qubits: List[int], error: float):
+        self.gate = gate
+        self.qubits = qubits
+        self.name = f"{gate}{'_'.join(str(q) for q in qubits)}"
+        self.parameters = [FakeNduv("gate_error", error), FakeNduv("gate_length", 60.0, "ns")]
+
+
+def coupling_edges(num_qubits: int) -> List[tuple]:
+    """Chain plus sparse rungs every 4 qubits, roughly heavy-hex density"""
+    row = max(2, int(num_qubits ** 0.5))
+    edges = [(q, q + 1) for q in range(num_qubits - 1)]
+    edges += [(q, q + row) for q in range(0, num_qubits - row, 4)]
+    return edges
+
+
+class FakeProperties:
+    def __init__(self, num_qubits: int, seed: int = 0, two_qubit_gate: str = "ecr"):
+        rng = random.Random(seed)
+        self.backend_name = f"fake_{num_qubits}q"
+        self.last_update_date = datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(days=seed)
+        self.qubits = [
+            [
+                FakeNduv("T1", rng.uniform(50, 400), "us"),
+                FakeNduv("T2", rng.uniform(20, 300), "us"),
+                FakeNduv("frequency", rng.uniform(4.5, 5.3), "GHz"),
+                FakeNduv("readout_error", rng.uniform(0.005, 0.05)),
+            ]
+            for _ in range(num_qubits)
+        ]
+        self.gates = [FakeGate(name, [q], rng.uniform(1e-4, 1e-3)) for q in range(num_qubits) for name in ("sx", "x")]
+        self.gates += [FakeGate(two_qubit_gate, [a, b], rng.uniform(3e-3, 3e-2)) for a, b in coupling_edges(num_qubits)]
+
+
+class FakeBackendStatus:
+    def __init__(self, name: str, pending_jobs: int):
+        self.backend_name = name
+        self.operational = True
+        self.status_msg = "active"
+        self.pending_jobs = pending_jobs
+
+
+class FakeBackendConfiguration:
+    def __init__(self, num_qubits: int):
+        self.backend_version = "1.0.0"
+        self.processor_type = {"family": "Eagle" if num_qubits <= 127 else "Heron", "revision": "3"}
+        self.basis_gates = ["ecr", "id", "rz", "sx", "x"]
+        self.n_qubits = num_qubits
+
+
+class FakeBackend:
+    def __init__(
+        self, name: str, num_qubits: int, latency: float = 0.0, seed: int = 0, calls: Optional[Counter] = None
+    ):
+        self.name = name
+        self.num_qubits = num_qubits
+        self.simulator = False
+        self.latency = latency
+        self.calls = calls if calls is not None else Counter()
+        self._seed = seed
+        self._properties = FakeProperties(num_qubits, seed=seed)
+
+    def _io(self, call: str):
+        self.calls[f"backend.{call}"] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def status(self):
+        self._io("status")
+        return FakeBackendStatus(self.name, pending_jobs=random.Random(self._seed).randint(0, 200))
+
+    def configuration(self):
+        self._io("configuration")
+        return FakeBackendConfiguration(self.num_qubits)
+
+    def properties(self):
+        self._io("properties")
+        return self._properties
+
+
+class FakeRuntimeService:
+    """Deterministic for a given seed; every upstream call is tallied in .calls"""
+
+    def __init__(self, num_jobs: int = 100, latency: float = 0.0, seed: int = 0, backends: Optional[dict] = None):
+        rng = random.Random(seed)
+        self.latency = latency
+        self.calls: Counter = Counter()
+        backends = backends or DEFAULT_BACKENDS
+        self._jobs = [
+            FakeJob(i, latency=latency, rng=rng, backends=tuple(backends), calls=self.calls) for i in range(num_jobs)
+        ]
+        self._backends = [
+            FakeBackend(name, qubits, latency=latency, seed=i, calls=self.calls)
+            for i, (name, qubits) in enumerate(backends.items())
+        ]
+
+    def _io(self, call: str):
+        self.calls[f"service.{call}"] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def backends(self, **kwargs) -> List[FakeBackend]:
+        self._io("backends")
+        return list(self._backends)
+
+    def backend(self, name: str) -> FakeBackend:
+        self._io("backend")
+        for backend in self._backends:
+            if backend.name == name:
+                return backend
+        raise ValueError(f"Backend {name} not found")
+
+    def jobs(self, limit: int = 10, skip: int = 0, created_after=None, pending=None, **kwargs) -> List[FakeJob]:
+        self._io("jobs")
+        jobs = sorted(self._jobs, key=lambda job: job.creation_date, reverse=True)
+        if created_after:
+            jobs = [job for job in jobs if job.creation_date > created_after]
+        if pending is not None:
+            jobs = [job for job in jobs if (job._status in ("QUEUED", "RUNNING")) == pending]
+        return jobs[skip:skip + limit]
+
+    def job(self, job_id: str) -> FakeJob:
+        for job in self._jobs:
+            if job.job_id() == job_id:
+                return job
+        raise RuntimeJobNotFound(f"Job {job_id} not found")
@@ -0,0 +1,158 @@
+"""Minimal Redis-protocol (RESP2) server: the subset of commands shared_state uses.
+
+It has no Lua interpreter: EVAL runs only the scripts shared_state sends, each mapped to
+a Python equivalent executed under the same lock as every other command.
+
+Run standalone from Backend/:  python -m benchmarks.resp_stub --port 6390
+"""
+import argparse
+import socketserver
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from shared_state import DELETE_IF_SCRIPT, RENEW_SCRIPT
+
+
+class RESPStubState:
+    def __init__(self):
+        self.data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+        self.commands = 0
+        self.lock = threading.Lock()
+
+    def _live(self, key: bytes) -> Optional[bytes]:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        value, expires = entry
+        if expires is not None and expires <= time.time():
+            del self.data[key]
+            return None
+        return value
+
+    def _renew(self, key: bytes, value: bytes, ms: bytes) -> int:
+        if self._live(key) != value:
+            return 0
+        self.data[key] = (value, time.time() + int(ms) / 1000.0)
+        return 1
+
+    def _delete_if(self, key: bytes, value: bytes) -> int:
+        if self._live(key) != value:
+            return 0
+        del self.data[key]
+        return 1
+
+    def execute(self, args: list):
+        command = args[0].upper()
+        with self.lock:
+            self.commands += 1
+            if command == b"EVAL":
+                scripts = {RENEW_SCRIPT.encode(): self._renew, DELETE_IF_SCRIPT.encode(): self._delete_if}
+                script = scripts.get(args[1])
+                if script is None:
+                    return Exception("ERR the stub only runs the scripts shared_state sends")
+                numkeys = int(args[2])
+                return script(*args[3 : 3 + numkeys], *args[3 + numkeys :])
+            if command in (b"PING", b"SELECT", b"AUTH"):
+                return "PONG" if command == b"PING" else "OK"
+            if command == b"GET":
+                return self._live(args[1])
+            if command == b"SET":
+                key, value, options = args[1], args[2], [a.upper() for a in args[3:]]
+                exists = self._live(key) is not None
+                if (b"NX" in options and exists) or (b"XX" in options and not exists):
+                    return None
+                expires = None
+                for unit, scale in ((b"PX", 1000.0), (b"EX", 1.0)):
+                    if unit in options:
+                        expires = time.time() + int(args[3 + options.index(unit) + 1]) / scale
+                self.data[key] = (value, expires)
+                return "OK"
+            if command == b"DEL":
+                return sum(1 for key in args[1:] if self.data.pop(key, None) is not None)
+            if command == b"INCR":
+                value = int(self._live(args[1]) or 0) + 1
+                self.data[args[1]] = (str(value).encode(), None)
+                return value
+            if command in (b"PEXPIRE", b"EXPIRE"):
+                value = self._live(args[1])
+                if value is None:
+                    return 0
+                scale = 1000.0 if command == b"PEXPIRE" else 1.0
+                self.data[args[1]] = (value, time.time() + int(args[2]) / scale)
+                return 1
+            if command == b"FLUSHALL":
+                self.data.clear()
+                return "OK"
+            if command == b"DBSIZE":
+                return len(self.data)
+        return Exception(f"ERR unknown command '{command.decode()}'")
+
+
+def encode_reply(reply) -> bytes:
+    if reply is None:
+        return b"$-1\r\n"
+    if isinstance(reply, Exception):
+        return b"-%s\r\n" % str(reply).encode()
+    if isinstance(reply, str):
+        return b"+%s\r\n" % reply.encode()
+    if isinstance(reply, int):
+        return b":%d\r\n" % reply
+    return b"$%d\r\n%s\r\n" % (len(reply), reply)
+
+
+def make_handler(state: RESPStubState):
+    class Handler(socketserver.StreamRequestHandler):
+        disable_nagle_algorithm = True
+
+        def read_command(self) -> Optional[list]:
+            line = self.rfile.readline()
+            if not line:
+                return None
+            count = int(line[1:-2])
+            args = []
+            for _ in range(count):
+                length = int(self.rfile.readline()[1:-2])
+                args.append(self.rfile.read(length + 2)[:-2])
+            return args
+
+        def handle(self):
+            while True:
+                args = self.read_command()
+                if args is None:
+                    return
+                self.wfile.write(encode_reply(state.execute(args)))
+
+    return Handler
+
+
+class RESPStubServer:
+    """Runs the stub on a local port in a background thread"""
+
+    def __init__(self, port: int = 0, state: Optional[RESPStubState] = None):
+        self.state = state or RESPStubState()
+        socketserver.ThreadingTCPServer.allow_reuse_address = True
+        self.server = socketserver.ThreadingTCPServer(("127.0.0.1", port), make_handler(self.state))
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"redis://127.0.0.1:{self.server.server_address[1]}/0"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=6390)
+    args = parser.parse_args()
+    with RESPStubServer(args.port) as stub:
+        print(f"RESP stub listening on {stub.url}")
+        stub.thread.join()
@@ -0,0 +1,186 @@
+"""Local stand-in for the IAM token endpoint and the IBM Quantum Platform REST API"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.fake_runtime import FakeBackend, FakeRuntimeService
+
+
+class StubState:
+    def __init__(
+        self,
+        num_jobs: int = 200,
+        token_ttl: int = 3600,
+        token_delay: float = 0.05,
+        fixture: Optional[List[dict]] = None,
+    ):
+        self.service = FakeRuntimeService(num_jobs=num_jobs)
+        # Recorded REST job rows, newest first; served instead of the fake service's jobs
+        self.fixture = fixture
+        self.token_ttl = token_ttl
+        self.token_delay = token_delay
+        self.token_requests = 0
+        self.requests = 0
+        self.connections = set()
+        # Status codes returned, in order, before requests are served normally again
+        self.failures: List[int] = []
+        self.delay = 0.0
+        self.lock = threading.Lock()
+
+
+def backend_properties(backend: FakeBackend) -> dict:
+    props = backend.properties()
+    return {
+        "backend_name": backend.name,
+        "last_update_date": props.last_update_date.isoformat(),
+        "qubits": [
+            [{"name": p.name, "value": p.value, "unit": p.unit} for p in qubit] for qubit in props.qubits
+        ],
+        "gates": [
+            {
+                "gate": g.gate,
+                "qubits": g.qubits,
+                "name": g.name,
+                "parameters": [{"name": p.name, "value": p.value, "unit": p.unit} for p in g.parameters],
+            }
+            for g in props.gates
+        ],
+    }
+
+
+# FakeJob statuses as the REST API spells them
+REST_STATUSES = {"DONE": "Completed", "ERROR": "Failed", "CANCELLED": "Cancelled", "QUEUED": "Queued", "RUNNING": "Running"}
+
+
+def job_payload(job) -> dict:
+    status = REST_STATUSES[job._status]
+    return {
+        "id": job.job_id(),
+        "backend": job._backend_id,
+        "program": {"id": job.program_id},
+        "status": status,
+        "state": {"status": status},
+        "created": job.creation_date.isoformat(),
+        "running": job._running_date.isoformat() if job._status != "QUEUED" else None,
+        "ended": job.end_date.isoformat() if job.end_date else None,
+        "usage": {"seconds": job._qpu_seconds},
+    }
+
+
+def make_handler(state: StubState):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body are written separately; without this keep-alive clients hit delayed ACKs
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):
+            pass
+
+        def _reply(self, status: int, body: Optional[dict] = None, headers: Optional[dict] = None):
+            data = json.dumps(body or {}).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            try:
+                self.wfile.write(data)
+            except BrokenPipeError:
+                # Client gave up (timeout checks)
+                pass
+
+        def _fault(self) -> bool:
+            with state.lock:
+                state.requests += 1
+                state.connections.add(self.client_address)
+                status = state.failures.pop(0) if state.failures else None
+            if status:
+                self._reply(status, {"errors": [{"message": "injected"}]}, {"Retry-After": "0"} if status == 429 else None)
+                return True
+            if state.delay:
+                time.sleep(state.delay)
+            return False
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            self.rfile.read(length)
+            if self._fault():
+                return
+            if self.path != "/identity/token":
+                return self._reply(404)
+            with state.lock:
+                state.token_requests += 1
+            time.sleep(state.token_delay)
+            self._reply(200, {"access_token": f"token-{state.token_requests}", "expires_in": state.token_ttl})
+
+        def do_GET(self):
+            if self._fault():
+                return
+            if not self.headers.get("Authorization", "").startswith("Bearer token-"):
+                return self._reply(401)
+            url = urlparse(self.path)
+            query = {k: v[0] for k, v in parse_qs(url.query).items()}
+            parts = url.path.split("/")[3:]  # strip /api/v1
+            service = state.service
+            if parts == ["backends"]:
+                return self._reply(200, {"devices": [b.name for b in service.backends()]})
+            if len(parts) == 3 and parts[0] == "backends":
+                backend = next((b for b in service.backends() if b.name == parts[1]), None)
+                if backend is None:
+                    return self._reply(404)
+                if parts[2] == "properties":
+                    return self._reply(200, backend_properties(backend))
+                if parts[2] == "status":
+                    status = backend.status()
+                    return self._reply(200, {
+                        "name": backend.name,
+                        "state": status.operational,
+                        "status": status.status_msg,
+                        "length_queue": status.pending_jobs,
+                    })
+                if parts[2] == "configuration":
+                    return self._reply(200, {"backend_name": backend.name, "n_qubits": backend.num_qubits})
+            if parts == ["jobs"]:
+                limit, offset = int(query.get("limit", 20)), int(query.get("offset", 0))
+                pending = {"true": True, "false": False}.get(query.get("pending"))
+                if state.fixture is not None:
+                    rows = [r for r in state.fixture if pending is None or (r["status"] in ("Queued", "Running")) == pending]
+                    return self._reply(200, {"jobs": rows[offset:offset + limit], "count": len(rows)})
+                jobs = service.jobs(limit=limit, skip=offset, pending=pending)
+                return self._reply(200, {"jobs": [job_payload(j) for j in jobs], "count": len(service._jobs)})
+            if len(parts) == 2 and parts[0] == "jobs":
+                if state.fixture is not None:
+                    row = next((r for r in state.fixture if r["id"] == parts[1]), None)
+                    return self._reply(200, row) if row else self._reply(404)
+                try:
+                    return self._reply(200, job_payload(service.job(parts[1])))
+                except Exception:
+                    return self._reply(404)
+            self._reply(404)
+
+    return Handler
+
+
+class StubServer:
+    """Runs the stub on a free local port in a background thread"""
+
+    def __init__(self, state: Optional[StubState] = None):
+        self.state = state or StubState()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(self.state))
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,38 @@
+"""backend.app on a FakeRuntimeService whose upstream calls are counted in the shared store.
+
+Every worker process imports this module, so the counter (shared key UPSTREAM_COUNTER)
+totals the upstream traffic of the whole deployment. Used by bench_workers:
+
+    uvicorn benchmarks.worker_app:app --workers 4
+"""
+import functools
+import os
+
+import backend
+from benchmarks.bench_workers import UPSTREAM_COUNTER
+from benchmarks.fake_runtime import FakeBackend, FakeJob, FakeRuntimeService
+
+
+def counted(method):
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        backend.shared_cache.incr(UPSTREAM_COUNTER)
+        return method(*args, **kwargs)
+    return wrapper
+
+
+class CountingFakeRuntimeService(FakeRuntimeService):
+    backends = counted(FakeRuntimeService.backends)
+    backend = counted(FakeRuntimeService.backend)
+    jobs = counted(FakeRuntimeService.jobs)
+    job = counted(FakeRuntimeService.job)
+
+
+for cls, names in ((FakeBackend, ("status", "configuration", "properties")), (FakeJob, ("status", "status_history", "metrics"))):
+    for name in names:
+        setattr(cls, name, counted(getattr(cls, name)))
+
+backend.service = CountingFakeRuntimeService(
+    num_jobs=int(os.getenv("BENCH_NUM_JOBS", "200")), latency=float(os.getenv("BENCH_LATENCY", "0.005"))
+)
+app = backend.app
@@ -0,0 +1,227 @@
+import hashlib
+from itertools import chain, repeat
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+# Qubit metrics kept per qubit, in column order
+QUBIT_FIELDS = ("T1", "T2", "readout_error")
+_QUBIT_COLUMN = {name: i for i, name in enumerate(QUBIT_FIELDS)}
+
+# T1/T2 are reported in various time units; everything is normalized to microseconds
+UNIT_SCALE_TO_US = {"s": 1e6, "ms": 1e3, "us": 1.0, "µs": 1.0, "ns": 1e-3}
+
+DISTRIBUTION_POINTS = (0, 10, 25, 50, 75, 90, 100)
+
+
+def _fmt(value: Optional[float], spec: str, suffix: str = "") -> str:
+    if value is None or not np.isfinite(value):
+        return "N/A"
+    return f"{value:{spec}}{suffix}"
+
+
+def _lookup(labels: Iterable[Any], table: Dict[Any, float], default: float, count: int) -> np.ndarray:
+    """table[label] per label, as one C-level map rather than a Python loop"""
+    return np.fromiter(map(table.get, labels, repeat(default)), dtype=float, count=count)
+
+
+def _gate_errors(parameters: List[list]) -> np.ndarray:
+    """The first gate_error parameter of each gate, 0 when it has none.
+
+    The SDK lists gate_error first, so the first parameter of every gate is checked in one
+    pass; only gates where it is something else get their parameters flattened and searched.
+    """
+    leading = [
+        params[0].value if params and params[0].name == "gate_error" else None for params in parameters
+    ]
+    errors = np.array(leading, dtype=float)
+    others = np.flatnonzero(np.isnan(errors))
+    errors[others] = 0.0
+    rest = [parameters[i] for i in others.tolist()]
+    flat = list(chain.from_iterable(rest))
+    if flat:
+        names = np.array([param.name for param in flat], dtype=object)
+        values = np.array([param.value for param in flat], dtype=float)
+        owner = np.repeat(np.arange(len(rest)), list(map(len, rest)))
+        matches = np.flatnonzero(names == "gate_error")[::-1]
+        # Fancy assignment keeps the last write, so writing in reverse keeps the first match
+        errors[others[owner[matches]]] = values[matches]
+    return errors
+
+
+_QUANTILES = np.array(DISTRIBUTION_POINTS) / 100.0
+
+
+def _quantiles(values: np.ndarray) -> np.ndarray:
+    """Linear-interpolated percentiles (same as np.percentile) from a single sort"""
+    ordered = np.sort(values)
+    position = _QUANTILES * (ordered.size - 1)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, ordered.size - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class CalibrationArrays:
+    """Columnar view of a BackendProperties snapshot, extracted once and reused"""
+
+    def __init__(self, props: Any):
+        self.last_update_date = getattr(props, "last_update_date", None)
+
+        # Qubits: every item flattened into parallel name/value/unit columns, names and units
+        # mapped through the column and unit tables, then scattered into the qubit x metric matrix
+        qubit_props = props.qubits or []
+        self.num_qubits = len(qubit_props)
+        width = len(QUBIT_FIELDS)
+        flat = np.full(self.num_qubits * width, np.nan)
+        items = list(chain.from_iterable(qubit_props))
+        if items:
+            owner = np.repeat(np.arange(self.num_qubits), list(map(len, qubit_props)))
+            column = _lookup([item.name for item in items], _QUBIT_COLUMN, -1, len(items)).astype(np.int64)
+            values = np.array([item.value for item in items], dtype=float)
+            units = _lookup([item.unit for item in items], UNIT_SCALE_TO_US, 1.0, len(items))
+            scales = np.where(column < 2, units, 1.0)
+            wanted = (column >= 0) & ~np.isnan(values)
+            flat[owner[wanted] * width + column[wanted]] = values[wanted] * scales[wanted]
+        self.qubit_values = flat.reshape(self.num_qubits, width)
+        # readout_error defaults to 0 when a qubit does not report it
+        readout = self.qubit_values[:, _QUBIT_COLUMN["readout_error"]]
+        readout[np.isnan(readout)] = 0.0
+
+        # Gates: type code, arity, first two qubits (-1 when absent) and error per gate
+        gates = props.gates or []
+        types = [gate.gate for gate in gates]
+        self.gate_names: List[str] = [gate.name for gate in gates]
+        self.gate_qubits: List[List[int]] = [list(gate.qubits or []) for gate in gates]
+        # Codes in order of first appearance
+        self.gate_type_codes: Dict[str, int] = {gate: code for code, gate in enumerate(dict.fromkeys(types))}
+        self.gate_type = np.fromiter(map(self.gate_type_codes.__getitem__, types), dtype=np.int64, count=len(types))
+        self.gate_arity = np.fromiter(map(len, self.gate_qubits), dtype=np.int64, count=len(gates))
+        flat_qubits = np.fromiter(chain.from_iterable(self.gate_qubits), dtype=np.int64, count=int(self.gate_arity.sum()))
+        starts = np.cumsum(self.gate_arity) - self.gate_arity
+        self.gate_pairs = np.full((len(gates), 2), -1, dtype=np.int64)
+        for slot in range(2):
+            has = self.gate_arity > slot
+            self.gate_pairs[has, slot] = flat_qubits[starts[has] + slot]
+        self.gate_errors = _gate_errors([gate.parameters for gate in gates])
+        missing = np.isnan(self.gate_errors)
+        # A reported gate_error of None stays None in the JSON view
+        self._gate_error_list = (
+            np.where(missing, None, self.gate_errors) if missing.any() else self.gate_errors
+        ).tolist()
+
+        self._metrics: Optional[Dict[str, str]] = None
+        self._dict: Optional[dict] = None
+        self._distributions: Dict[str, Optional[np.ndarray]] = {}
+
+    # -------------------------
+    # Column accessors
+    # -------------------------
+    @property
+    def t1(self) -> np.ndarray:
+        return self.qubit_values[:, _QUBIT_COLUMN["T1"]]
+
+    @property
+    def t2(self) -> np.ndarray:
+        return self.qubit_values[:, _QUBIT_COLUMN["T2"]]
+
+    @property
+    def readout_error(self) -> np.ndarray:
+        return self.qubit_values[:, _QUBIT_COLUMN["readout_error"]]
+
+    def gate_error_mask(self, gate: Optional[str] = None, arity: Optional[int] = None) -> np.ndarray:
+        mask = np.ones(len(self.gate_errors), dtype=bool)
+        if arity is not None:
+            mask &= self.gate_arity == arity
+        if gate is not None:
+            mask &= self.gate_type == self.gate_type_codes.get(gate, -1)
+        return mask
+
+    def gate_type_names(self) -> List[str]:
+        names = {code: name for name, code in self.gate_type_codes.items()}
+        return [names[code] for code in self.gate_type.tolist()]
+
+    @property
+    def two_qubit_errors(self) -> np.ndarray:
+        return self.gate_errors[self.gate_error_mask(arity=2)]
+
+    def fingerprint(self) -> str:
+        """Digest of every reported value, identifying a snapshot that has no last_update_date"""
+        digest = hashlib.blake2s(digest_size=10)
+        for array in (self.qubit_values, self.gate_pairs, self.gate_errors):
+            digest.update(np.ascontiguousarray(array).tobytes())
+        digest.update(",".join(self.gate_type_names()).encode())
+        return digest.hexdigest()
+
+    # -------------------------
+    # Summaries
+    # -------------------------
+    @staticmethod
+    def _reported(values: np.ndarray) -> np.ndarray:
+        """Drops missing and zero entries, which the SDK uses for unreported values"""
+        return values[np.isfinite(values) & (values != 0)]
+
+    def distribution(self, column: str) -> Optional[np.ndarray]:
+        """Percentiles 0/10/25/50/75/90/100 of a metric column, computed once"""
+        if column not in self._distributions:
+            values = self.column(column)
+            self._distributions[column] = _quantiles(values) if values.size else None
+        return self._distributions[column]
+
+    def column(self, name: str) -> np.ndarray:
+        """Reported values of a summary metric: T1, T2, readout_error, 2q_error, sx_error, cz_error"""
+        if name in _QUBIT_COLUMN:
+            return self._reported(self.qubit_values[:, _QUBIT_COLUMN[name]])
+        if name == "2q_error":
+            return self.two_qubit_errors
+        gate = name[: -len("_error")]
+        return self.gate_errors[self.gate_error_mask(gate=gate, arity=2 if gate == "cz" else 1)]
+
+    def _point(self, column: str, percentile: int) -> Optional[float]:
+        dist = self.distribution(column)
+        return float(dist[DISTRIBUTION_POINTS.index(percentile)]) if dist is not None else None
+
+    def metrics(self) -> Dict[str, str]:
+        if self._metrics is None:
+            self._metrics = {
+                "T1 (median)": _fmt(self._point("T1", 50), ".2f", " us"),
+                "T2 (median)": _fmt(self._point("T2", 50), ".2f", " us"),
+                "Readout error (median)": _fmt(self._point("readout_error", 50), ".4e"),
+                "2Q error (median)": _fmt(self._point("2q_error", 50), ".4e"),
+                "2Q error (best)": _fmt(self._point("2q_error", 0), ".4e"),
+                "SX error (median)": _fmt(self._point("sx_error", 50), ".4e"),
+                "CZ error (median)": _fmt(self._point("cz_error", 50), ".4e"),
+            }
+        return self._metrics
+
+    def percentiles(self) -> Dict[str, Dict[str, float]]:
+        result = {}
+        for column in ("T1", "T2", "readout_error", "2q_error"):
+            dist = self.distribution(column)
+            if dist is not None:
+                result[column] = {f"p{p}": float(v) for p, v in zip(DISTRIBUTION_POINTS, dist)}
+        return result
+
+    def qubit_table(self) -> List[dict]:
+        table = np.where(np.isnan(self.qubit_values), None, self.qubit_values).tolist()
+        return [
+            {"qubit": i, "T1": row[0], "T2": row[1], "readout_error": row[2]}
+            for i, row in enumerate(table)
+        ]
+
+    def gate_table(self) -> List[dict]:
+        return [
+            {"name": name, "qubits": qubits, "error": error, "gate": gate}
+            for name, qubits, error, gate in zip(
+                self.gate_names, self.gate_qubits, self._gate_error_list, self.gate_type_names()
+            )
+        ]
+
+    def to_dict(self) -> dict:
+        if self._dict is None:
+            self._dict = {
+                "qubits": self.qubit_table(),
+                "gates": self.gate_table(),
+                "metrics": self.metrics(),
+                "percentiles": self.percentiles(),
+            }
+        return self._dict
@@ -0,0 +1,322 @@
+import json
+import os
+import threading
+import warnings
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from calibration import QUBIT_FIELDS, CalibrationArrays
+
+# -------------------------
+# Configuration
+# -------------------------
+CALIBRATION_HISTORY_DIR = os.getenv(
+    "CALIBRATION_HISTORY_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "calibration")
+)
+CALIBRATION_HISTORY_MAX_BUCKETS = int(os.getenv("CALIBRATION_HISTORY_MAX_BUCKETS", "1000"))
+
+# Column names are "<metric>/<qubit>" for qubit metrics and "<gate>/<q0>_<q1>" for gate errors,
+# plus "<metric>/median" per snapshot so backend-wide trends read a single column
+GATE_METRIC_SUFFIX = "_error"
+AGGREGATE = "median"
+ISO_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+def snapshot_columns(calibration: CalibrationArrays) -> Tuple[List[str], np.ndarray]:
+    """Column names and float32 values of one snapshot: qubit metrics, gate errors, medians"""
+    names = [f"{field}/{q}" for q in range(calibration.num_qubits) for field in QUBIT_FIELDS]
+    names += [
+        f"{gate}/{'_'.join(str(q) for q in qubits)}"
+        for gate, qubits in zip(calibration.gate_type_names(), calibration.gate_qubits)
+    ]
+    medians = calibration_medians(calibration)
+    names += [f"{metric}/{AGGREGATE}" for metric in medians]
+    values = np.concatenate(
+        (calibration.qubit_values.ravel(), calibration.gate_errors, list(medians.values()))
+    ).astype(np.float32)
+    return names, values
+
+
+def calibration_medians(calibration: CalibrationArrays) -> Dict[str, float]:
+    """Median of each qubit metric, of all 2Q gate errors and of each gate type's errors"""
+    groups = {field: calibration.qubit_values[:, i] for i, field in enumerate(QUBIT_FIELDS)}
+    groups["2q_error"] = calibration.two_qubit_errors
+    for gate, code in calibration.gate_type_codes.items():
+        groups[f"{gate}{GATE_METRIC_SUFFIX}"] = calibration.gate_errors[calibration.gate_type == code]
+    medians = {}
+    for metric, column in groups.items():
+        reported = column[np.isfinite(column) & (column != 0)]
+        medians[metric] = float(np.median(reported)) if reported.size else float("nan")
+    return medians
+
+
+def downsample(times: np.ndarray, values: np.ndarray, start: float, end: float, buckets: int) -> Dict[str, np.ndarray]:
+    """min/median/max/count of values per equal-width time bucket; empty buckets are omitted"""
+    keep = np.isfinite(values)
+    times, values = times[keep], values[keep]
+    if not values.size:
+        return {"time": times, "count": np.zeros(0, dtype=np.int64), "min": values, "median": values, "max": values}
+
+    width = max(end - start, 1e-9) / buckets
+    index = np.clip(((times - start) / width).astype(np.int64), 0, buckets - 1)
+    # Sorting by (bucket, value) lets min, max and median be read off group boundaries
+    order = np.lexsort((values, index))
+    index, ordered = index[order], values[order]
+    starts = np.flatnonzero(np.r_[True, index[1:] != index[:-1]])
+    counts = np.diff(np.r_[starts, ordered.size])
+    lower = starts + (counts - 1) // 2
+    upper = starts + counts // 2
+    return {
+        "time": start + index[starts] * width,
+        "count": counts,
+        "min": ordered[starts],
+        "median": (ordered[lower] + ordered[upper]) / 2,
+        "max": ordered[starts + counts - 1],
+    }
+
+
+def write_at(path: str, offset: int, data: bytes):
+    """Writes data at offset, growing the file but never truncating it"""
+    with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+        f.seek(offset)
+        f.write(data)
+
+
+class CalibrationHistory:
+    """Append-only per-backend archive of calibration snapshots in memory-mapped NumPy files.
+
+    Each backend directory holds times.f8 (snapshot last_update_date, ascending), a
+    float32 values file with one row per snapshot and meta.json naming its columns and
+    counting the committed rows. Files are only ever written past the committed rows, never
+    truncated or removed while readers may map them (which Windows refuses); a gate or qubit
+    not seen before copies every row into a new values file, and the superseded one is
+    deleted on a later widening once it is no longer mapped.
+    """
+
+    def __init__(self, root: str = CALIBRATION_HISTORY_DIR):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._lock = threading.Lock()
+        self._meta: Dict[str, Tuple[Tuple[int, int], dict]] = {}
+
+    def _dir(self, backend: str) -> str:
+        return os.path.join(self.root, os.path.basename(backend))
+
+    def _load_meta(self, backend: str) -> Optional[dict]:
+        path = os.path.join(self._dir(backend), "meta.json")
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        # meta.json is replaced, not rewritten, so its inode changes on every commit
+        version = (stat.st_ino, stat.st_mtime_ns)
+        cached = self._meta.get(backend)
+        if cached and cached[0] == version:
+            return cached[1]
+        with open(path) as f:
+            meta = json.load(f)
+        if "rows" not in meta:
+            meta["rows"] = self._complete_rows(backend, meta)
+        meta["index"] = {name: i for i, name in enumerate(meta["columns"])}
+        meta["selections"] = {}
+        self._meta[backend] = (version, meta)
+        return meta
+
+    def _complete_rows(self, backend: str, meta: dict) -> int:
+        """Rows of an archive written before meta.json counted them: those complete in both files"""
+        directory, width = self._dir(backend), len(meta["columns"])
+        try:
+            times = os.path.getsize(os.path.join(directory, "times.f8")) // 8
+            values = os.path.getsize(os.path.join(directory, meta["values"])) // (4 * width) if width else 0
+        except FileNotFoundError:
+            return 0
+        return min(times, values)
+
+    def _write_meta(self, backend: str, columns: List[str], values_file: str, rows: int):
+        path = os.path.join(self._dir(backend), "meta.json")
+        with open(f"{path}.tmp", "w") as f:
+            json.dump({"columns": columns, "values": values_file, "rows": rows}, f)
+        os.replace(f"{path}.tmp", path)
+
+    def _open(self, backend: str) -> Optional[Tuple[dict, np.ndarray, np.ndarray]]:
+        """meta, times and the values matrix (memory-mapped) of the committed rows"""
+        directory = self._dir(backend)
+        for attempt in range(2):
+            meta = self._load_meta(backend)
+            if meta is None:
+                return None
+            rows, width = meta["rows"], len(meta["columns"])
+            if not rows or not width:
+                return meta, np.zeros(0), np.zeros((0, width), dtype=np.float32)
+            try:
+                times = np.fromfile(os.path.join(directory, "times.f8"), dtype=np.float64, count=rows)
+                values = np.memmap(
+                    os.path.join(directory, meta["values"]), dtype=np.float32, mode="r", shape=(rows, width)
+                )
+                return meta, times, values
+            except FileNotFoundError:
+                # The writer widened the layout and dropped the old file after meta.json was read
+                self._meta.pop(backend, None)
+        return None
+
+    # -------------------------
+    # Writes (one writer: the sync leader)
+    # -------------------------
+    def append(self, backend: str, calibration: CalibrationArrays) -> bool:
+        """Archives a snapshot unless one with the same or a later last_update_date is stored"""
+        updated = calibration.last_update_date
+        if updated is None:
+            return False
+        timestamp = updated.timestamp()
+        names, values = snapshot_columns(calibration)
+
+        with self._lock:
+            directory = self._dir(backend)
+            os.makedirs(directory, exist_ok=True)
+            # Only meta.json and the last stored time are read: the writer never maps the files it writes
+            meta = self._load_meta(backend) or {"columns": [], "index": {}, "values": "values.0.f4", "rows": 0}
+            rows = meta["rows"]
+            times_path = os.path.join(directory, "times.f8")
+            if rows:
+                last = np.fromfile(times_path, dtype=np.float64, count=1, offset=(rows - 1) * 8)
+                if last[0] >= timestamp:
+                    return False
+
+            missing = [name for name in names if name not in meta["index"]]
+            if missing:
+                meta = self._widen(backend, meta, missing)
+            row = np.full(len(meta["columns"]), np.nan, dtype=np.float32)
+            row[[meta["index"][name] for name in names]] = values
+
+            # Written over any partial row left by an interrupted append; meta.json commits the row
+            write_at(os.path.join(directory, meta["values"]), rows * row.nbytes, row.tobytes())
+            write_at(times_path, rows * 8, np.float64(timestamp).tobytes())
+            self._write_meta(backend, meta["columns"], meta["values"], rows + 1)
+        return True
+
+    def _widen(self, backend: str, meta: dict, missing: List[str]) -> dict:
+        directory, rows = self._dir(backend), meta["rows"]
+        columns = meta["columns"] + missing
+        generation = int(meta["values"].split(".")[1]) + 1 if meta["columns"] else 0
+        values_file = f"values.{generation}.f4"
+        widened = np.full((rows, len(columns)), np.nan, dtype=np.float32)
+        if rows and meta["columns"]:
+            old = np.fromfile(
+                os.path.join(directory, meta["values"]), dtype=np.float32, count=rows * len(meta["columns"])
+            )
+            widened[:, : len(meta["columns"])] = old.reshape(rows, len(meta["columns"]))
+        widened.tofile(os.path.join(directory, values_file))
+        self._write_meta(backend, columns, values_file, rows)
+        # Readers may still map the file just superseded, so only older generations are dropped
+        for name in os.listdir(directory):
+            if name.startswith("values.") and name not in (values_file, meta["values"]):
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    # Still mapped somewhere (Windows); retried on the next widening
+                    pass
+        return self._load_meta(backend)
+
+    # -------------------------
+    # Queries
+    # -------------------------
+    @staticmethod
+    def _matches(column: str, metric: str, target: Optional[str]) -> bool:
+        kind, _, qubits = column.partition("/")
+        if qubits == AGGREGATE or (target is not None and qubits != target):
+            return False
+        if metric in QUBIT_FIELDS:
+            return kind == metric
+        if metric == "2q_error":
+            return kind not in QUBIT_FIELDS and "_" in qubits
+        return kind == metric[: -len(GATE_METRIC_SUFFIX)]
+
+    def _select(self, meta: dict, metric: str, target: Optional[str]) -> np.ndarray:
+        key = (metric, target)
+        if key not in meta["selections"]:
+            aggregate = meta["index"].get(f"{metric}/{AGGREGATE}")
+            if target is None and aggregate is not None:
+                selected = [aggregate]
+            else:
+                selected = [i for i, column in enumerate(meta["columns"]) if self._matches(column, metric, target)]
+            meta["selections"][key] = np.array(selected, dtype=np.int64)
+        return meta["selections"][key]
+
+    def latest_medians(self, backend: str) -> Optional[Tuple[float, Dict[str, float]]]:
+        """last_update_date and per-metric medians of the newest archived snapshot"""
+        opened = self._open(backend)
+        if opened is None or not opened[1].size:
+            return None
+        meta, times, values = opened
+        suffix = f"/{AGGREGATE}"
+        row = values[-1]
+        medians = {
+            column[: -len(suffix)]: float(row[i])
+            for column, i in meta["index"].items()
+            if column.endswith(suffix)
+        }
+        return float(times[-1]), medians
+
+    def backends(self) -> List[str]:
+        return sorted(name for name in os.listdir(self.root) if self._load_meta(name))
+
+    def series(
+        self, backend: str, metric: str, start: float, end: float, target: Optional[str] = None
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Snapshot times in [start, end] and the metric per snapshot: the target
+        qubit's (or gate's) value, or the median across all qubits/gates otherwise"""
+        if metric not in QUBIT_FIELDS and not metric.endswith(GATE_METRIC_SUFFIX):
+            raise ValueError(f"metric must be one of {list(QUBIT_FIELDS)} or a gate error such as 2q_error, sx_error")
+        opened = self._open(backend)
+        if opened is None:
+            return None
+        meta, times, values = opened
+        columns = self._select(meta, metric, target)
+        if not columns.size:
+            raise ValueError(f"No {metric} history for {target or 'any qubit'} on {backend}")
+        lo = np.searchsorted(times, start, side="left")
+        hi = np.searchsorted(times, end, side="right")
+        block = np.asarray(values[lo:hi][:, columns], dtype=np.float64)
+        # Zero is how the SDK reports an unmeasured value
+        block[block == 0] = np.nan
+        if columns.size == 1:
+            return times[lo:hi], block[:, 0]
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            return times[lo:hi], np.nanmedian(block, axis=1)
+
+    def query(
+        self, backend: str, metric: str, start: float, end: float, buckets: int, target: Optional[str] = None
+    ) -> Optional[dict]:
+        """Downsampled series as parallel columns, ready to chart"""
+        found = self.series(backend, metric, start, end, target)
+        if found is None:
+            return None
+        times, values = found
+        sampled = downsample(times, values, start, end, buckets)
+        return {
+            "backend": backend,
+            "metric": metric,
+            "qubit": target,
+            "start": datetime.fromtimestamp(start, timezone.utc).strftime(ISO_FORMAT),
+            "end": datetime.fromtimestamp(end, timezone.utc).strftime(ISO_FORMAT),
+            "snapshots": int(times.size),
+            "bucket_seconds": (end - start) / buckets,
+            "columns": {
+                "time": np.datetime_as_string(sampled["time"].astype("datetime64[s]"), unit="s", timezone="UTC").tolist(),
+                "count": sampled["count"].tolist(),
+                "min": sampled["min"].tolist(),
+                "median": sampled["median"].tolist(),
+                "max": sampled["max"].tolist(),
+            },
+        }
+
+    def stats(self) -> dict:
+        backends = self.backends()
+        snapshots = 0
+        for backend in backends:
+            opened = self._open(backend)
+            snapshots += opened[1].size if opened else 0
+        return {"backends": len(backends), "snapshots": snapshots}
@@ -0,0 +1,45 @@
+import hashlib
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+
+# Clients may keep a response but must revalidate it (If-None-Match) before reuse
+CACHE_CONTROL = "no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag over whatever identifies a representation: store version or encoded
+    content, the query, media type and content coding"""
+    digest = hashlib.blake2s(digest_size=10)
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode())
+        digest.update(b"\x1f")
+    return f'"{digest.hexdigest()}"'
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """A 304 response when If-None-Match lists etag (or *), else None"""
+    header = request.headers.get("if-none-match")
+    if header:
+        tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+        if etag in tags or "*" in tags:
+            return Response(status_code=304, headers=etag_headers(etag))
+    return None
+
+
+def etag_headers(etag: str) -> Dict[str, str]:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def encode_since(store_id: str, version: int) -> str:
+    return f"{store_id}.{version}"
+
+
+def decode_since(cursor: str) -> Optional[Tuple[str, int]]:
+    """(store id, version) of a ?since= cursor; None for an empty one (first poll)"""
+    if not cursor:
+        return None
+    store_id, _, version = cursor.partition(".")
+    if not store_id or not version.isdigit():
+        raise ValueError("Invalid since cursor")
+    return store_id, int(version)
@@ -0,0 +1,191 @@
+import heapq
+import math
+import os
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from calibration import CalibrationArrays
+
+# -------------------------
+# Configuration
+# -------------------------
+# Qubit counts of the linear chains and connected subgraphs precomputed per calibration
+CONNECTIVITY_CHAIN_LENGTHS = tuple(
+    int(k) for k in os.getenv("CONNECTIVITY_CHAIN_LENGTHS", "3,5,10,20").split(",") if k.strip()
+)
+CONNECTIVITY_SUBGRAPH_SIZES = tuple(
+    int(k) for k in os.getenv("CONNECTIVITY_SUBGRAPH_SIZES", "4,8,16").split(",") if k.strip()
+)
+# Chains/subgraphs returned per size, best first
+CONNECTIVITY_TOP = int(os.getenv("CONNECTIVITY_TOP", "5"))
+# Partial chains kept per step of the chain search; wider finds better chains on larger devices
+CONNECTIVITY_BEAM_WIDTH = int(os.getenv("CONNECTIVITY_BEAM_WIDTH", "512"))
+# A graph is keyed by its calibration timestamp, so this only bounds how long it is stored
+CONNECTIVITY_CACHE_TTL = float(os.getenv("CONNECTIVITY_CACHE_TTL", "86400"))
+
+
+def _nullable(values: np.ndarray) -> list:
+    return np.where(np.isnan(values), None, values).tolist()
+
+
+class ConnectivityGraph:
+    """Coupling graph of a backend in CSR form, annotated with one calibration snapshot.
+
+    Edges are undirected qubit pairs from the configuration's coupling map and the
+    two-qubit gates of the calibration; an edge's error is the lowest reported by any
+    two-qubit gate on the pair (NaN when none is). The neighbours of qubit q are
+    indices[indptr[q]:indptr[q + 1]], reached through edges edge[indptr[q]:indptr[q + 1]].
+
+    Chains and subgraphs are ranked by estimated fidelity: readout of every qubit times
+    one two-qubit gate per edge used, with unreported edge errors taken as the worst
+    reported one. Couplers reported with error >= 1 (out of service) are never used.
+    """
+
+    def __init__(self, calibration: CalibrationArrays, coupling_map: Optional[Iterable] = None):
+        self.calibration = calibration
+        pairs = calibration.gate_pairs[calibration.gate_error_mask(arity=2)]
+        errors = calibration.two_qubit_errors
+        if coupling_map:
+            extra = np.array([list(pair)[:2] for pair in coupling_map], dtype=np.int64).reshape(-1, 2)
+            pairs = np.concatenate([pairs, extra])
+            errors = np.concatenate([errors, np.full(len(extra), np.nan)])
+        pairs = np.sort(pairs, axis=1)
+        self.num_qubits = int(max(calibration.num_qubits, pairs.max() + 1 if pairs.size else 0))
+
+        # One edge per pair; the lowest reported error across directions and gate types wins
+        keys = pairs[:, 0] * self.num_qubits + pairs[:, 1]
+        unique, inverse = np.unique(keys, return_inverse=True)
+        lowest = np.full(len(unique), np.inf)
+        np.fmin.at(lowest, inverse, np.nan_to_num(errors, nan=np.inf))
+        self.edge_pairs = np.column_stack(np.divmod(unique, self.num_qubits))
+        self.edge_errors = np.where(np.isinf(lowest), np.nan, lowest)
+
+        # CSR over both directions of every edge, neighbours in ascending order
+        source = np.concatenate([self.edge_pairs[:, 0], self.edge_pairs[:, 1]])
+        target = np.concatenate([self.edge_pairs[:, 1], self.edge_pairs[:, 0]])
+        edge = np.concatenate([np.arange(len(unique))] * 2)
+        order = np.lexsort((target, source))
+        self.indices, self.edge = target[order], edge[order]
+        self.indptr = np.concatenate([[0], np.cumsum(np.bincount(source, minlength=self.num_qubits))])
+        # The searches below walk the graph one qubit at a time, so also as (neighbour, edge) lists
+        pointers, indices, edges = self.indptr.tolist(), self.indices.tolist(), self.edge.tolist()
+        self._adjacency = [
+            list(zip(indices[start:end], edges[start:end])) for start, end in zip(pointers[:-1], pointers[1:])
+        ]
+
+        # Costs are -log(success probability), so fidelities multiply as costs add
+        reported = self.edge_errors[np.isfinite(self.edge_errors)]
+        worst = float(reported.max()) if reported.size else 0.0
+        with np.errstate(divide="ignore"):
+            self.edge_cost = -np.log1p(-np.minimum(np.nan_to_num(self.edge_errors, nan=worst), 1.0))
+        readout = np.zeros(self.num_qubits)
+        readout[: calibration.num_qubits] = calibration.readout_error
+        self.node_cost = -np.log1p(-np.minimum(readout, 1 - 1e-12))
+
+    # -------------------------
+    # Derived layouts
+    # -------------------------
+    def _layout(self, qubits: List[int], cost: float, edges: List[int]) -> dict:
+        errors = self.edge_errors[edges]
+        reported = errors[np.isfinite(errors)]
+        return {
+            "qubits": qubits,
+            "fidelity": math.exp(-cost),
+            "mean_2q_error": float(reported.mean()) if reported.size else None,
+        }
+
+    def best_chains(self, length: int, top: int = CONNECTIVITY_TOP, beam: int = CONNECTIVITY_BEAM_WIDTH) -> List[dict]:
+        """Lowest-cost simple paths of `length` qubits, by beam search over partial paths"""
+        if length < 1 or length > self.num_qubits:
+            return []
+        edge_cost, node_cost = self.edge_cost.tolist(), self.node_cost.tolist()
+        # (cost, path, edges); a partial path is only worth extending if it is the cheapest
+        # one over its qubits that ends where it does
+        paths = [(node_cost[q], (q,), ()) for q in range(self.num_qubits)]
+        for _ in range(length - 1):
+            best: Dict[tuple, tuple] = {}
+            for cost, path, edges in paths:
+                for neighbour, e in self._adjacency[path[-1]]:
+                    step = edge_cost[e]
+                    if neighbour in path or step == math.inf:
+                        continue
+                    extended = (cost + step + node_cost[neighbour], path + (neighbour,), edges + (e,))
+                    key = (neighbour, frozenset(extended[1]))
+                    if key not in best or extended[0] < best[key][0]:
+                        best[key] = extended
+            paths = heapq.nsmallest(beam, best.values(), key=lambda p: p[0])
+        chains, seen = [], set()
+        for cost, path, edges in sorted(paths, key=lambda p: p[0]):
+            # A path and its reverse are the same chain
+            if frozenset(path) in seen:
+                continue
+            seen.add(frozenset(path))
+            chains.append(self._layout(list(path), cost, list(edges)))
+            if len(chains) == top:
+                break
+        return chains
+
+    def best_subgraphs(self, sizes: Iterable[int], top: int = CONNECTIVITY_TOP) -> Dict[int, List[dict]]:
+        """Lowest-cost connected qubit sets per size, grown greedily (Prim) from every qubit.
+
+        Each qubit added is attached by its cheapest edge into the set; the cost counts the
+        readout of every qubit and those attaching edges.
+        """
+        sizes = sorted({size for size in sizes if 1 <= size <= self.num_qubits})
+        found: Dict[int, Dict[frozenset, tuple]] = {size: {} for size in sizes}
+        if not sizes:
+            return {}
+        edge_cost, node_cost = self.edge_cost.tolist(), self.node_cost.tolist()
+        for seed in range(self.num_qubits):
+            qubits, edges, cost = [seed], [], node_cost[seed]
+            inside = {seed}
+            # neighbour -> (cost of adding it, edge attaching it)
+            frontier: Dict[int, tuple] = {}
+            while True:
+                layouts = found.get(len(qubits))
+                if layouts is not None:
+                    key = frozenset(qubits)
+                    if key not in layouts or cost < layouts[key][0]:
+                        layouts[key] = (cost, list(qubits), list(edges))
+                if len(qubits) == sizes[-1]:
+                    break
+                for neighbour, e in self._adjacency[qubits[-1]]:
+                    step = edge_cost[e] + node_cost[neighbour]
+                    if neighbour not in inside and step < frontier.get(neighbour, (math.inf,))[0]:
+                        frontier[neighbour] = (step, e)
+                if not frontier:
+                    break
+                nearest = min(frontier, key=lambda q: frontier[q][0])
+                step, e = frontier.pop(nearest)
+                qubits.append(nearest)
+                inside.add(nearest)
+                edges.append(e)
+                cost += step
+        return {
+            size: [self._layout(q, cost, e) for cost, q, e in heapq.nsmallest(top, found[size].values(), key=lambda s: s[0])]
+            for size in sizes
+        }
+
+    # -------------------------
+    # Encoding
+    # -------------------------
+    def to_dict(
+        self, chain_lengths: Iterable[int] = CONNECTIVITY_CHAIN_LENGTHS, subgraph_sizes: Iterable[int] = CONNECTIVITY_SUBGRAPH_SIZES
+    ) -> dict:
+        """Compact form: flat arrays instead of one object per qubit or edge"""
+        calibration = self.calibration
+        node = np.full((self.num_qubits, 3), np.nan)
+        node[: calibration.num_qubits] = calibration.qubit_values
+        stamp = calibration.last_update_date
+        return {
+            "calibrated_at": stamp.isoformat() if stamp else None,
+            "num_qubits": self.num_qubits,
+            "num_edges": len(self.edge_pairs),
+            "csr": {"indptr": self.indptr.tolist(), "indices": self.indices.tolist(), "edge": self.edge.tolist()},
+            # pairs is flattened: edge i joins pairs[2i] and pairs[2i + 1]
+            "edges": {"pairs": self.edge_pairs.ravel().tolist(), "error": _nullable(self.edge_errors)},
+            "nodes": {"T1": _nullable(node[:, 0]), "T2": _nullable(node[:, 1]), "readout_error": _nullable(node[:, 2])},
+            "chains": {str(k): self.best_chains(k) for k in chain_lengths},
+            "subgraphs": {str(k): layouts for k, layouts in self.best_subgraphs(subgraph_sizes).items()},
+        }
@@ -0,0 +1,207 @@
+import calendar
+import time
+from array import array
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from job_store import parse_timestamp
+
+# Statuses charted by the dashboard; anything else is counted in the totals only
+CHART_STATUSES = ("COMPLETED", "RUNNING", "QUEUED", "ERROR")
+STATUS_CODES = {status: code for code, status in enumerate(CHART_STATUSES)}
+OTHER_STATUS = len(CHART_STATUSES)
+
+# Rollups served by /api/dashboard/summary?window=...
+SUMMARY_WINDOWS = ("hourly", "daily", "weekly", "monthly", "today")
+HOURLY_BUCKETS = 12
+DAILY_BUCKETS = 7
+WEEKLY_LOOKBACK_DAYS = 28
+MONTHLY_BUCKETS = 6
+
+
+def _utc(ts: float) -> datetime:
+    return datetime.fromtimestamp(ts, timezone.utc)
+
+
+def parse_tz(name: Optional[str]) -> tzinfo:
+    """IANA zone the buckets are laid out in; UTC when none is given"""
+    if not name:
+        return timezone.utc
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown time zone '{name}'")
+
+
+def window_edges(window: str, now: float, tz: tzinfo = timezone.utc) -> Tuple[List[float], List[str]]:
+    """Bucket boundaries (one more than labels) and labels of a window, in the zone tz.
+
+    The same buckets the dashboard route computes with date-fns in its server's local time
+    when it passes that zone: the last 12 hours, the last 7 days, the Monday-based weeks
+    since 4 weeks ago and the last 6 calendar months.
+    """
+    current = datetime.fromtimestamp(now, tz)
+    if window == "hourly":
+        edges = [now - (HOURLY_BUCKETS - i) * 3600 for i in range(HOURLY_BUCKETS + 1)]
+        return edges, [f"{datetime.fromtimestamp(edge, tz):%H:%M}" for edge in edges[:-1]]
+    # Local midnights: datetime arithmetic is in wall-clock time, so days across a DST change stay aligned
+    today = current.replace(hour=0, minute=0, second=0, microsecond=0)
+    if window == "daily":
+        days = [today - timedelta(days=DAILY_BUCKETS - 1 - i) for i in range(DAILY_BUCKETS + 1)]
+        return [day.timestamp() for day in days], [f"{day:%b} {day.day}" for day in days[:-1]]
+    if window == "weekly":
+        first = today - timedelta(days=WEEKLY_LOOKBACK_DAYS)
+        first -= timedelta(days=first.weekday())
+        weeks = []
+        while first <= current:
+            weeks.append(first)
+            first += timedelta(days=7)
+        weeks.append(first)
+        return [week.timestamp() for week in weeks], [f"{week:%b} {week.day}" for week in weeks[:-1]]
+    if window == "monthly":
+        months = []
+        for i in range(MONTHLY_BUCKETS, -1, -1):
+            year, month = divmod(current.year * 12 + current.month - 1 - (i - 1), 12)
+            months.append(datetime(year, month + 1, 1, tzinfo=tz))
+        return [month.timestamp() for month in months], [calendar.month_abbr[month.month] for month in months[:-1]]
+    raise ValueError(f"window must be one of {list(SUMMARY_WINDOWS)}")
+
+
+class DashboardRollup:
+    """Status histograms and completions per backend behind the dashboard's summary widgets.
+
+    Jobs are kept as columns (submission and completion epochs, status and backend codes),
+    updated in place when a job changes state. Each window is one vectorized pass:
+    searchsorted into the bucket edges, then a bincount over bucket x status. Results are
+    cached per window until a job changes or the minute turns.
+    """
+
+    def __init__(self):
+        self._index: Dict[str, int] = {}
+        self._ids: List[str] = []
+        self._submitted = array("d")
+        self._completed = array("d")
+        self._status = array("b")
+        self._backend = array("i")
+        self._backend_names: List[str] = []
+        self._backend_codes: Dict[str, int] = {}
+        self.version = 0
+        self._cache: Dict[Tuple[str, str], Tuple[int, int, dict]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    # -------------------------
+    # Ingestion
+    # -------------------------
+    def ingest(self, record: dict):
+        job_id = record.get("job_id")
+        if not job_id or "error" in record:
+            return
+        submitted = parse_timestamp(record.get("submitted"))
+        completed = parse_timestamp((record.get("status_and_usage") or {}).get("completed"))
+        backend = record.get("backend") or "Unknown"
+        code = self._backend_codes.get(backend)
+        if code is None:
+            code = self._backend_codes[backend] = len(self._backend_names)
+            self._backend_names.append(backend)
+        row = (
+            submitted if submitted is not None else float("nan"),
+            completed if completed is not None else float("nan"),
+            STATUS_CODES.get(record.get("status"), OTHER_STATUS),
+            code,
+        )
+        i = self._index.get(job_id)
+        if i is None:
+            self._index[job_id] = len(self._status)
+            self._ids.append(job_id)
+            self._submitted.append(row[0])
+            self._completed.append(row[1])
+            self._status.append(row[2])
+            self._backend.append(row[3])
+        elif repr(row) != repr((self._submitted[i], self._completed[i], self._status[i], self._backend[i])):
+            self._submitted[i], self._completed[i], self._status[i], self._backend[i] = row
+        else:
+            return
+        self.version += 1
+
+    def ingest_many(self, records: Iterable[dict]):
+        for record in records:
+            self.ingest(record)
+
+    def remove_many(self, job_ids: Iterable[str]):
+        """Drops jobs deleted upstream, moving the last row into each freed one"""
+        columns = (self._submitted, self._completed, self._status, self._backend)
+        for job_id in job_ids:
+            i = self._index.pop(job_id, None)
+            if i is None:
+                continue
+            last = len(self._ids) - 1
+            if i != last:
+                self._ids[i] = self._ids[last]
+                self._index[self._ids[i]] = i
+                for column in columns:
+                    column[i] = column[last]
+            self._ids.pop()
+            for column in columns:
+                column.pop()
+            self.version += 1
+
+    # -------------------------
+    # Rollups
+    # -------------------------
+    def summary(
+        self, windows: Iterable[str] = SUMMARY_WINDOWS, now: Optional[float] = None, tz: tzinfo = timezone.utc
+    ) -> dict:
+        now = now if now is not None else time.time()
+        # Anchored to the minute, so a cached rollup is valid until the next one
+        minute = int(now // 60)
+        result = {"generated_at": _utc(minute * 60).isoformat(), "total_jobs": len(self._status)}
+        for window in windows:
+            key = (window, str(tz))
+            cached = self._cache.get(key)
+            if cached and cached[:2] == (self.version, minute):
+                self.hits += 1
+            else:
+                self.misses += 1
+                if window == "today":
+                    rollup = self._today(minute * 60, tz)
+                else:
+                    rollup = self._histogram(window, minute * 60, tz)
+                cached = self._cache[key] = (self.version, minute, rollup)
+            result[window] = cached[2]
+        return result
+
+    def _histogram(self, window: str, now: float, tz: tzinfo) -> List[dict]:
+        import numpy as np
+
+        edges, labels = window_edges(window, now, tz)
+        submitted = np.array(self._submitted)
+        bucket = np.searchsorted(np.asarray(edges), submitted, side="right") - 1
+        # NaN sorts past the last edge, so unknown submission times drop out here
+        inside = (bucket >= 0) & (bucket < len(labels))
+        keys = bucket[inside] * (OTHER_STATUS + 1) + np.array(self._status)[inside]
+        counts = np.bincount(keys, minlength=len(labels) * (OTHER_STATUS + 1)).reshape(len(labels), -1)
+        return [
+            {"label": label, **{status: int(row[code]) for status, code in STATUS_CODES.items()}, "total": int(row.sum())}
+            for label, row in zip(labels, counts)
+        ]
+
+    def _today(self, now: float, tz: tzinfo) -> dict:
+        """Jobs completed since midnight in tz, per backend"""
+        import numpy as np
+
+        start = datetime.fromtimestamp(now, tz).replace(hour=0, minute=0, second=0, microsecond=0)
+        completed = np.array(self._completed)
+        done = (np.array(self._status) == STATUS_CODES["COMPLETED"]) & (completed >= start.timestamp())
+        counts = np.bincount(np.array(self._backend)[done], minlength=len(self._backend_names))
+        return {
+            "date": start.isoformat(),
+            "totalCompleted": int(counts.sum()),
+            "completedByBackend": [
+                {"name": self._backend_names[code], "value": int(counts[code])} for code in np.flatnonzero(counts)
+            ],
+        }
+
+    def stats(self) -> dict:
+        return {"jobs": len(self._status), "version": self.version, "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,244 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger("quantum-tracker")
+
+# -------------------------
+# Configuration
+# -------------------------
+EVENT_BUFFER_SIZE = int(os.getenv("EVENT_BUFFER_SIZE", "5000"))
+BACKEND_POLL_INTERVAL = float(os.getenv("BACKEND_POLL_INTERVAL", "15"))
+STREAM_HEARTBEAT = float(os.getenv("STREAM_HEARTBEAT", "15"))
+
+# Fields of a lite job record forwarded with each status transition
+JOB_EVENT_FIELDS = ("job_id", "status", "backend", "user", "program", "submitted", "elapsed_time", "qpu_seconds")
+BACKEND_EVENT_FIELDS = ("operational", "status_msg", "pending_jobs")
+
+
+class EventHub:
+    """Bounded log of change events shared by every stream client of this worker.
+
+    Job events carry the shared job store's version of their change as the SSE id
+    ("<store_id>-<version>"); every worker tailing the store stamps a change with the same
+    version, so a client can resume on any worker. Backend status deltas carry no id: a
+    resumed stream starts with the current status of every backend instead of a replay.
+    """
+
+    def __init__(self, capacity: int = EVENT_BUFFER_SIZE):
+        # (position, store version or None, type, data); positions order this worker's events
+        self._events: "deque[Tuple[int, Optional[int], str, dict]]" = deque(maxlen=capacity)
+        self._position = 0
+        self._changed: Optional[asyncio.Event] = None
+        self.store_id = "none"
+        self.version = 0
+        # Job events at or below this version can no longer be replayed
+        self.floor = 0
+        self.backends: Dict[str, dict] = {}
+
+    def attach(self, store_id: str, version: int):
+        """Derives ids from a job store; changes up to its current version are not replayable"""
+        self.store_id = store_id
+        self.version = self.floor = version
+
+    @property
+    def position(self) -> int:
+        return self._position
+
+    def event_id(self, version: int) -> str:
+        return f"{self.store_id}-{version}"
+
+    def parse_event_id(self, event_id: Optional[str]) -> Optional[int]:
+        """The store version in an event id, or -1 when the id is from another store"""
+        if not event_id:
+            return None
+        store_id, _, version = event_id.rpartition("-")
+        if store_id != self.store_id or not version.isdigit():
+            return -1
+        return int(version)
+
+    def _signal(self) -> asyncio.Event:
+        if self._changed is None:
+            self._changed = asyncio.Event()
+        return self._changed
+
+    def publish(self, event_type: str, data: dict, version: Optional[int] = None) -> int:
+        if len(self._events) == self._events.maxlen:
+            dropped = self._events[0][1]
+            if dropped is not None:
+                self.floor = max(self.floor, dropped)
+        if version is not None:
+            self.version = max(self.version, version)
+        if event_type == "backend":
+            self.backends.setdefault(data["name"], {}).update(data)
+        self._position += 1
+        self._events.append((self._position, version, event_type, data))
+        # Wake every waiting client, then arm a fresh event for the next publish
+        self._signal().set()
+        self._changed = asyncio.Event()
+        return self._position
+
+    def replay(self, version: int) -> Optional[List[Tuple[int, Optional[int], str, dict]]]:
+        """Job events after version followed by every backend's status, or None when events
+        after version were already dropped (or never seen by this worker)"""
+        if version < self.floor:
+            return None
+        jobs = [event for event in self._events if event[1] is not None and event[1] > version]
+        backends = [(self._position, None, "backend", dict(fields)) for fields in self.backends.values()]
+        return jobs + backends
+
+    def since(self, position: int) -> List[Tuple[int, Optional[int], str, dict]]:
+        if position >= self._position:
+            return []
+        return [event for event in self._events if event[0] > position]
+
+    async def wait(self, position: int, timeout: float) -> List[Tuple[int, Optional[int], str, dict]]:
+        events = self.since(position)
+        if events:
+            return events
+        try:
+            await asyncio.wait_for(self._signal().wait(), timeout)
+        except asyncio.TimeoutError:
+            return []
+        return self.since(position)
+
+    # -------------------------
+    # Producers
+    # -------------------------
+    def observe_changes(self, changed: List[dict]):
+        """Change listener: keeps the hello cursor at the store version, backfills included"""
+        self.version = max([self.version] + [record.get("seq") or 0 for record in changed])
+
+    def publish_job_changes(self, changed: List[dict]):
+        """JobSync listener: one event per new job or status transition, under its store version"""
+        for record in changed:
+            if record.get("previous_status") == record.get("status"):
+                continue
+            data = {field: record.get(field) for field in JOB_EVENT_FIELDS}
+            data["previous_status"] = record.get("previous_status")
+            self.publish("job", data, record.get("seq"))
+
+
+def format_sse(event_id: Optional[str], event_type: str, data: Any) -> str:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event_type}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+class BackendStatusPoller:
+    """Single upstream poller that publishes backend status deltas to the hub"""
+
+    def __init__(
+        self,
+        hub: EventHub,
+        list_backends: Callable[[], Awaitable[list]],
+        get_status: Callable[[Any], Awaitable[Any]],
+        interval: float = BACKEND_POLL_INTERVAL,
+        on_snapshot: Optional[Callable[[Dict[str, dict]], Awaitable[None]]] = None,
+    ):
+        self.hub = hub
+        self.list_backends = list_backends
+        self.get_status = get_status
+        self.interval = interval
+        self.on_snapshot = on_snapshot
+        self.snapshot: Dict[str, dict] = {}
+        # Called with every fetched snapshot, changed or not (e.g. queue depth history)
+        self.listeners: List[Callable[[Dict[str, dict]], None]] = []
+
+    async def fetch(self) -> Dict[str, dict]:
+        backends = await self.list_backends()
+        statuses = await asyncio.gather(*[self.get_status(b) for b in backends], return_exceptions=True)
+        current = {}
+        for backend, status_obj in zip(backends, statuses):
+            if isinstance(status_obj, BaseException) or status_obj is None:
+                continue
+            current[backend.name] = {field: getattr(status_obj, field, None) for field in BACKEND_EVENT_FIELDS}
+        return current
+
+    def publish(self, current: Dict[str, dict]):
+        for name, fields in current.items():
+            previous = self.snapshot.get(name)
+            if previous == fields:
+                continue
+            delta = {k: v for k, v in fields.items() if previous is None or previous.get(k) != v}
+            self.snapshot[name] = fields
+            self.hub.publish("backend", {"name": name, **delta})
+
+    async def poll_once(self):
+        current = await self.fetch()
+        self.publish(current)
+        for listener in self.listeners:
+            listener(current)
+        if self.on_snapshot:
+            await self.on_snapshot(current)
+
+    async def run(self):
+        while True:
+            try:
+                await self.poll_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Backend status poll failed: {e}")
+            await asyncio.sleep(self.interval)
+
+
+class StatusSnapshotFollower(BackendStatusPoller):
+    """Publishes deltas of the status snapshots another worker's poller shares, without polling upstream"""
+
+    def __init__(
+        self,
+        hub: EventHub,
+        load_snapshot: Callable[[], Awaitable[Optional[Dict[str, dict]]]],
+        interval: float = BACKEND_POLL_INTERVAL,
+    ):
+        super().__init__(hub, None, None, interval)
+        self.load_snapshot = load_snapshot
+
+    async def fetch(self) -> Dict[str, dict]:
+        return await self.load_snapshot() or {}
+
+
+async def sse_events(hub: EventHub, event_id: Optional[str], is_disconnected: Callable[[], Awaitable[bool]]):
+    """Yields SSE frames: a replay from the last event id (or a reset marker), then live events"""
+    seen = hub.parse_event_id(event_id)
+    position = hub.position
+    if seen is None:
+        seen = hub.version
+        yield format_sse(hub.event_id(seen), "hello", {"cursor": hub.event_id(seen), "server_time": time.time()})
+    else:
+        events = hub.replay(seen) if seen >= 0 else None
+        if events is None:
+            # The client missed events no worker holds any more, or its id is from another
+            # store; it must refetch full state
+            seen = hub.version
+            yield format_sse(hub.event_id(seen), "reset", {"cursor": hub.event_id(seen)})
+            events = []
+        for frame in _frames(hub, events, seen):
+            yield frame
+
+    while not await is_disconnected():
+        events = await hub.wait(position, STREAM_HEARTBEAT)
+        if not events:
+            yield ": heartbeat\n\n"
+            continue
+        position = events[-1][0]
+        for frame in _frames(hub, events, seen):
+            yield frame
+
+
+def _frames(hub: EventHub, events: list, seen: int) -> Iterator[str]:
+    """SSE frames of events; job changes at or below the version the client resumed from are
+    skipped (they arrive late on a worker whose store follower lags the one it came from)"""
+    for _, version, event_type, data in events:
+        if version is None:
+            yield format_sse(None, event_type, data)
+        elif version > seen:
+            yield format_sse(hub.event_id(version), event_type, data)
@@ -1,83 +1,318 @@
+import asyncio
 import os
-import requests
+import random
+import re
 import time
 import logging
+from typing import TYPE_CHECKING, Any, Optional
+
+import httpx
+
+import instrumentation
+
+if TYPE_CHECKING:
+    from upstream_scheduler import UpstreamScheduler
 
 logger = logging.getLogger("ibm-cloud-client")
 
+# -------------------------
+# Configuration
+# -------------------------
+IAM_URL = "https://iam.cloud.ibm.com/identity/token"
+IBM_HTTP_TIMEOUT = float(os.getenv("IBM_HTTP_TIMEOUT", "10"))
+IBM_HTTP_CONNECT_TIMEOUT = float(os.getenv("IBM_HTTP_CONNECT_TIMEOUT", "5"))
+IBM_HTTP_MAX_CONNECTIONS = int(os.getenv("IBM_HTTP_MAX_CONNECTIONS", "20"))
+IBM_HTTP_RETRIES = int(os.getenv("IBM_HTTP_RETRIES", "3"))
+IBM_HTTP_BACKOFF = float(os.getenv("IBM_HTTP_BACKOFF", "0.5"))
+# Refresh this long before the IAM token actually expires
+TOKEN_REFRESH_MARGIN = 300
+# Longest wait between background token refresh attempts while IAM keeps failing
+TOKEN_REFRESH_MAX_BACKOFF = float(os.getenv("TOKEN_REFRESH_MAX_BACKOFF", "300"))
+# IAM answers these when the API key itself is rejected; retrying will not help
+IAM_REJECTED_STATUSES = {400, 401}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Backend names and job ids in paths, replaced by placeholders in the call metrics
+PATH_IDS = re.compile(r"^/(backends|jobs)/[^/]+")
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
 class IBMCloudClient:
-    def __init__(self, api_key: str, instance_crn: str):
+    """Async REST client for IBM Quantum Platform on one pooled keep-alive connection"""
+
+    def __init__(
+        self,
+        api_key: str,
+        instance_crn: str,
+        base_url: Optional[str] = None,
+        iam_url: str = IAM_URL,
+        timeout: float = IBM_HTTP_TIMEOUT,
+        max_retries: int = IBM_HTTP_RETRIES,
+        backoff: float = IBM_HTTP_BACKOFF,
+        scheduler: Optional["UpstreamScheduler"] = None,
+    ):
         self.api_key = api_key
         self.instance_crn = instance_crn
         self.access_token = None
         self.token_expiry = 0
         self.base_url = "https://quantum.cloud.ibm.com/api/v1"
-        
+
         # Adjust URL based on region if known (naive check)
         if "eu-de" in instance_crn:
             self.base_url = "https://eu-de.quantum.cloud.ibm.com/api/v1"
+        if base_url:
+            self.base_url = base_url.rstrip("/")
+        self.iam_url = iam_url
+        self.timeout = httpx.Timeout(timeout, connect=min(timeout, IBM_HTTP_CONNECT_TIMEOUT))
+        self.max_retries = max_retries
+        self.backoff = backoff
+        # API requests (not IAM) share the SDK's rate limit and priority lanes when given one
+        self.scheduler = scheduler
+        self.token_refreshes = 0
+        self.retries = 0
+        # Set when IAM rejected the API key; the background refresh is parked until a
+        # refresh on demand succeeds again
+        self.auth_error: Optional[str] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._refreshing: Optional[asyncio.Task] = None
+        self._background: Optional[asyncio.Task] = None
 
-    def _refresh_token(self):
+    # -------------------------
+    # Connection pool
+    # -------------------------
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Created lazily so the pool binds to the running event loop
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=IBM_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=IBM_HTTP_MAX_CONNECTIONS,
+                ),
+            )
+        return self._client
+
+    def start(self):
+        """Starts refreshing the token in the background before it expires"""
+        if self._background is None or self._background.done():
+            self._background = asyncio.create_task(self._refresh_loop())
+
+    async def close(self):
+        if self._background:
+            self._background.cancel()
+            await asyncio.gather(self._background, return_exceptions=True)
+            self._background = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    # -------------------------
+    # Authentication
+    # -------------------------
+    async def _refresh_token(self):
         """Exchanges API Key for Bearer Token via IAM"""
-        url = "https://iam.cloud.ibm.com/identity/token"
         headers = {'Content-Type': 'application/x-www-form-urlencoded'}
         data = {
             'grant_type': 'urn:ibm:params:oauth:grant-type:apikey',
             'apikey': self.api_key
         }
-        
+
         try:
-            response = requests.post(url, headers=headers, data=data)
-            response.raise_for_status()
+            response = await self._send("POST", self.iam_url, headers=headers, data=data)
             token_data = response.json()
             self.access_token = token_data['access_token']
             # Set expiry with a small buffer (e.g., 5 mins before actual expiry)
-            self.token_expiry = time.time() + token_data.get('expires_in', 3600) - 300
+            self.token_expiry = time.time() + token_data.get('expires_in', 3600) - TOKEN_REFRESH_MARGIN
+            self.token_refreshes += 1
             logger.info("Successfully refreshed IBM Cloud Bearer Token")
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code in IAM_REJECTED_STATUSES:
+                self.auth_error = f"IAM rejected the API key ({e.response.status_code})"
+            logger.error(f"Failed to refresh token: {e}")
+            raise
         except Exception as e:
             logger.error(f"Failed to refresh token: {e}")
             raise
+        if self.auth_error is not None:
+            self.auth_error = None
+            # The key works again: resume the background refresh parked after the rejection
+            if self._background is not None:
+                self.start()
 
-    def get_token(self):
+    async def refresh_token(self):
+        """Refreshes the token; concurrent callers share a single IAM request"""
+        if self._refreshing is None or self._refreshing.done():
+            self._refreshing = asyncio.ensure_future(self._refresh_token())
+        await asyncio.shield(self._refreshing)
+
+    async def get_token(self):
         """Returns a valid access token, refreshing if necessary"""
         if not self.access_token or time.time() >= self.token_expiry:
-            self._refresh_token()
+            await self.refresh_token()
         return self.access_token
 
-    def get_headers(self):
+    def _refresh_delay(self, failures: int) -> float:
+        # Full jitter over an exponentially growing window, capped
+        return random.uniform(0, min(self.backoff * 10 * (2 ** failures), TOKEN_REFRESH_MAX_BACKOFF))
+
+    async def _refresh_loop(self):
+        failures = 0
+        while True:
+            try:
+                await asyncio.sleep(max(self.token_expiry - time.time(), 0))
+                await self.refresh_token()
+                failures = 0
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Already logged
+                if self.auth_error is not None:
+                    logger.error(f"Background token refresh parked: {self.auth_error}")
+                    return
+                # get_token still retries on demand in the meantime
+                await asyncio.sleep(self._refresh_delay(failures))
+                failures += 1
+
+    async def get_headers(self):
         return {
-            'Authorization': f'Bearer {self.get_token()}',
+            'Authorization': f'Bearer {await self.get_token()}',
             'Service-CRN': self.instance_crn,
             'IBM-API-Version': '2021-10-01', # Using a recent stable version
             'Accept': 'application/json'
         }
 
-    def get_backends(self):
-        url = f"{self.base_url}/backends"
+    # -------------------------
+    # Transport
+    # -------------------------
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        # Full jitter: uniform over an exponentially growing window
+        return random.uniform(0, self.backoff * (2 ** attempt))
+
+    async def _request(self, method: str, url: str, scheduled: bool, **kwargs) -> httpx.Response:
+        if not scheduled or self.scheduler is None:
+            return await self.client.request(method, url, **kwargs)
+        async with self.scheduler.slot():
+            response = await self.client.request(method, url, **kwargs)
+        if response.status_code == 429:
+            retry_after = response.headers.get("retry-after")
+            self.scheduler.throttled(float(retry_after) if retry_after and retry_after.isdigit() else None)
+        elif response.status_code < 400:
+            self.scheduler.succeeded()
+        return response
+
+    async def _send(
+        self, method: str, url: str, timeout: Optional[float] = None, scheduled: bool = False, **kwargs
+    ) -> httpx.Response:
+        """Sends one request, retrying 429/5xx and connection errors with jittered backoff"""
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        for attempt in range(self.max_retries + 1):
+            response = None
+            try:
+                response = await self._request(method, url, scheduled, **kwargs)
+                if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                    response.raise_for_status()
+                    return response
+            except httpx.TransportError:
+                if attempt == self.max_retries:
+                    raise
+            self.retries += 1
+            delay = self._retry_delay(attempt, response)
+            logger.warning(f"Retrying {method} {url} in {delay:.2f}s (attempt {attempt + 1})")
+            await asyncio.sleep(delay)
+
+    async def _get(self, path: str, params: Optional[dict] = None, timeout: Optional[float] = None) -> Any:
+        url = f"{self.base_url}{path}"
+        call = "GET " + PATH_IDS.sub(lambda m: f"/{m.group(1)}/{{id}}", path)
+        with instrumentation.upstream(call):
+            try:
+                response = await self._send(
+                    "GET", url, headers=await self.get_headers(), params=params, timeout=timeout, scheduled=True
+                )
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code != 401:
+                    raise
+                # Token revoked or expired early: refresh once and replay
+                await self.refresh_token()
+                response = await self._send(
+                    "GET", url, headers=await self.get_headers(), params=params, timeout=timeout, scheduled=True
+                )
+            return response.json()
+
+    # -------------------------
+    # Endpoints
+    # -------------------------
+    async def get_backends(self, timeout: Optional[float] = None) -> list:
         try:
-            response = requests.get(url, headers=self.get_headers())
-            response.raise_for_status()
-            data = response.json()
+            data = await self._get("/backends", timeout=timeout)
             # The API returns {"devices": ["name1", "name2"]}
             return data.get("devices", [])
         except Exception as e:
             logger.error(f"Error fetching backends via REST: {e}")
             raise
 
+    async def get_backend_status(self, name: str, timeout: Optional[float] = None) -> dict:
+        return await self._get(f"/backends/{name}/status", timeout=timeout)
+
+    async def get_backend_configuration(self, name: str, timeout: Optional[float] = None) -> dict:
+        return await self._get(f"/backends/{name}/configuration", timeout=timeout)
+
+    async def get_backend_properties(self, name: str, timeout: Optional[float] = None) -> dict:
+        return await self._get(f"/backends/{name}/properties", timeout=timeout)
+
+    async def get_jobs(
+        self, limit: int = 20, offset: int = 0, pending: Optional[bool] = None, timeout: Optional[float] = None
+    ) -> list:
+        params = {"limit": limit, "offset": offset, "exclude_params": "true"}
+        if pending is not None:
+            params["pending"] = str(pending).lower()
+        data = await self._get("/jobs", params=params, timeout=timeout)
+        return data.get("jobs", [])
+
+    async def get_job(self, job_id: str, timeout: Optional[float] = None) -> dict:
+        return await self._get(f"/jobs/{job_id}", params={"exclude_params": "true"}, timeout=timeout)
+
+    async def get_job_status(self, job_id: str, timeout: Optional[float] = None) -> Optional[str]:
+        job = await self.get_job(job_id, timeout=timeout)
+        # Newer API versions nest the status under "state"
+        state = job.get("state")
+        if isinstance(state, dict) and state.get("status"):
+            return state["status"]
+        return job.get("status")
+
+
 if __name__ == "__main__":
     # Test script
     from dotenv import load_dotenv
     logging.basicConfig(level=logging.INFO)
     load_dotenv()
-    
+
     TOKEN = os.getenv("IBM_QUANTUM_TOKEN")
     INSTANCE = os.getenv("IBM_QUANTUM_INSTANCE")
-    
-    client = IBMCloudClient(TOKEN, INSTANCE)
-    
-    print("Fetching backends...")
-    try:
-         backends = client.get_backends()
-         print(f"Found {len(backends)} backends via REST API: {backends}")
-    except Exception as e:
-        print(f"Failed: {e}")
+
+    async def main():
+        async with IBMCloudClient(TOKEN, INSTANCE) as client:
+            print("Fetching backends...")
+            try:
+                backends = await client.get_backends()
+                print(f"Found {len(backends)} backends via REST API: {backends}")
+            except Exception as e:
+                print(f"Failed: {e}")
+
+    asyncio.run(main())
@@ -0,0 +1,424 @@
+import asyncio
+import contextvars
+import functools
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from fastapi.routing import APIRoute
+
+logger = logging.getLogger("quantum-tracker")
+
+# -------------------------
+# Configuration
+# -------------------------
+# Sampling profiler for slow requests: off unless enabled here or via POST /api/debug/profiler
+PROFILER_ENABLED = os.getenv("PROFILER_ENABLED", "false").lower() == "true"
+PROFILER_INTERVAL = float(os.getenv("PROFILER_INTERVAL", "0.005"))
+SLOW_REQUEST_SECONDS = float(os.getenv("SLOW_REQUEST_SECONDS", "1.0"))
+# Stack samples kept in memory at most, whatever the interval and thread count
+PROFILER_MAX_SAMPLES = int(os.getenv("PROFILER_MAX_SAMPLES", "100000"))
+PROFILE_DIR = os.getenv(
+    "PROFILE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "profiles")
+)
+# Slow request traces kept for /api/debug/traces
+TRACE_BUFFER_SIZE = int(os.getenv("TRACE_BUFFER_SIZE", "200"))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Request latencies kept for the api_speed figure of /api/metrics
+API_SPEED_WINDOW = 500
+
+
+# -------------------------
+# Per-request traces
+# -------------------------
+class RequestTrace:
+    """Span totals and counters of one request; spans may be recorded from SDK worker threads"""
+
+    __slots__ = ("method", "path", "route", "start", "spans", "counters", "_lock")
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.route = path
+        self.start = time.perf_counter()
+        self.spans: Dict[str, List[float]] = {}
+        self.counters: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float):
+        with self._lock:
+            entry = self.spans.get(name)
+            if entry is None:
+                self.spans[name] = [seconds, 1]
+            else:
+                entry[0] += seconds
+                entry[1] += 1
+
+    def count(self, name: str, n: int = 1):
+        with self._lock:
+            self.counters[name] += n
+
+    def server_timing(self, total: float) -> str:
+        """Server-Timing header value: one entry per span, durations in ms"""
+        entries = [f'total;dur={total * 1e3:.1f}']
+        for name, (seconds, calls) in sorted(self.spans.items(), key=lambda item: -item[1][0]):
+            entries.append(f'{name};dur={seconds * 1e3:.1f};desc="x{calls}"')
+        entries += [f'{name};desc="{count}"' for name, count in self.counters.items()]
+        return ", ".join(entries)
+
+    def to_dict(self, total: float) -> dict:
+        return {
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "duration_ms": round(total * 1e3, 2),
+            "spans": {name: {"ms": round(s * 1e3, 2), "calls": c} for name, (s, c) in self.spans.items()},
+            "counters": dict(self.counters),
+        }
+
+
+_current: contextvars.ContextVar[Optional[RequestTrace]] = contextvars.ContextVar("request_trace", default=None)
+
+
+def current_trace() -> Optional[RequestTrace]:
+    return _current.get()
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Adds the block's duration to the current request's span named name"""
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, time.perf_counter() - start)
+
+
+def record(name: str, seconds: float):
+    trace = _current.get()
+    if trace is not None:
+        trace.add(name, seconds)
+
+
+def count(name: str, n: int = 1):
+    trace = _current.get()
+    if trace is not None:
+        trace.count(name, n)
+
+
+# -------------------------
+# Prometheus registry
+# -------------------------
+def _labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    escaped = (f'{k}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"' for k, v in labels)
+    return "{" + ",".join(escaped) + "}"
+
+
+class MetricsRegistry:
+    """Counters and fixed-bucket histograms rendered in the Prometheus text format"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._help: Dict[str, Tuple[str, str]] = {}
+        self._counters: Dict[str, Dict[tuple, float]] = {}
+        self._gauges: Dict[str, Dict[tuple, float]] = {}
+        self._histograms: Dict[str, Dict[tuple, list]] = {}
+
+    def describe(self, name: str, kind: str, text: str):
+        self._help[name] = (kind, text)
+
+    def inc(self, name: str, labels: tuple = (), value: float = 1.0):
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[labels] = series.get(labels, 0.0) + value
+
+    def set_gauge(self, name: str, labels: tuple, value: float):
+        with self._lock:
+            self._gauges.setdefault(name, {})[labels] = value
+
+    def observe(self, name: str, labels: tuple, seconds: float):
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            entry = series.get(labels)
+            if entry is None:
+                # Per-bucket counts (made cumulative on render), then sum and count
+                entry = series[labels] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    entry[0][i] += 1
+                    break
+            entry[1] += seconds
+            entry[2] += 1
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for name, series in self._counters.items():
+                kind, text = self._help.get(name, ("counter", name))
+                lines += [f"# HELP {name} {text}", f"# TYPE {name} counter"]
+                lines += [f"{name}{_labels(labels)} {value:g}" for labels, value in series.items()]
+            for name, series in self._gauges.items():
+                kind, text = self._help.get(name, ("gauge", name))
+                lines += [f"# HELP {name} {text}", f"# TYPE {name} gauge"]
+                lines += [f"{name}{_labels(labels)} {value:g}" for labels, value in series.items()]
+            for name, series in self._histograms.items():
+                kind, text = self._help.get(name, ("histogram", name))
+                lines += [f"# HELP {name} {text}", f"# TYPE {name} histogram"]
+                for labels, (counts, total, observations) in series.items():
+                    cumulative = 0
+                    for bound, bucket in zip(self.buckets, counts):
+                        cumulative += bucket
+                        lines.append(f"{name}_bucket{_labels(labels + (('le', f'{bound:g}'),))} {cumulative}")
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {observations}")
+                    lines.append(f"{name}_sum{_labels(labels)} {total:.6f}")
+                    lines.append(f"{name}_count{_labels(labels)} {observations}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+registry.describe("quantum_http_request_duration_seconds", "histogram", "HTTP request latency by route")
+registry.describe("quantum_upstream_call_duration_seconds", "histogram", "IBM Quantum SDK and REST call latency")
+registry.describe("quantum_upstream_errors_total", "counter", "IBM Quantum SDK and REST calls that failed")
+registry.describe("quantum_cache_events_total", "counter", "Cache hits, misses and coalesced loads")
+registry.describe("quantum_upstream_queue_depth", "gauge", "Upstream calls waiting for admission, per priority lane")
+registry.describe("quantum_upstream_queue_wait_seconds", "histogram", "Wait for upstream admission, per priority lane")
+
+
+def observe_upstream(call: str, seconds: float, failed: bool = False):
+    """Records one upstream call in the registry and as a span of the current request"""
+    registry.observe("quantum_upstream_call_duration_seconds", (("call", call),), seconds)
+    if failed:
+        registry.inc("quantum_upstream_errors_total", (("call", call),))
+    record(f"upstream.{call}", seconds)
+
+
+def upstream_failed(call: str):
+    """Counts an upstream call the caller gave up on, without a latency sample"""
+    registry.inc("quantum_upstream_errors_total", (("call", call),))
+
+
+@contextmanager
+def upstream(call: str) -> Iterator[None]:
+    start = time.perf_counter()
+    failed = True
+    try:
+        yield
+        failed = False
+    finally:
+        observe_upstream(call, time.perf_counter() - start, failed)
+
+
+def cache_event(cache: str, tier: str, event: str):
+    registry.inc("quantum_cache_events_total", (("cache", cache), ("tier", tier), ("event", event)))
+    count(f"cache.{cache}.{tier}.{event}")
+
+
+# -------------------------
+# Sampling profiler
+# -------------------------
+class SamplingProfiler:
+    """Samples every thread's stack at a fixed interval while enabled.
+
+    Slow requests dump the samples taken during their lifetime in the folded format
+    ("frame;frame;frame count") that flamegraph.pl and speedscope read. Concurrent
+    requests share the event loop thread, so a dump can include their frames too.
+    """
+
+    def __init__(
+        self,
+        interval: float = PROFILER_INTERVAL,
+        directory: str = PROFILE_DIR,
+        horizon: float = 120.0,
+        max_samples: int = PROFILER_MAX_SAMPLES,
+    ):
+        self.interval = interval
+        self.directory = directory
+        self.horizon = horizon
+        self.samples: Deque[Tuple[float, str]] = deque(maxlen=max_samples)
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        with self._lock:
+            if self.enabled:
+                return
+            # Each run gets its own stop event, so a run that is still winding down can never
+            # be revived by the next start
+            self._stop = threading.Event()
+            self._thread = threading.Thread(target=self._run, args=(self._stop,), name="profiler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        with self._lock:
+            thread, self._thread = self._thread, None
+            self._stop.set()
+            if thread is not None:
+                thread.join()
+            self.samples.clear()
+
+    @staticmethod
+    def _fold(thread_name: str, frame) -> str:
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        stack.append(thread_name)
+        return ";".join(reversed(stack))
+
+    def _run(self, stop: threading.Event):
+        me = threading.get_ident()
+        while not stop.wait(self.interval):
+            now = time.perf_counter()
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident != me:
+                    self.samples.append((now, self._fold(names.get(ident, str(ident)), frame)))
+            while self.samples and self.samples[0][0] < now - self.horizon:
+                self.samples.popleft()
+
+    def folded(self, start: float, end: float) -> Dict[str, int]:
+        stacks: Counter = Counter(stack for ts, stack in list(self.samples) if start <= ts <= end)
+        return dict(stacks)
+
+    def dump(self, trace: RequestTrace, end: float) -> Optional[str]:
+        """Writes the request's samples to PROFILE_DIR; returns the file name"""
+        stacks = self.folded(trace.start, end)
+        if not stacks:
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        route = re.sub(r"[^A-Za-z0-9]+", "_", trace.route).strip("_") or "root"
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{route}-{(end - trace.start) * 1e3:.0f}ms.folded"
+        with open(os.path.join(self.directory, name), "w") as f:
+            f.writelines(f"{stack} {n}\n" for stack, n in stacks.items())
+        return name
+
+
+profiler = SamplingProfiler()
+if PROFILER_ENABLED:
+    profiler.start()
+
+slow_traces: Deque[dict] = deque(maxlen=TRACE_BUFFER_SIZE)
+_latencies: Deque[float] = deque(maxlen=API_SPEED_WINDOW)
+
+
+def api_speed_ms() -> float:
+    """Median latency of recent API requests in ms (the dashboard's API speed gauge)"""
+    if not _latencies:
+        return 0
+    ordered = sorted(_latencies)
+    return round(ordered[len(ordered) // 2] * 1e3, 1)
+
+
+# -------------------------
+# Routes
+# -------------------------
+def timed_endpoint(endpoint: Callable) -> Callable:
+    """Wraps a route endpoint so its own run time is recorded as the "endpoint" span"""
+    if asyncio.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            with span("endpoint"):
+                return await endpoint(*args, **kwargs)
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            with span("endpoint"):
+                return endpoint(*args, **kwargs)
+    return wrapper
+
+
+class TimedRoute(APIRoute):
+    """Route class separating the endpoint's time from FastAPI's validation and serialization.
+
+    Set as app.router.route_class before routes are declared; the rest of the route
+    handler's time is recorded as the "serialize" span.
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        super().__init__(path, timed_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def timed_handler(request):
+            start = time.perf_counter()
+            try:
+                return await handler(request)
+            finally:
+                trace = _current.get()
+                if trace is not None:
+                    endpoint = trace.spans.get("endpoint", (0.0, 0))[0]
+                    trace.add("serialize", max(0.0, time.perf_counter() - start - endpoint))
+
+        return timed_handler
+
+
+# -------------------------
+# ASGI middleware
+# -------------------------
+class InstrumentationMiddleware:
+    """Traces each HTTP request: latency histogram per route, Server-Timing header with the
+    span breakdown, and a profile dump plus stored trace when the request is slow"""
+
+    def __init__(self, app, slow_seconds: float = SLOW_REQUEST_SECONDS):
+        self.app = app
+        self.slow_seconds = slow_seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        trace = RequestTrace(scope["method"], scope["path"])
+        token = _current.set(trace)
+        status = {"code": 500}
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                route = scope.get("route")
+                trace.route = getattr(route, "path", None) or "unmatched"
+                total = time.perf_counter() - trace.start
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (b"server-timing", trace.server_timing(total).encode("latin-1", "replace"))
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            end = time.perf_counter()
+            total = end - trace.start
+            labels = (("method", trace.method), ("route", trace.route), ("status", str(status["code"])))
+            registry.observe("quantum_http_request_duration_seconds", labels, total)
+            # Long-lived streams would swamp the API speed figure and the slow request log
+            if trace.route.startswith("/api/") and not trace.route.endswith("stream") and not trace.route.startswith("/api/debug"):
+                _latencies.append(total)
+                if total >= self.slow_seconds:
+                    record = trace.to_dict(total)
+                    if profiler.enabled:
+                        # Writing the stacks is file IO; keep it off the event loop
+                        record["profile"] = await asyncio.to_thread(profiler.dump, trace, end)
+                    slow_traces.append(record)
+                    logger.warning(f"🐢 Slow request {trace.method} {trace.path}: {total * 1e3:.0f} ms")
@@ -0,0 +1,477 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger("quantum-tracker")
+
+# -------------------------
+# Configuration
+# -------------------------
+JOB_STORE_PATH = os.getenv(
+    "JOB_STORE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "jobs.sqlite3")
+)
+JOB_SYNC_ENABLED = os.getenv("JOB_SYNC_ENABLED", "true").lower() == "true"
+JOB_SYNC_INTERVAL = float(os.getenv("JOB_SYNC_INTERVAL", "15"))
+# Newest jobs fetched by the first sync of an empty store; later syncs fetch everything since
+JOB_SYNC_BACKFILL = int(os.getenv("JOB_SYNC_BACKFILL", "1000"))
+JOB_SYNC_PAGE_SIZE = int(os.getenv("JOB_SYNC_PAGE_SIZE", "100"))
+# Workers that are not the sync leader poll the shared store this often (local reads only)
+JOB_FOLLOW_INTERVAL = float(os.getenv("JOB_FOLLOW_INTERVAL", "1"))
+# Re-read a little before the watermark so jobs with skewed timestamps are not missed
+JOB_SYNC_OVERLAP = timedelta(seconds=60)
+
+# Jobs in these states never change again (see STATUS_MAP in backend.py)
+TERMINAL_STATUSES = {"COMPLETED", "ERROR", "CANCELLED", "CANCELED"}
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[float]:
+    """Converts the 'submitted' string emitted by job_to_dict into a UTC epoch"""
+    if not value or value == "N/A":
+        return None
+    try:
+        return datetime.strptime(value, DATE_FORMAT).replace(tzinfo=timezone.utc).timestamp()
+    except ValueError:
+        return None
+
+
+def json_default(obj: Any):
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if hasattr(obj, "__dict__"):
+        return {k: v for k, v in vars(obj).items() if not k.startswith("_")}
+    return str(obj)
+
+
+class JobStore:
+    """SQLite-backed store of normalized (lite) job records"""
+
+    def __init__(self, path: str = JOB_STORE_PATH):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    backend TEXT,
+                    user TEXT,
+                    created_ts REAL,
+                    terminal INTEGER NOT NULL DEFAULT 0,
+                    payload TEXT NOT NULL,
+                    updated_ts REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_jobs_order ON jobs (IFNULL(created_ts, 0) DESC, job_id DESC)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, IFNULL(created_ts, 0) DESC, job_id DESC)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_terminal ON jobs (terminal)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_updated ON jobs (updated_ts)")
+            # Store version of each job's last change, and of jobs deleted upstream, for ?since= deltas
+            columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            if "seq" not in columns:
+                self._conn.execute("ALTER TABLE jobs ADD COLUMN seq INTEGER NOT NULL DEFAULT 0")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_seq ON jobs (seq)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS tombstones (job_id TEXT PRIMARY KEY, seq INTEGER NOT NULL)"
+            )
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            # Identifies this store in cursors and ETags, so a recreated store never matches old ones
+            self._conn.execute(
+                "INSERT OR IGNORE INTO meta (key, value) VALUES ('store_id', ?)", (uuid.uuid4().hex[:12],)
+            )
+        self.store_id = self.get_meta("store_id")
+
+    # -------------------------
+    # Writes
+    # -------------------------
+    def _next_version(self) -> int:
+        version = self._version() + 1
+        self._conn.execute(
+            "INSERT INTO meta (key, value) VALUES ('version', ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (str(version),),
+        )
+        return version
+
+    def upsert_many(self, records: Iterable[dict]) -> List[dict]:
+        """Stores job records and returns every one that is new or changed, each with its
+        previous_status (None when new) so listeners can pick out status transitions.
+
+        Rows whose payload is unchanged are left alone; the others are stamped with one new
+        store version, which is what ?since= cursors and ETags are derived from.
+        """
+        now = time.time()
+        changed = []
+        version = None
+        with self._lock, self._conn:
+            for record in records:
+                job_id = record.get("job_id")
+                if not job_id or "error" in record:
+                    continue
+                status = record.get("status") or "UNKNOWN"
+                payload = json.dumps(record, default=json_default)
+                row = self._conn.execute("SELECT status, payload FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+                if row and row["payload"] == payload:
+                    continue
+                previous = row["status"] if row else None
+                if version is None:
+                    version = self._next_version()
+                self._conn.execute(
+                    """
+                    INSERT INTO jobs (job_id, status, backend, user, created_ts, terminal, payload, updated_ts, seq)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(job_id) DO UPDATE SET
+                        status = excluded.status,
+                        backend = excluded.backend,
+                        user = excluded.user,
+                        created_ts = excluded.created_ts,
+                        terminal = excluded.terminal,
+                        payload = excluded.payload,
+                        updated_ts = excluded.updated_ts,
+                        seq = excluded.seq
+                    """,
+                    (
+                        job_id,
+                        status,
+                        record.get("backend"),
+                        record.get("user"),
+                        parse_timestamp(record.get("submitted")),
+                        int(status in TERMINAL_STATUSES),
+                        payload,
+                        now,
+                        version,
+                    ),
+                )
+                if not row:
+                    self._conn.execute("DELETE FROM tombstones WHERE job_id = ?", (job_id,))
+                changed.append({**record, "previous_status": previous, "seq": version})
+        return changed
+
+    def delete_many(self, job_ids: Iterable[str]) -> List[str]:
+        """Removes jobs deleted upstream, leaving tombstones for ?since= deltas"""
+        deleted = []
+        with self._lock, self._conn:
+            for job_id in job_ids:
+                if not self._conn.execute("SELECT 1 FROM jobs WHERE job_id = ?", (job_id,)).fetchone():
+                    continue
+                if not deleted:
+                    version = self._next_version()
+                self._conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+                self._conn.execute(
+                    "INSERT INTO tombstones (job_id, seq) VALUES (?, ?) ON CONFLICT(job_id) DO UPDATE SET seq = excluded.seq",
+                    (job_id, version),
+                )
+                deleted.append(job_id)
+        return deleted
+
+    def set_meta(self, key: str, value: str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, value),
+            )
+
+    # -------------------------
+    # Reads
+    # -------------------------
+    def _version(self) -> int:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        return int(row["value"]) if row else 0
+
+    def deleted_since(self, version: int) -> List[Tuple[int, str]]:
+        """(seq, job_id) of the jobs deleted after version"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, job_id FROM tombstones WHERE seq > ? ORDER BY seq", (version,)
+            ).fetchall()
+        return [(row["seq"], row["job_id"]) for row in rows]
+
+    def version(self) -> int:
+        """Increases with every write that changes a job, across all workers sharing the store"""
+        with self._lock:
+            return self._version()
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    def list_jobs(self, limit: Optional[int] = 20, status: Optional[str] = None) -> List[dict]:
+        return [json.loads(payload) for _, _, payload in self.page(limit=limit, status=status)]
+
+    def page(
+        self,
+        limit: Optional[int] = 20,
+        status: Optional[str] = None,
+        before: Optional[Tuple[float, str]] = None,
+    ) -> List[Tuple[float, str, str]]:
+        """Rows of (created_ts, job_id, payload JSON) newest first, strictly after a keyset cursor"""
+        query = "SELECT created_ts, job_id, payload FROM jobs"
+        clauses, params = [], []
+        if status:
+            clauses.append("status = ?")
+            params.append(status.upper())
+        if before:
+            clauses.append("(IFNULL(created_ts, 0), job_id) < (?, ?)")
+            params.extend(before)
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY IFNULL(created_ts, 0) DESC, job_id DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [(row["created_ts"] or 0, row["job_id"], row["payload"]) for row in rows]
+
+    def changes_since(
+        self, version: int, limit: int, status: Optional[str] = None
+    ) -> Optional[Tuple[int, List[dict], List[str]]]:
+        """(current version, jobs changed or created after version, ids to drop) for a ?since= delta.
+
+        Ids to drop are jobs deleted upstream and, with a status filter, changed jobs that no
+        longer match it. None when more than limit jobs changed: a full listing is cheaper.
+        """
+        with self._lock:
+            current = self._version()
+            rows = self._conn.execute(
+                "SELECT status, job_id, payload FROM jobs WHERE seq > ? "
+                "ORDER BY IFNULL(created_ts, 0) DESC, job_id DESC LIMIT ?",
+                (version, limit + 1),
+            ).fetchall()
+            if len(rows) > limit:
+                return None
+            removed = [
+                row["job_id"]
+                for row in self._conn.execute("SELECT job_id FROM tombstones WHERE seq > ?", (version,))
+            ]
+        changed = []
+        for row in rows:
+            if status and row["status"] != status.upper():
+                removed.append(row["job_id"])
+            else:
+                changed.append(json.loads(row["payload"]))
+        return current, changed, removed
+
+    def get_job(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT payload FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return json.loads(row["payload"]) if row else None
+
+    def written_since(self, version: int) -> List[Tuple[int, dict]]:
+        """(seq, record) for rows written after version, oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, payload FROM jobs WHERE seq > ? ORDER BY seq", (version,)
+            ).fetchall()
+        return [(row["seq"], json.loads(row["payload"])) for row in rows]
+
+    def statuses(self) -> dict:
+        with self._lock:
+            rows = self._conn.execute("SELECT job_id, status FROM jobs").fetchall()
+        return {row["job_id"]: row["status"] for row in rows}
+
+    def synced_within(self, max_age: float) -> bool:
+        """True if some worker completed a sync into this store less than max_age seconds ago"""
+        last_sync = self.get_meta("last_sync")
+        return last_sync is not None and time.time() - float(last_sync) < max_age
+
+    def pending_job_ids(self) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT job_id FROM jobs WHERE terminal = 0").fetchall()
+        return [row["job_id"] for row in rows]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def is_job_not_found(error: Any) -> bool:
+    """True for the SDK's RuntimeJobNotFound (imported lazily: the store itself does not need the SDK)"""
+    from qiskit_ibm_runtime.exceptions import RuntimeJobNotFound
+
+    return isinstance(error, RuntimeJobNotFound)
+
+
+class JobSync:
+    """Background loop that mirrors upstream jobs into a JobStore incrementally"""
+
+    def __init__(
+        self,
+        store: JobStore,
+        service: Any,
+        convert: Callable[[Any], Awaitable[dict]],
+        run_blocking: Callable[..., Awaitable[Any]],
+        interval: float = JOB_SYNC_INTERVAL,
+        backfill: int = JOB_SYNC_BACKFILL,
+        page_size: int = JOB_SYNC_PAGE_SIZE,
+    ):
+        self.store = store
+        self.service = service
+        self.convert = convert
+        self.run_blocking = run_blocking
+        self.interval = interval
+        self.backfill = backfill
+        self.page_size = page_size
+        self.last_sync: Optional[float] = None
+        self.listeners: List[Callable[[List[dict]], None]] = []
+        # Called with the same changes, except the backfill that fills an empty store:
+        # those jobs are not transitions anyone watched happen. Records carry previous_status;
+        # listeners that only want status transitions compare it themselves
+        self.transition_listeners: List[Callable[[List[dict]], None]] = []
+        # Called with the ids of jobs deleted upstream and dropped from the store
+        self.removal_listeners: List[Callable[[List[str]], None]] = []
+
+    @property
+    def ready(self) -> bool:
+        """True once the store holds at least one complete sync"""
+        return self.last_sync is not None
+
+    def _watermark(self) -> Optional[datetime]:
+        value = self.store.get_meta("created_watermark")
+        return datetime.fromisoformat(value) if value else None
+
+    async def _fetch_new_jobs(self) -> list:
+        """Jobs created since the watermark, all of them however many arrived; only the first
+        sync (no watermark yet) stops at the newest `backfill` jobs"""
+        watermark = self._watermark()
+        created_after = watermark - JOB_SYNC_OVERLAP if watermark else None
+        # The watermark moves to the newest job fetched, so anything left unfetched past it
+        # would never be read; created_after is what bounds the paging
+        limit = self.backfill if watermark is None else None
+        jobs, skip = [], 0
+        while limit is None or len(jobs) < limit:
+            page = await self.run_blocking(
+                self.service.jobs, limit=self.page_size, skip=skip, created_after=created_after
+            )
+            jobs.extend(page)
+            if len(page) < self.page_size:
+                break
+            skip += len(page)
+        return jobs[:limit]
+
+    async def _fetch_changed_jobs(self, seen: set) -> list:
+        """Re-reads jobs the store still holds as QUEUED/RUNNING"""
+        pending_ids = [job_id for job_id in self.store.pending_job_ids() if job_id not in seen]
+        if not pending_ids:
+            return []
+        results = await asyncio.gather(
+            *[self.run_blocking(self.service.job, job_id) for job_id in pending_ids], return_exceptions=True
+        )
+        # Only RuntimeJobNotFound means the job was deleted upstream; auth, instance or
+        # transport errors leave the job alone until a later sync can read it
+        missing = [job_id for job_id, job in zip(pending_ids, results) if is_job_not_found(job)]
+        if missing:
+            deleted = await asyncio.to_thread(self.store.delete_many, missing)
+            logger.info(f"🗑️ Job sync: {len(deleted)} job(s) deleted upstream")
+            if deleted:
+                for listener in self.removal_listeners:
+                    listener(deleted)
+        return [job for job in results if not isinstance(job, BaseException)]
+
+    async def sync_once(self) -> List[dict]:
+        new_jobs = await self._fetch_new_jobs()
+        records = await asyncio.gather(*[self.convert(job) for job in new_jobs])
+        seen = {record.get("job_id") for record in records}
+        refreshed = await self._fetch_changed_jobs(seen)
+        records += await asyncio.gather(*[self.convert(job) for job in refreshed])
+
+        backfill = self.store.count() == 0
+        changed = await asyncio.to_thread(self.store.upsert_many, records)
+        created = [ts for ts in (parse_timestamp(r.get("submitted")) for r in records) if ts]
+        if created:
+            newest = datetime.fromtimestamp(max(created), tz=timezone.utc)
+            watermark = self._watermark()
+            if not watermark or newest > watermark:
+                self.store.set_meta("created_watermark", newest.isoformat())
+        self.last_sync = time.time()
+        self.store.set_meta("last_sync", str(self.last_sync))
+        if changed:
+            logger.info(f"🔄 Job sync: {len(changed)} new or changed job(s), {self.store.count()} stored")
+            for listener in self.listeners:
+                listener(changed)
+            if not backfill:
+                for listener in self.transition_listeners:
+                    listener(changed)
+        return changed
+
+    async def run(self):
+        while True:
+            try:
+                await self.sync_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Job sync failed: {e}")
+            await asyncio.sleep(self.interval)
+
+
+class StoreFollower:
+    """Tails a JobStore written by another worker's JobSync and reports changes the same way"""
+
+    def __init__(self, store: JobStore, interval: float = JOB_FOLLOW_INTERVAL):
+        self.store = store
+        self.interval = interval
+        self.listeners: List[Callable[[List[dict]], None]] = []
+        self.transition_listeners: List[Callable[[List[dict]], None]] = []
+        self.removal_listeners: List[Callable[[List[str]], None]] = []
+        self._statuses = store.statuses()
+        # Rows and tombstones are tailed by store version, which orders every worker's writes
+        self._seq = self._deleted_seq = store.version()
+
+    async def follow_once(self) -> List[dict]:
+        rows = await asyncio.to_thread(self.store.written_since, self._seq)
+        # Rows arriving in a store this worker saw empty are the leader's backfill
+        backfill = not self._statuses
+        changed = []
+        for seq, record in rows:
+            self._seq = max(self._seq, seq)
+            previous = self._statuses.get(record.get("job_id"))
+            self._statuses[record.get("job_id")] = record.get("status")
+            changed.append({**record, "previous_status": previous, "seq": seq})
+        if changed:
+            for listener in self.listeners:
+                listener(changed)
+            if not backfill:
+                for listener in self.transition_listeners:
+                    listener(changed)
+        deleted = await asyncio.to_thread(self.store.deleted_since, self._deleted_seq)
+        if deleted:
+            self._deleted_seq = max(seq for seq, _ in deleted)
+            removed = [job_id for _, job_id in deleted if self._statuses.pop(job_id, None) is not None]
+            if removed:
+                for listener in self.removal_listeners:
+                    listener(removed)
+        return changed
+
+    async def run(self):
+        while True:
+            try:
+                await self.follow_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Job store follow failed: {e}")
+            await asyncio.sleep(self.interval)
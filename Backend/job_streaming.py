@@ -0,0 +1,96 @@
+import asyncio
+import base64
+import json
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Optional, Tuple
+
+from job_store import JobStore, json_default
+
+# Rows fetched from the store per query while streaming, so memory stays flat
+STREAM_CHUNK_SIZE = 200
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+# -------------------------
+# Cursors
+# -------------------------
+# Opaque to clients: "s" cursors are store keysets (created_ts, job_id), "o" cursors
+# are upstream offsets used when the store is not ready yet
+def encode_cursor(kind: str, value: Any) -> str:
+    return base64.urlsafe_b64encode(json.dumps([kind, value]).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Tuple[Optional[str], Any]:
+    """(kind, value): an offset for "o", a (created_ts, job_id) keyset for "s"; ValueError otherwise"""
+    if not cursor:
+        return None, None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        kind, value = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if kind == "o" and type(value) is int and value >= 0:
+        return kind, value
+    if (
+        kind == "s" and isinstance(value, list) and len(value) == 2
+        and type(value[0]) in (int, float) and isinstance(value[1], str)
+    ):
+        return kind, (value[0], value[1])
+    raise ValueError("Invalid cursor")
+
+
+def ndjson_line(record: dict) -> str:
+    return json.dumps(record, default=json_default) + "\n"
+
+
+# -------------------------
+# Producers
+# -------------------------
+async def stream_from_store(
+    store: JobStore, limit: int, status: Optional[str], before: Optional[Tuple[float, str]]
+) -> AsyncIterator[str]:
+    """Streams stored payloads as-is (they are already JSON) in keyset-paged chunks"""
+    sent, last = 0, before
+    while sent < limit:
+        want = min(STREAM_CHUNK_SIZE, limit - sent)
+        rows = await asyncio.to_thread(store.page, want, status, last)
+        for created_ts, job_id, payload in rows:
+            yield payload + "\n"
+            last = (created_ts, job_id)
+        sent += len(rows)
+        if len(rows) < want:
+            # Store exhausted: there is no next page
+            yield ndjson_line({"next_cursor": None})
+            return
+    yield ndjson_line({"next_cursor": encode_cursor("s", list(last)) if last else None})
+
+
+async def convert_as_completed(
+    items: Iterable[Any], convert: Callable[[Any], Awaitable[dict]], window: int
+) -> AsyncIterator[dict]:
+    """Yields convert(item) results in completion order, with at most `window` in flight"""
+    iterator = iter(items)
+    pending = set()
+    try:
+        for item in iterator:
+            pending.add(asyncio.ensure_future(convert(item)))
+            if len(pending) >= window:
+                break
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+                item = next(iterator, None)
+                if item is not None:
+                    pending.add(asyncio.ensure_future(convert(item)))
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def stream_converted(
+    jobs: list, convert: Callable[[Any], Awaitable[dict]], window: int, next_offset: Optional[int]
+) -> AsyncIterator[str]:
+    async for record in convert_as_completed(jobs, convert, window):
+        yield ndjson_line(record)
+    yield ndjson_line({"next_cursor": encode_cursor("o", next_offset) if next_offset is not None else None})
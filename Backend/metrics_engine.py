@@ -0,0 +1,153 @@
+import time
+from collections import Counter
+from typing import Dict, Iterable, Optional, Tuple
+
+from instrumentation import api_speed_ms
+from job_store import parse_timestamp
+
+# Rolling windows served by /api/metrics?window=..., in seconds
+WINDOWS = {"hour": 3600, "day": 86400, "week": 7 * 86400}
+BUCKET_SECONDS = 300
+
+LIVE_STATUSES = ("RUNNING", "QUEUED")
+
+
+class _Aggregate:
+    """Running totals for one population of jobs (all jobs, or one time bucket)"""
+
+    __slots__ = ("statuses", "backends", "users", "completed_elapsed", "total")
+
+    def __init__(self):
+        self.statuses: Counter = Counter()
+        self.backends: Counter = Counter()
+        self.users: Counter = Counter()
+        self.completed_elapsed = 0.0
+        self.total = 0
+
+    def apply(self, contribution: tuple, sign: int):
+        status, backend, user, elapsed, _ = contribution
+        self.total += sign
+        self.statuses[status] += sign
+        self.backends[(backend, status)] += sign
+        if user:
+            self.users[user] += sign
+            if self.users[user] <= 0:
+                del self.users[user]
+        if status == "COMPLETED":
+            self.completed_elapsed += sign * elapsed
+
+    def merge(self, other: "_Aggregate", sign: int = 1):
+        self.total += sign * other.total
+        for mine, theirs in ((self.statuses, other.statuses), (self.backends, other.backends), (self.users, other.users)):
+            for key, count in theirs.items():
+                mine[key] += sign * count
+                if mine[key] <= 0:
+                    del mine[key]
+        self.completed_elapsed += sign * other.completed_elapsed
+
+    def summary(self) -> dict:
+        completed = self.statuses.get("COMPLETED", 0)
+        by_backend: Dict[str, Dict[str, int]] = {}
+        for (backend, status), count in self.backends.items():
+            if count:
+                by_backend.setdefault(backend or "Unknown", {})[status] = count
+        return {
+            "total_jobs": self.total,
+            "live_jobs": sum(self.statuses.get(s, 0) for s in LIVE_STATUSES),
+            "avg_wait_time": self.completed_elapsed / completed if completed else 0,
+            "success_rate": round((completed / self.total) * 100, 2) if self.total else 0,
+            "open_sessions": len(self.users),
+            "by_status": {status: count for status, count in self.statuses.items() if count},
+            "by_backend": by_backend,
+        }
+
+
+class MetricsEngine:
+    """Keeps /api/metrics aggregates current as job records are ingested or change state"""
+
+    def __init__(self, bucket_seconds: int = BUCKET_SECONDS):
+        self.bucket_seconds = bucket_seconds
+        self.totals = _Aggregate()
+        self._buckets: Dict[int, _Aggregate] = {}
+        self._contributions: Dict[str, Tuple[tuple, Optional[int]]] = {}
+        # Each window is a running aggregate over buckets >= its first bucket; buckets are
+        # subtracted as they age out, so serving a window never re-scans history
+        self._windows: Dict[str, Tuple[_Aggregate, int]] = {
+            name: (_Aggregate(), self._first_bucket(seconds)) for name, seconds in WINDOWS.items()
+        }
+
+    def _first_bucket(self, seconds: float, now: Optional[float] = None) -> int:
+        return int(((now or time.time()) - seconds) // self.bucket_seconds)
+
+    @staticmethod
+    def _contribution(record: dict) -> tuple:
+        return (
+            record.get("status") or "UNKNOWN",
+            record.get("backend"),
+            record.get("user"),
+            float(record.get("elapsed_time") or 0),
+            parse_timestamp(record.get("submitted")),
+        )
+
+    def _apply(self, contribution: tuple, bucket: Optional[int], sign: int):
+        self.totals.apply(contribution, sign)
+        if bucket is None:
+            return
+        if sign > 0:
+            self._buckets.setdefault(bucket, _Aggregate())
+        if bucket in self._buckets:
+            self._buckets[bucket].apply(contribution, sign)
+        for aggregate, first in self._windows.values():
+            if bucket >= first:
+                aggregate.apply(contribution, sign)
+
+    def ingest(self, record: dict):
+        job_id = record.get("job_id")
+        if not job_id or "error" in record:
+            return
+        contribution = self._contribution(record)
+        previous = self._contributions.get(job_id)
+        if previous:
+            if previous[0] == contribution:
+                return
+            self._apply(*previous, -1)
+
+        created = contribution[4]
+        bucket = int(created // self.bucket_seconds) if created is not None else None
+        self._apply(contribution, bucket, +1)
+        self._contributions[job_id] = (contribution, bucket)
+
+    def ingest_many(self, records: Iterable[dict]):
+        for record in records:
+            self.ingest(record)
+
+    def remove_many(self, job_ids: Iterable[str]):
+        """Drops jobs deleted upstream from every aggregate"""
+        for job_id in job_ids:
+            previous = self._contributions.pop(job_id, None)
+            if previous:
+                self._apply(*previous, -1)
+
+    def _advance(self, now: Optional[float] = None):
+        """Moves each window forward, subtracting buckets that fell out of it"""
+        for name, seconds in WINDOWS.items():
+            aggregate, first = self._windows[name]
+            new_first = self._first_bucket(seconds, now)
+            for bucket in range(first, new_first):
+                if bucket in self._buckets:
+                    aggregate.merge(self._buckets[bucket], sign=-1)
+            self._windows[name] = (aggregate, max(first, new_first))
+        # Buckets older than the widest window are no longer needed
+        oldest = min(first for _, first in self._windows.values())
+        for bucket in [b for b in self._buckets if b < oldest]:
+            del self._buckets[bucket]
+
+    def snapshot(self, window: Optional[str] = None) -> dict:
+        self._advance()
+        if window:
+            return {**self._windows[window][0].summary(), "window": window, "api_speed": api_speed_ms()}
+        return {
+            **self.totals.summary(),
+            "windows": {name: aggregate.summary() for name, (aggregate, _) in self._windows.items()},
+            "api_speed": api_speed_ms(),
+        }
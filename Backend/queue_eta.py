@@ -0,0 +1,223 @@
+import bisect
+import math
+import os
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from job_store import parse_timestamp
+
+# -------------------------
+# Configuration
+# -------------------------
+ETA_COMPRESSION = int(os.getenv("ETA_COMPRESSION", "100"))
+# A stratum answers only once it has seen this many jobs; otherwise a coarser one is used
+ETA_MIN_SAMPLES = int(os.getenv("ETA_MIN_SAMPLES", "20"))
+# Queue depth observations kept per backend to look up the depth a job was submitted into
+ETA_DEPTH_HISTORY_SECONDS = float(os.getenv("ETA_DEPTH_HISTORY_SECONDS", str(7 * 86400)))
+# A depth sample older than this at submission time is too stale to stratify by
+ETA_DEPTH_MAX_GAP = 600
+
+HOUR_BLOCK = 3
+# Upper bounds of the pending_jobs depth buckets; deeper queues fall in the last bucket
+DEPTH_EDGES = (0, 5, 20, 100, 500)
+QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9, 0.95)
+
+
+class TDigest:
+    """Merging t-digest: a few hundred centroids summarizing any number of samples,
+    with tight quantile error at the tails (k1 scale function)"""
+
+    __slots__ = ("compression", "means", "weights", "count", "min", "max", "_buffer")
+
+    def __init__(self, compression: int = ETA_COMPRESSION):
+        self.compression = compression
+        self.means: List[float] = []
+        self.weights: List[float] = []
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._buffer: List[float] = []
+
+    def add(self, value: float):
+        self._buffer.append(value)
+        self.count += 1
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if len(self._buffer) >= 4 * self.compression:
+            self._compress()
+
+    def _k(self, q: float) -> float:
+        return self.compression / (2 * math.pi) * math.asin(2 * min(max(q, 0.0), 1.0) - 1)
+
+    def _compress(self):
+        if not self._buffer:
+            return
+        points = sorted(list(zip(self.means, self.weights)) + [(value, 1.0) for value in self._buffer])
+        self._buffer = []
+        means, weights = [points[0][0]], [points[0][1]]
+        cumulative, k_left = 0.0, self._k(0.0)
+        for mean, weight in points[1:]:
+            if self._k((cumulative + weights[-1] + weight) / self.count) - k_left <= 1:
+                merged = weights[-1] + weight
+                means[-1] += (mean - means[-1]) * weight / merged
+                weights[-1] = merged
+            else:
+                cumulative += weights[-1]
+                k_left = self._k(cumulative / self.count)
+                means.append(mean)
+                weights.append(weight)
+        self.means, self.weights = means, weights
+
+    def quantile(self, q: float) -> Optional[float]:
+        self._compress()
+        if not self.count:
+            return None
+        if len(self.means) == 1:
+            return self.means[0]
+        index = q * self.count
+        if index < self.weights[0] / 2:
+            return self.min + (self.means[0] - self.min) * index / (self.weights[0] / 2)
+        cumulative = self.weights[0] / 2
+        for i in range(len(self.means) - 1):
+            step = (self.weights[i] + self.weights[i + 1]) / 2
+            if cumulative + step > index:
+                return self.means[i] + (self.means[i + 1] - self.means[i]) * (index - cumulative) / step
+            cumulative += step
+        tail = self.weights[-1] / 2
+        return self.means[-1] + (self.max - self.means[-1]) * min(1.0, (index - cumulative) / tail)
+
+
+def depth_bucket(pending_jobs: Optional[int]) -> Optional[str]:
+    if pending_jobs is None:
+        return None
+    i = bisect.bisect_left(DEPTH_EDGES, pending_jobs)
+    if i == len(DEPTH_EDGES):
+        return f"{DEPTH_EDGES[-1] + 1}+"
+    low = DEPTH_EDGES[i - 1] + 1 if i else 0
+    return str(low) if low == DEPTH_EDGES[i] else f"{low}-{DEPTH_EDGES[i]}"
+
+
+def hour_block(timestamp: float) -> str:
+    start = datetime.fromtimestamp(timestamp, timezone.utc).hour // HOUR_BLOCK * HOUR_BLOCK
+    return f"{start:02d}-{start + HOUR_BLOCK:02d}"
+
+
+class QueueETA:
+    """Learns per-backend queue wait distributions from ingested jobs and answers ETAs from sketches.
+
+    Every job that reached RUNNING adds its wait to four digests of its backend:
+    overall, by UTC time-of-day block, by the queue depth it was submitted into, and
+    by both. Depth comes from the pending_jobs the status poller observed at submission.
+    """
+
+    def __init__(self, compression: int = ETA_COMPRESSION, min_samples: int = ETA_MIN_SAMPLES):
+        self.compression = compression
+        self.min_samples = min_samples
+        self._digests: Dict[Tuple[str, Optional[str], Optional[str]], TDigest] = {}
+        # job_id -> strata it was added to, and each stratum's waits by job_id, so a deleted
+        # job can be taken back out by rebuilding only the digests it was in
+        self._samples: Dict[str, tuple] = {}
+        self._waits: Dict[Tuple[str, Optional[str], Optional[str]], Dict[str, float]] = {}
+        # backend -> (observation times, pending_jobs): parallel lists bisected by time
+        self._depths: Dict[str, Tuple[List[float], List[int]]] = {}
+
+    # -------------------------
+    # Ingestion
+    # -------------------------
+    def observe_depths(self, snapshot: Dict[str, dict], now: Optional[float] = None):
+        """Status poller listener: records each backend's pending_jobs over time"""
+        now = now or time.time()
+        for name, fields in snapshot.items():
+            pending = fields.get("pending_jobs")
+            if pending is None:
+                continue
+            times, depths = self._depths.setdefault(name, ([], []))
+            times.append(now)
+            depths.append(int(pending))
+            stale = bisect.bisect_left(times, now - ETA_DEPTH_HISTORY_SECONDS)
+            if stale:
+                del times[:stale]
+                del depths[:stale]
+
+    def depth_at(self, backend: str, timestamp: float) -> Optional[int]:
+        times, depths = self._depths.get(backend, ((), ()))
+        i = bisect.bisect_right(times, timestamp) - 1
+        if i < 0 or timestamp - times[i] > ETA_DEPTH_MAX_GAP:
+            return None
+        return depths[i]
+
+    def ingest(self, record: dict):
+        job_id = record.get("job_id")
+        if not job_id or job_id in self._samples or "error" in record:
+            return
+        pending = (record.get("status_and_usage") or {}).get("pending_time")
+        submitted = parse_timestamp(record.get("submitted"))
+        if not pending or not pending.endswith("s") or submitted is None or not record.get("backend"):
+            return
+        wait = float(pending[:-1])
+        if wait < 0:
+            return
+        backend = record["backend"]
+        hour = hour_block(submitted)
+        depth = depth_bucket(self.depth_at(backend, submitted))
+        strata = [(backend, None, None), (backend, hour, None)]
+        if depth is not None:
+            strata += [(backend, None, depth), (backend, hour, depth)]
+        self._samples[job_id] = tuple(strata)
+        for key in strata:
+            self._waits.setdefault(key, {})[job_id] = wait
+            digest = self._digests.get(key)
+            if digest is None:
+                digest = self._digests[key] = TDigest(self.compression)
+            digest.add(wait)
+
+    def ingest_many(self, records: Iterable[dict]):
+        for record in records:
+            self.ingest(record)
+
+    def remove_many(self, job_ids: Iterable[str]):
+        """Drops jobs deleted upstream; digests cannot subtract, so the strata they were in are
+        rebuilt from their own remaining waits"""
+        affected = set()
+        for job_id in job_ids:
+            for key in self._samples.pop(job_id, ()):
+                self._waits[key].pop(job_id, None)
+                affected.add(key)
+        for key in affected:
+            waits = self._waits[key]
+            if not waits:
+                del self._waits[key]
+                del self._digests[key]
+                continue
+            digest = self._digests[key] = TDigest(self.compression)
+            for wait in waits.values():
+                digest.add(wait)
+
+    # -------------------------
+    # Prediction
+    # -------------------------
+    def predict(self, backend: str, pending_jobs: Optional[int], now: Optional[float] = None) -> dict:
+        """Quantiles of the expected wait from the most specific stratum with enough samples"""
+        hour = hour_block(now or time.time())
+        depth = depth_bucket(pending_jobs)
+        for key in ((backend, hour, depth), (backend, None, depth), (backend, hour, None), (backend, None, None)):
+            if depth is None and key[2] is not None:
+                continue
+            digest = self._digests.get(key)
+            if digest is None or (digest.count < self.min_samples and key[1:] != (None, None)):
+                continue
+            return {
+                "stratum": {"hour_utc": key[1], "pending_jobs": key[2]},
+                "samples": digest.count,
+                "eta_seconds": {f"p{round(q * 100)}": round(digest.quantile(q), 2) for q in QUANTILES},
+            }
+        return {"stratum": None, "samples": 0, "eta_seconds": None}
+
+    def stats(self) -> dict:
+        return {
+            "jobs": len(self._samples),
+            "digests": len(self._digests),
+            "centroids": sum(len(d.means) + len(d._buffer) for d in self._digests.values()),
+            "depth_samples": sum(len(times) for times, _ in self._depths.values()),
+        }
@@ -0,0 +1,113 @@
+import math
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# -------------------------
+# Configuration
+# -------------------------
+# Turnaround at which the speed factor halves: a backend 1h away scores half of an idle one
+RECOMMEND_TURNAROUND_SCALE = float(os.getenv("RECOMMEND_TURNAROUND_SCALE", "3600"))
+# Queue seconds per pending job assumed when no backend has learned wait sketches yet
+RECOMMEND_SECONDS_PER_PENDING_JOB = float(os.getenv("RECOMMEND_SECONDS_PER_PENDING_JOB", "60"))
+
+# Rough gate durations (us) used to turn T1/T2 into a decoherence penalty
+SINGLE_QUBIT_GATE_US = 0.05
+TWO_QUBIT_GATE_US = 0.5
+
+MEDIAN_FIELDS = ("T1", "T2", "readout_error", "2q_error", "sx_error")
+
+
+def circuit_profile(
+    num_qubits: int, two_qubit_gates: int = 0, single_qubit_gates: int = 0, measurements: Optional[int] = None
+) -> dict:
+    return {
+        "num_qubits": num_qubits,
+        "two_qubit_gates": two_qubit_gates,
+        "single_qubit_gates": single_qubit_gates,
+        "measurements": num_qubits if measurements is None else measurements,
+    }
+
+
+def qasm_profile(text: str) -> dict:
+    """Qubit count and gate mix of an OpenQASM circuit"""
+    from batch_submit import parse_qasm
+
+    circuit = parse_qasm(text)
+    arity = [len(instruction.qubits) for instruction in circuit.data if instruction.operation.name != "barrier"]
+    measurements = sum(1 for instruction in circuit.data if instruction.operation.name == "measure")
+    return circuit_profile(
+        circuit.num_qubits,
+        two_qubit_gates=sum(1 for n in arity if n >= 2),
+        single_qubit_gates=sum(1 for n in arity if n == 1) - measurements,
+        measurements=measurements,
+    )
+
+
+def rank_backends(
+    candidates: List[dict], circuit: dict, fidelity_weight: float = 1.0, turnaround_weight: float = 1.0
+) -> Dict[str, list]:
+    """Scores every candidate at once; returns the ranked eligible ones and the excluded ones with reasons.
+
+    Each candidate carries name, qubit_count, operational, pending_jobs, the calibration
+    medians of MEDIAN_FIELDS and, when sketches exist, eta_seconds (median queue wait).
+    score = fidelity ** fidelity_weight * speed ** turnaround_weight, where fidelity is the
+    estimated success probability of the circuit and speed = 1 / (1 + turnaround / scale).
+    """
+    if not candidates:
+        return {"ranked": [], "excluded": []}
+
+    def column(key: str) -> np.ndarray:
+        return np.array([c.get(key) if c.get(key) is not None else np.nan for c in candidates], dtype=float)
+
+    qubits = column("qubit_count")
+    operational = np.array([bool(c.get("operational")) for c in candidates])
+    pending = column("pending_jobs")
+    eta = column("eta_seconds")
+    t1, t2, readout, two_q, one_q = (column(field) for field in MEDIAN_FIELDS)
+
+    # Calibration: log success probability from gate and readout errors plus T1/T2 decay
+    # over the gate time the circuit spends on its qubits
+    busy_us = (
+        circuit["single_qubit_gates"] * SINGLE_QUBIT_GATE_US + 2 * circuit["two_qubit_gates"] * TWO_QUBIT_GATE_US
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_fidelity = (
+            circuit["two_qubit_gates"] * np.log1p(-np.nan_to_num(two_q))
+            + circuit["single_qubit_gates"] * np.log1p(-np.nan_to_num(one_q))
+            + circuit["measurements"] * np.log1p(-readout)
+            - busy_us * (1 / t1 + 1 / t2)
+        )
+
+        # Turnaround: learned median wait, else queue depth times the fleet's seconds per pending job
+        per_job = eta / (pending + 1)
+        rate = np.nanmedian(per_job) if np.isfinite(per_job).any() else RECOMMEND_SECONDS_PER_PENDING_JOB
+        turnaround = np.where(np.isfinite(eta), eta, np.nan_to_num(pending) * rate)
+        log_speed = -np.log1p(turnaround / RECOMMEND_TURNAROUND_SCALE)
+
+    score = fidelity_weight * log_fidelity + turnaround_weight * log_speed
+    reasons = np.full(len(candidates), "", dtype=object)
+    reasons[~np.isfinite(readout) | ~np.isfinite(t1) | ~np.isfinite(t2)] = "no calibration data"
+    reasons[~(qubits >= circuit["num_qubits"])] = "too few qubits"
+    reasons[~operational] = "not operational"
+    eligible = reasons == ""
+    order = [i for i in np.argsort(-np.where(eligible, score, -np.inf), kind="stable") if eligible[i]]
+
+    ranked = [
+        {
+            "name": candidates[i]["name"],
+            "score": round(math.exp(score[i]), 6),
+            "estimated_fidelity": round(math.exp(log_fidelity[i]), 6),
+            "expected_wait_seconds": round(float(turnaround[i]), 1),
+            "wait_source": "eta" if np.isfinite(eta[i]) else "queue_depth",
+            "pending_jobs": candidates[i].get("pending_jobs"),
+            "qubit_count": candidates[i].get("qubit_count"),
+            "calibration": {field: candidates[i].get(field) for field in MEDIAN_FIELDS},
+        }
+        for i in order
+    ]
+    excluded = [
+        {"name": candidates[i]["name"], "reason": reasons[i]} for i in range(len(candidates)) if not eligible[i]
+    ]
+    return {"ranked": ranked, "excluded": excluded}
@@ -0,0 +1,93 @@
+import asyncio
+import os
+from datetime import datetime
+from typing import AsyncIterator, Optional
+
+from ibm_cloud_client import IBMCloudClient
+
+# -------------------------
+# Configuration
+# -------------------------
+# "rest" lists jobs straight from the REST jobs endpoint; "sdk" hydrates RuntimeJob objects
+JOB_LIST_SOURCE = os.getenv("JOB_LIST_SOURCE", "rest").lower()
+REST_PAGE_SIZE = int(os.getenv("REST_PAGE_SIZE", "100"))
+
+# REST spellings whose SDK JobStatus name differs (see STATUS_MAP in backend.py)
+REST_STATUS_ALIASES = {"FAILED": "ERROR"}
+
+
+def parse_rest_datetime(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def rest_status(row: dict) -> str:
+    state = row.get("state")
+    status = state.get("status") if isinstance(state, dict) else None
+    status = str(status or row.get("status") or "UNKNOWN").upper()
+    return REST_STATUS_ALIASES.get(status, status)
+
+
+def rest_job_fields(row: dict, instance: Optional[str]) -> dict:
+    """Maps one REST job row onto the accessor values fetch_job_fields reads from a RuntimeJob"""
+    created = parse_rest_datetime(row.get("created"))
+    ended = parse_rest_datetime(row.get("ended") or row.get("end_time"))
+    running = parse_rest_datetime(row.get("running"))
+    status = rest_status(row)
+
+    history = []
+    if created:
+        history.append({"status": "QUEUED", "datetime": created})
+    if running:
+        history.append({"status": "RUNNING", "datetime": running})
+    if ended:
+        history.append({"status": status, "datetime": ended})
+
+    return {
+        "job_id": row.get("id"),
+        "program_id": (row.get("program") or {}).get("id", ""),
+        "instance": instance,
+        "user": None,
+        "status": status,
+        "creation_date": created,
+        "end_date": ended,
+        "status_history": history or None,
+        "metrics": {"usage": row.get("usage") or {}},
+    }
+
+
+def rest_status_matches(row: dict, status: Optional[str]) -> bool:
+    return not status or rest_status(row) == REST_STATUS_ALIASES.get(status.upper(), status.upper())
+
+
+async def iter_rest_jobs(
+    client: IBMCloudClient, limit: int, status: Optional[str] = None, page_size: int = REST_PAGE_SIZE
+) -> AsyncIterator[dict]:
+    """Pages through the REST jobs endpoint, fetching page n+1 while page n is consumed"""
+    if not status:
+        page_size = min(page_size, limit)
+    # The endpoint only filters pending vs finished; exact statuses are matched here
+    pending = status.upper() in ("QUEUED", "RUNNING") if status else None
+    offset, sent = 0, 0
+    next_page = asyncio.ensure_future(client.get_jobs(limit=page_size, offset=offset, pending=pending))
+    try:
+        while next_page is not None:
+            rows = await next_page
+            offset += len(rows)
+            next_page = None
+            if len(rows) == page_size and (status or offset < limit):
+                next_page = asyncio.ensure_future(client.get_jobs(limit=page_size, offset=offset, pending=pending))
+            for row in rows:
+                if not rest_status_matches(row, status):
+                    continue
+                yield row
+                sent += 1
+                if sent >= limit:
+                    return
+    finally:
+        if next_page is not None:
+            next_page.cancel()
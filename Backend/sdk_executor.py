@@ -0,0 +1,190 @@
+import asyncio
+import contextvars
+import functools
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import instrumentation
+from upstream_scheduler import UpstreamScheduler, is_rate_limited, retry_after
+
+logger = logging.getLogger("quantum-tracker")
+
+# -------------------------
+# Configuration
+# -------------------------
+SDK_MAX_WORKERS = int(os.getenv("SDK_MAX_WORKERS", "32"))
+SDK_MAX_CONCURRENCY = int(os.getenv("SDK_MAX_CONCURRENCY", str(SDK_MAX_WORKERS)))
+SDK_CALL_TIMEOUT = float(os.getenv("SDK_CALL_TIMEOUT", "30"))
+
+
+class SDKExecutor:
+    """Runs blocking qiskit-ibm-runtime calls on a bounded worker pool, admitted by the upstream scheduler"""
+
+    def __init__(
+        self,
+        max_workers: int = SDK_MAX_WORKERS,
+        max_concurrency: Optional[int] = None,
+        call_timeout: float = SDK_CALL_TIMEOUT,
+        scheduler: Optional[UpstreamScheduler] = None,
+    ):
+        self.max_workers = max(1, max_workers)
+        self.max_concurrency = max(1, max_concurrency or SDK_MAX_CONCURRENCY)
+        self.call_timeout = call_timeout
+        self.scheduler = scheduler or UpstreamScheduler(self.max_concurrency)
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="sdk")
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        self.timeouts = 0
+        self.coalesced = 0
+
+    async def run(self, fn: Callable[..., Any], *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """Runs fn(*args, **kwargs) in the pool; raises asyncio.TimeoutError after the call timeout.
+
+        Identical calls already in flight share its result instead of calling upstream again.
+        """
+        key = coalesce_key(fn, args, kwargs)
+        if key is None:
+            return await self._run(fn, args, kwargs, timeout)
+        shared = self._inflight.get(key)
+        if shared is None or shared.get_loop() is not asyncio.get_running_loop():
+            shared = asyncio.ensure_future(self._run(fn, args, kwargs, timeout))
+            self._inflight[key] = shared
+            shared.add_done_callback(functools.partial(self._settled, key))
+        else:
+            self.coalesced += 1
+        # One caller giving up must not cancel the call for the others
+        return await asyncio.shield(shared)
+
+    def _settled(self, key: tuple, future: asyncio.Future):
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if not future.cancelled():
+            future.exception()  # Retrieved here in case every caller has gone
+
+    async def _run(self, fn: Callable[..., Any], args: tuple, kwargs: dict, timeout: Optional[float]) -> Any:
+        loop = asyncio.get_running_loop()
+        call = functools.partial(self._timed, fn, call_name(fn, args), *args, **kwargs)
+        queued = time.perf_counter()
+        await self.scheduler.acquire()
+        instrumentation.record("sdk.wait", time.perf_counter() - queued)
+        # Copy the request context so spans recorded on the worker land in its trace
+        future = loop.run_in_executor(self._pool, contextvars.copy_context().run, call)
+        # The slot is held until the worker returns, even after the caller stopped waiting,
+        # so the concurrency cap keeps bounding the calls actually in flight upstream
+        future.add_done_callback(self._completed)
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(future), timeout if timeout is not None else self.call_timeout
+            )
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            # The worker records its latency whenever it returns; the timeout itself is an error
+            instrumentation.upstream_failed(call_name(fn, args) or getattr(fn, "__qualname__", type(fn).__name__))
+            logger.warning(f"⏱️ SDK call {getattr(fn, '__name__', fn)} timed out")
+            raise
+
+    def _completed(self, future: asyncio.Future):
+        self.scheduler.release()
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is None:
+            self.scheduler.succeeded()
+        elif is_rate_limited(error):
+            self.scheduler.throttled(retry_after(error))
+
+    @staticmethod
+    def _timed(fn: Callable[..., Any], name: Optional[str], *args, **kwargs) -> Any:
+        if name is None:
+            return fn(*args, **kwargs)
+        if fn is safe_call:
+            # safe_call never raises, so the raw accessor is timed and its failure counted first
+            try:
+                with instrumentation.upstream(name):
+                    return call_accessor(*args, **kwargs)
+            except Exception as e:
+                if is_rate_limited(e):
+                    raise
+                return None
+        with instrumentation.upstream(name):
+            return fn(*args, **kwargs)
+
+    async def call(self, obj: Any, attr: str, timeout: Optional[float] = None) -> Any:
+        """Async counterpart of safe_call: returns None on failure or timeout, reported to collect_failures()"""
+        try:
+            return await self.run(call_accessor, obj, attr, timeout=timeout)
+        except Exception:
+            report_failure(attr)
+            return None
+
+    def stats(self) -> dict:
+        return {
+            "timeouts": self.timeouts,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+            "scheduler": self.scheduler.stats(),
+        }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def coalesce_key(fn: Callable[..., Any], args: tuple, kwargs: dict) -> Optional[tuple]:
+    """Identity of a call for coalescing; None when an argument is unhashable (e.g. the PUB
+    lists of a submission), so such calls always run on their own"""
+    key = (fn, args, tuple(sorted(kwargs.items())))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def call_name(fn: Callable[..., Any], args: tuple) -> Optional[str]:
+    """Upstream call label for the metrics; None for functions that time their own SDK calls"""
+    if getattr(fn, "instrumented", False):
+        return None
+    if fn in (safe_call, call_accessor) and len(args) > 1:
+        return f"{type(args[0]).__name__}.{args[1]}"
+    return getattr(fn, "__qualname__", type(fn).__name__)
+
+
+# Accessors that failed and were read as None, while a collect_failures() block is active
+_failures: contextvars.ContextVar[Optional[List[str]]] = contextvars.ContextVar("sdk_failures", default=None)
+
+
+@contextmanager
+def collect_failures() -> Iterator[List[str]]:
+    """Lists the accessors read as None within the block because they failed, not because they had no value"""
+    failures: List[str] = []
+    token = _failures.set(failures)
+    try:
+        yield failures
+    finally:
+        _failures.reset(token)
+
+
+def report_failure(name: str):
+    failures = _failures.get()
+    if failures is not None:
+        failures.append(name)
+
+
+def call_accessor(obj, attr):
+    """obj.attr(), or the attribute itself"""
+    val = getattr(obj, attr, None)
+    return val() if callable(val) else val
+
+
+def safe_call(obj, attr):
+    """obj.attr(), or the attribute itself; None on failure, except that 429s are raised so
+    the executor backs off"""
+    try:
+        return call_accessor(obj, attr)
+    except Exception as e:
+        if is_rate_limited(e):
+            raise
+        return None
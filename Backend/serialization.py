@@ -0,0 +1,227 @@
+import gzip
+import json
+import os
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from fastapi import Request, Response
+
+from instrumentation import span
+from job_store import TERMINAL_STATUSES, json_default
+
+# -------------------------
+# Configuration
+# -------------------------
+# Smaller bodies are sent uncompressed: the headers would outweigh the saving
+RESPONSE_COMPRESS_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESS_MIN_BYTES", "1024"))
+RESPONSE_GZIP_LEVEL = int(os.getenv("RESPONSE_GZIP_LEVEL", "5"))
+RESPONSE_ZSTD_LEVEL = int(os.getenv("RESPONSE_ZSTD_LEVEL", "3"))
+# Encoded terminal job records and cached documents kept in memory, per media type
+FRAGMENT_CACHE_SIZE = int(os.getenv("FRAGMENT_CACHE_SIZE", "20000"))
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+MSGPACK_TYPES = (MSGPACK, "application/x-msgpack")
+
+
+# -------------------------
+# Encoders
+# -------------------------
+def encode_json(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value, default=json_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(value, default=json_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def encode(value: Any, media_type: str) -> bytes:
+    if media_type == MSGPACK:
+        return msgpack.packb(value, default=json_default, use_bin_type=True)
+    return encode_json(value)
+
+
+def join_array(fragments: List[bytes], media_type: str) -> bytes:
+    """An array document from already encoded items"""
+    if media_type == MSGPACK:
+        return msgpack.Packer().pack_array_header(len(fragments)) + b"".join(fragments)
+    return b"[" + b",".join(fragments) + b"]"
+
+
+def quality_values(header: str) -> Dict[str, float]:
+    """An Accept or Accept-Encoding header as {media type or coding: q}"""
+    values = {}
+    for part in header.split(","):
+        item, *params = [piece.strip() for piece in part.split(";")]
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if item:
+            values[item.lower()] = q
+    return values
+
+
+def negotiate(request: Request) -> str:
+    """MessagePack when the client weights it at least as high as JSON (and it is installed);
+    q=0 refuses it"""
+    accepted = quality_values(request.headers.get("accept", ""))
+    weight = max(accepted.get(media_type, 0.0) for media_type in MSGPACK_TYPES)
+    if msgpack is None or weight <= 0:
+        return JSON
+    json_weight = accepted.get(JSON, accepted.get("application/*", accepted.get("*/*", 0.0)))
+    return MSGPACK if weight >= json_weight else JSON
+
+
+def content_encoding(request: Request) -> Optional[str]:
+    """zstd or gzip, whichever the client weights higher (zstd on a tie); q=0 refuses a coding"""
+    codings = quality_values(request.headers.get("accept-encoding", ""))
+    available = ("zstd", "gzip") if zstandard is not None else ("gzip",)
+    weights = {coding: codings.get(coding, codings.get("*", 0.0)) for coding in available}
+    best = max(available, key=lambda coding: weights[coding])
+    return best if weights[best] > 0 else None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=RESPONSE_ZSTD_LEVEL).compress(body)
+    return gzip.compress(body, compresslevel=RESPONSE_GZIP_LEVEL, mtime=0)
+
+
+# -------------------------
+# Fragment cache
+# -------------------------
+class FragmentCache:
+    """Encoded bytes of values that no longer change (terminal jobs, cached documents).
+
+    An entry may carry a version of what it was encoded from (a digest of the stored text
+    or of the record); it is only reused while the version is unchanged. Only the version
+    is kept, never the value itself.
+    """
+
+    def __init__(self, max_entries: int = FRAGMENT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, Tuple[Any, bytes]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self, key: tuple, media_type: str, build: Callable[[], Any], version: Any = None, cacheable: bool = True
+    ) -> bytes:
+        entry_key = (media_type, *key)
+        entry = self._entries.get(entry_key)
+        if entry is not None and entry[0] == version:
+            self._entries.move_to_end(entry_key)
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        data = encode(build(), media_type)
+        if cacheable and self.max_entries > 0:
+            self._entries[entry_key] = (version, data)
+            self._entries.move_to_end(entry_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return data
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "max_entries": self.max_entries, "hits": self.hits, "misses": self.misses}
+
+
+fragments = FragmentCache()
+
+
+def record_version(record: dict) -> int:
+    """Digest of a job record's top-level scalars (and list lengths): its nested parts
+    (status_and_usage, actual_qr_usage) are derived from the same SDK fields, so this
+    changes whenever the encoded record would"""
+    return hash(tuple(
+        (key, len(value) if isinstance(value, list) else value)
+        for key, value in record.items()
+        if not isinstance(value, dict)
+    ))
+
+
+def encode_records(records: Iterable[dict], media_type: str, kind: str) -> bytes:
+    """A job listing from per-record fragments; a terminal job is encoded again only when its record changes"""
+    return join_array(
+        [
+            fragments.get(
+                (kind, record.get("job_id")),
+                media_type,
+                lambda record=record: record,
+                # Records are built fresh per request, so a job whose record changed after it
+                # finished (e.g. its backend was resolved) gets a new version
+                version=record_version(record),
+                cacheable=record.get("status") in TERMINAL_STATUSES and "error" not in record,
+            )
+            for record in records
+        ],
+        media_type,
+    )
+
+
+def encode_stored(rows: Iterable[Tuple[str, str]], media_type: str) -> bytes:
+    """A listing from (job_id, stored JSON) rows: the JSON as is, or MessagePack cached per text"""
+    if media_type == JSON:
+        return join_array([payload.encode() for _, payload in rows], JSON)
+    return join_array(
+        [
+            fragments.get(("stored", job_id), media_type, lambda payload=payload: json.loads(payload), version=hash(payload))
+            for job_id, payload in rows
+        ],
+        media_type,
+    )
+
+
+def encode_document(data: bytes, media_type: str, key: str) -> bytes:
+    """A cached JSON document (shared or artifact cache) in the negotiated media type"""
+    if media_type == JSON:
+        return data
+    return fragments.get(("document", key), media_type, lambda: json.loads(data), version=hash(data))
+
+
+def merge_objects(*documents: bytes) -> bytes:
+    """One JSON object from encoded ones without decoding them; later keys win, as with {**a, **b}"""
+    bodies = [document.strip()[1:-1].strip() for document in documents]
+    return b"{" + b",".join(body for body in bodies if body) + b"}"
+
+
+# -------------------------
+# Responses
+# -------------------------
+def encoded_response(
+    request: Request, body: bytes, media_type: str, status_code: int = 200, headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """Response from an encoded body, compressed with zstd or gzip when the client accepts it"""
+    headers = {**(headers or {}), "Vary": "Accept, Accept-Encoding"}
+    encoding = content_encoding(request) if len(body) >= RESPONSE_COMPRESS_MIN_BYTES else None
+    if encoding:
+        with span("compress"):
+            body = compress(body, encoding)
+        headers["Content-Encoding"] = encoding
+    return Response(body, status_code=status_code, headers=headers, media_type=media_type)
+
+
+def respond(request: Request, value: Any, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Encodes value in the negotiated media type; replaces FastAPI's jsonable_encoder pass"""
+    media_type = negotiate(request)
+    with span("encode"):
+        body = encode(value, media_type)
+    return encoded_response(request, body, media_type, headers=headers)
@@ -0,0 +1,379 @@
+import asyncio
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, List, Optional
+from urllib.parse import urlparse
+
+from instrumentation import cache_event
+from job_store import json_default
+
+logger = logging.getLogger("quantum-tracker")
+
+# -------------------------
+# Configuration
+# -------------------------
+# redis://host:port/db to share state through Redis (or anything speaking its protocol);
+# empty keeps it in a SQLite file every worker on the host opens
+SHARED_CACHE_URL = os.getenv("SHARED_CACHE_URL", "")
+SHARED_CACHE_PATH = os.getenv(
+    "SHARED_CACHE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "shared.sqlite3")
+)
+LEADER_LEASE_SECONDS = float(os.getenv("LEADER_LEASE_SECONDS", "15"))
+# Expired rows of the SQLite store are deleted by the first write after this many seconds
+SHARED_CACHE_PURGE_INTERVAL = float(os.getenv("SHARED_CACHE_PURGE_INTERVAL", "60"))
+
+
+# -------------------------
+# Stores
+# -------------------------
+class SQLiteSharedCache:
+    """Key/value store with expiry in a SQLite file shared by the workers of one host"""
+
+    def __init__(self, path: str = SHARED_CACHE_PATH, purge_interval: float = SHARED_CACHE_PURGE_INTERVAL):
+        self.path = path
+        self.purge_interval = purge_interval
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._next_purge = time.monotonic() + purge_interval
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS kv_expires ON kv (expires) WHERE expires IS NOT NULL")
+
+    @staticmethod
+    def _expires(ttl: Optional[float]) -> Optional[float]:
+        return time.time() + ttl if ttl else None
+
+    def purge(self) -> int:
+        """Deletes every expired row; returns how many"""
+        with self._lock:
+            return self._purge()
+
+    def _purge(self) -> int:
+        self._next_purge = time.monotonic() + self.purge_interval
+        cursor = self._conn.execute("DELETE FROM kv WHERE expires IS NOT NULL AND expires <= ?", (time.time(),))
+        return cursor.rowcount
+
+    def _maybe_purge(self):
+        # Reads skip expired rows, but only writes remove them: lock keys and TTL'd values
+        # are unique per load, so without this the file grows with every one ever written
+        if time.monotonic() >= self._next_purge:
+            self._purge()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM kv WHERE key = ? AND (expires IS NULL OR expires > ?)", (key, time.time())
+            ).fetchone()
+        return bytes(row[0]) if row else None
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        with self._lock:
+            self._maybe_purge()
+            self._conn.execute(
+                "INSERT INTO kv (key, value, expires) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires = excluded.expires",
+                (key, value, self._expires(ttl)),
+            )
+
+    def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        """Sets key only if it is absent or expired; True if this call set it"""
+        with self._lock:
+            self._maybe_purge()
+            cursor = self._conn.execute(
+                "INSERT INTO kv (key, value, expires) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires = excluded.expires "
+                "WHERE kv.expires IS NOT NULL AND kv.expires <= ?",
+                (key, value, self._expires(ttl), time.time()),
+            )
+        return cursor.rowcount == 1
+
+    def renew(self, key: str, value: bytes, ttl: float) -> bool:
+        """Extends key's expiry if it still holds value; True on success"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE kv SET expires = ? WHERE key = ? AND value = ? AND expires > ?",
+                (self._expires(ttl), key, value, time.time()),
+            )
+        return cursor.rowcount == 1
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM kv WHERE key = ?", (key,))
+
+    def delete_if(self, key: str, value: bytes) -> bool:
+        """Deletes key only if it still holds value; True if this call deleted it"""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM kv WHERE key = ? AND value = ?", (key, value))
+        return cursor.rowcount == 1
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO kv (key, value, expires) VALUES (?, '1', NULL) "
+                "ON CONFLICT(key) DO UPDATE SET value = CAST(CAST(value AS INTEGER) + 1 AS TEXT)",
+                (key,),
+            )
+            return int(self._conn.execute("SELECT value FROM kv WHERE key = ?", (key,)).fetchone()[0])
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class RESPError(Exception):
+    pass
+
+
+# Compare-and-act scripts run atomically by the server, so no other client can change the
+# key between the comparison and the write
+RENEW_SCRIPT = (
+    "if redis.call('GET', KEYS[1]) == ARGV[1] then "
+    "return redis.call('PEXPIRE', KEYS[1], ARGV[2]) else return 0 end"
+)
+DELETE_IF_SCRIPT = (
+    "if redis.call('GET', KEYS[1]) == ARGV[1] then "
+    "return redis.call('DEL', KEYS[1]) else return 0 end"
+)
+
+
+class RESPSharedCache:
+    """Same interface over the Redis wire protocol (RESP2), one connection per worker"""
+
+    def __init__(self, url: str, timeout: float = 2.0):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 6379
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.password = parsed.password
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._sock: Optional[socket.socket] = None
+        self._reader = None
+
+    def _connect(self):
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._reader = self._sock.makefile("rb")
+        if self.password:
+            self._call("AUTH", self.password)
+        if self.db:
+            self._call("SELECT", self.db)
+
+    @staticmethod
+    def _encode(*args) -> bytes:
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(parts)
+
+    def _read(self) -> Any:
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by server")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode()
+        if kind == b"-":
+            raise RESPError(payload.decode())
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(payload)
+            return None if length < 0 else [self._read() for _ in range(length)]
+        raise RESPError(f"Unexpected reply {line!r}")
+
+    def _call(self, *args) -> Any:
+        self._sock.sendall(self._encode(*args))
+        return self._read()
+
+    def execute(self, *args) -> Any:
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._sock is None:
+                        self._connect()
+                    return self._call(*args)
+                except (OSError, ConnectionError):
+                    self._close_socket()
+                    if attempt:
+                        raise
+
+    def _close_socket(self):
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._reader = None
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.execute("GET", key)
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        if ttl:
+            self.execute("SET", key, value, "PX", int(ttl * 1000))
+        else:
+            self.execute("SET", key, value)
+
+    def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        args = ("SET", key, value, "NX") + (("PX", int(ttl * 1000)) if ttl else ())
+        return self.execute(*args) == "OK"
+
+    def renew(self, key: str, value: bytes, ttl: float) -> bool:
+        return self.execute("EVAL", RENEW_SCRIPT, 1, key, value, int(ttl * 1000)) == 1
+
+    def delete(self, key: str):
+        self.execute("DEL", key)
+
+    def delete_if(self, key: str, value: bytes) -> bool:
+        return self.execute("EVAL", DELETE_IF_SCRIPT, 1, key, value) == 1
+
+    def incr(self, key: str) -> int:
+        return self.execute("INCR", key)
+
+    def close(self):
+        with self._lock:
+            self._close_socket()
+
+
+def open_shared_cache(url: str = SHARED_CACHE_URL, path: str = SHARED_CACHE_PATH):
+    if url:
+        return RESPSharedCache(url)
+    return SQLiteSharedCache(path)
+
+
+# -------------------------
+# JSON values
+# -------------------------
+class SharedJSONCache:
+    """Async JSON helpers over a shared store, with cross-process single-flight loading"""
+
+    def __init__(self, store, lock_ttl: float = 10.0, poll: float = 0.05):
+        self.store = store
+        self.lock_ttl = lock_ttl
+        self.poll = poll
+        self.owner = uuid.uuid4().hex.encode()
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0
+
+    async def get_json(self, key: str) -> Optional[Any]:
+        data = await asyncio.to_thread(self.store.get, key)
+        return json.loads(data) if data is not None else None
+
+    async def set_json(self, key: str, value: Any, ttl: Optional[float] = None):
+        data = json.dumps(value, default=json_default).encode()
+        await asyncio.to_thread(self.store.set, key, data, ttl)
+
+    async def get_or_load_raw(self, key: str, ttl: float, loader: Callable[[], Awaitable[bytes]]) -> bytes:
+        """Returns the shared encoded value or loads it; across workers only the lock holder calls loader()"""
+        data = await asyncio.to_thread(self.store.get, key)
+        # Keys look like "backends:detail:<name>"; the first two parts label the metric
+        tier = ":".join(key.split(":")[:2])
+        if data is not None:
+            self.hits += 1
+            cache_event("shared", tier, "hits")
+            return data
+
+        lock_key = f"lock:{key}"
+        # Unique per load, so two loads of this worker cannot release each other's lock
+        token = self.owner + b":" + uuid.uuid4().hex[:8].encode()
+        locked = await asyncio.to_thread(self.store.add, lock_key, token, self.lock_ttl)
+        if not locked:
+            # Another worker is loading it: wait for its result rather than calling upstream too
+            self.waits += 1
+            cache_event("shared", tier, "coalesced")
+            deadline = time.monotonic() + self.lock_ttl
+            while time.monotonic() < deadline:
+                await asyncio.sleep(self.poll)
+                data = await asyncio.to_thread(self.store.get, key)
+                if data is not None:
+                    return data
+            # It gave up or is stuck: load here, taking the lock over if it has expired by now
+            locked = await asyncio.to_thread(self.store.add, lock_key, token, self.lock_ttl)
+        self.misses += 1
+        cache_event("shared", tier, "misses")
+        try:
+            data = await loader()
+            await asyncio.to_thread(self.store.set, key, data, ttl)
+            return data
+        finally:
+            # Only our own lock: one that another worker holds is left to it
+            if locked:
+                await asyncio.to_thread(self.store.delete_if, lock_key, token)
+
+    async def get_or_load(self, key: str, ttl: float, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """get_or_load_raw for JSON values"""
+        loaded = []
+
+        async def load_encoded() -> bytes:
+            loaded.append(await loader())
+            return json.dumps(loaded[0], default=json_default).encode()
+
+        data = await self.get_or_load_raw(key, ttl, load_encoded)
+        return loaded[0] if loaded else json.loads(data)
+
+    def stats(self) -> dict:
+        return {"backend": type(self.store).__name__, "hits": self.hits, "misses": self.misses, "waits": self.waits}
+
+
+# -------------------------
+# Leader election
+# -------------------------
+class LeaderElection:
+    """Lease-based election: the worker holding the lease key runs the upstream sync loops"""
+
+    def __init__(self, store, key: str = "leader", lease: float = LEADER_LEASE_SECONDS):
+        self.store = store
+        self.key = key
+        self.lease = lease
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}".encode()
+        self.is_leader = False
+        self.decided = False
+        self.listeners: List[Callable[[bool], None]] = []
+
+    def _try_acquire(self) -> bool:
+        if self.is_leader and self.store.renew(self.key, self.owner, self.lease):
+            return True
+        return self.store.add(self.key, self.owner, self.lease)
+
+    def release(self):
+        """Hands the lease over immediately on shutdown instead of letting it expire"""
+        if self.is_leader:
+            self.store.delete_if(self.key, self.owner)
+        self.is_leader, self.decided = False, False
+
+    async def run(self):
+        while True:
+            try:
+                acquired = await asyncio.to_thread(self._try_acquire)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Leader election failed: {e}")
+                acquired = False
+            # Listeners also hear the first outcome, so followers start their loops too
+            if acquired != self.is_leader or not self.decided:
+                self.is_leader, self.decided = acquired, True
+                logger.info(f"👑 Worker {os.getpid()} is {'the leader' if acquired else 'a follower'}")
+                for listener in self.listeners:
+                    listener(acquired)
+            await asyncio.sleep(self.lease / 3)
@@ -0,0 +1,42 @@
+import os
+import sys
+import tempfile
+import time
+
+import pytest
+
+# Modules live flat in Backend/, as uvicorn imports them
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The backend reads its configuration at import: point every store at a scratch directory
+# before any test imports it
+_DATA = tempfile.mkdtemp(prefix="quantum-tracker-tests-")
+os.environ.update(
+    JOB_STORE_PATH=os.path.join(_DATA, "jobs.sqlite3"),
+    ARTIFACT_CACHE_DIR=os.path.join(_DATA, "artifacts"),
+    SHARED_CACHE_PATH=os.path.join(_DATA, "shared.sqlite3"),
+    CALIBRATION_HISTORY_DIR=os.path.join(_DATA, "calibration"),
+    PROFILE_DIR=os.path.join(_DATA, "profiles"),
+    JOB_SYNC_INTERVAL="0.2",
+)
+
+
+@pytest.fixture(scope="session")
+def backend_app():
+    """The app on a fake QiskitRuntimeService, once its leader has synced the job store"""
+    import backend
+    from benchmarks.fake_runtime import FakeRuntimeService
+    from fastapi.testclient import TestClient
+
+    backend.service = FakeRuntimeService(num_jobs=120)
+    with TestClient(backend.app) as client:
+        deadline = time.monotonic() + 10
+        while not backend.store_ready() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert backend.store_ready(), "job store never synced"
+        yield backend, client
+
+
+@pytest.fixture
+def client(backend_app):
+    return backend_app[1]
@@ -0,0 +1,129 @@
+"""IBMCloudClient against the local IAM/REST stub"""
+import asyncio
+
+import httpx
+import pytest
+
+from benchmarks.stub_ibm_cloud import StubServer
+from ibm_cloud_client import IBMCloudClient
+
+
+@pytest.fixture
+def server():
+    with StubServer() as stub:
+        yield stub
+
+
+def make_client(server: StubServer, **kwargs) -> IBMCloudClient:
+    return IBMCloudClient(
+        "stub-api-key",
+        "crn:v1:bluemix:public:quantum-computing:us-east:a/stub::",
+        base_url=f"{server.url}/api/v1",
+        iam_url=f"{server.url}/identity/token",
+        backoff=0.01,
+        **kwargs,
+    )
+
+
+def test_token_refresh_is_single_flight(server):
+    async def scenario():
+        async with make_client(server) as client:
+            await asyncio.gather(*[client.get_backends() for _ in range(20)])
+            # Expire the token under load: every caller sees it stale at once
+            client.token_expiry = 0
+            await asyncio.gather(*[client.get_jobs(limit=5) for _ in range(20)])
+            return client.token_refreshes
+
+    assert asyncio.run(scenario()) == 2
+    assert server.state.token_requests == 2
+
+
+def test_retries_recover_from_429_and_5xx(server):
+    async def scenario():
+        async with make_client(server) as client:
+            await client.get_token()
+            server.state.failures = [429, 503, 502]
+            names = await client.get_backends()
+            return names, client.retries
+
+    names, retries = asyncio.run(scenario())
+    assert names
+    assert retries == 3
+
+
+def test_persistent_5xx_surfaces_after_max_retries(server):
+    async def scenario():
+        async with make_client(server) as client:
+            await client.get_token()
+            server.state.failures = [500] * 10
+            await client.get_backends()
+
+    with pytest.raises(httpx.HTTPStatusError) as error:
+        asyncio.run(scenario())
+    assert error.value.response.status_code == 500
+
+
+def test_per_request_timeout(server):
+    async def scenario():
+        async with make_client(server, max_retries=0) as client:
+            await client.get_token()
+            server.state.delay = 0.3
+            await client.get_backend_status("ibm_brisbane", timeout=0.05)
+
+    with pytest.raises(httpx.TimeoutException):
+        asyncio.run(scenario())
+
+
+def test_endpoints(server):
+    async def scenario():
+        async with make_client(server) as client:
+            jobs = await client.get_jobs(limit=10)
+            status = await client.get_job_status(jobs[0]["id"])
+            props = await client.get_backend_properties("ibm_brisbane")
+            config = await client.get_backend_configuration("ibm_brisbane")
+            return jobs, status, props, config
+
+    jobs, status, props, config = asyncio.run(scenario())
+    assert len(jobs) == 10
+    assert status == jobs[0]["status"]
+    assert len(props["qubits"]) == config["n_qubits"] == 127
+
+
+def test_background_refresh_backs_off_exponentially(server, monkeypatch):
+    client = make_client(server)
+    delays = []
+
+    async def record_sleep(seconds):
+        delays.append(seconds)
+        if len(delays) > 5:
+            raise asyncio.CancelledError
+
+    async def failing_refresh():
+        raise httpx.ConnectError("IAM unreachable")
+
+    monkeypatch.setattr("ibm_cloud_client.random.uniform", lambda low, high: high)
+    monkeypatch.setattr("ibm_cloud_client.asyncio.sleep", record_sleep)
+    client.refresh_token = failing_refresh
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(client._refresh_loop())
+    # Token sleeps (already expired: 0) alternate with the growing failure backoff
+    assert delays[1::2] == [0.1, 0.2, 0.4]
+
+
+def test_background_refresh_parks_after_rejected_api_key(server):
+    async def scenario():
+        async with make_client(server) as client:
+            server.state.failures = [400]
+            client.start()
+            await asyncio.wait_for(client._background, 2)
+            parked = client.auth_error
+            # A refresh on demand that succeeds again resumes the background loop
+            await client.refresh_token()
+            resumed = not client._background.done()
+            return parked, client.auth_error, resumed
+
+    parked, error_after, resumed = asyncio.run(scenario())
+    assert parked == "IAM rejected the API key (400)"
+    assert error_after is None
+    assert resumed
+    assert server.state.token_requests == 1
@@ -0,0 +1,130 @@
+"""JobStore and JobSync against the fake runtime: incremental sync, deltas and followers"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.fake_runtime import FakeJob, FakeRuntimeService
+from event_stream import EventHub
+from job_store import DATE_FORMAT, JobStore, JobSync, StoreFollower
+
+
+async def run_blocking(fn, *args, **kwargs):
+    return fn(*args, **kwargs)
+
+
+async def convert(job) -> dict:
+    return {
+        "job_id": job.job_id(),
+        "status": job.status().name,
+        "backend": job._backend_id,
+        "submitted": job.creation_date.strftime(DATE_FORMAT),
+    }
+
+
+def make_sync(tmp_path, service, **kwargs):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    return store, JobSync(store, service, convert, run_blocking, **kwargs)
+
+
+def add_jobs(service: FakeRuntimeService, count: int):
+    """Jobs created after every existing one, as new submissions upstream would be"""
+    start = len(service._jobs)
+    newest = max(job.creation_date for job in service._jobs)
+    for i in range(start, start + count):
+        job = FakeJob(i, calls=service.calls)
+        job.creation_date = newest + timedelta(minutes=i - start + 1)
+        job._status = "QUEUED"
+        service._jobs.append(job)
+
+
+def test_first_sync_backfills_the_newest_jobs(tmp_path):
+    service = FakeRuntimeService(num_jobs=50)
+    store, sync = make_sync(tmp_path, service, backfill=20, page_size=7)
+    asyncio.run(sync.sync_once())
+    assert store.count() == 20
+    newest = sorted(service._jobs, key=lambda job: job.creation_date, reverse=True)[:20]
+    assert {job["job_id"] for job in store.list_jobs(limit=None)} == {job.job_id() for job in newest}
+
+
+def test_later_syncs_page_through_every_new_job(tmp_path):
+    service = FakeRuntimeService(num_jobs=10)
+    store, sync = make_sync(tmp_path, service, backfill=10, page_size=4)
+    asyncio.run(sync.sync_once())
+    # More new jobs than the backfill and several pages of them
+    add_jobs(service, 25)
+    asyncio.run(sync.sync_once())
+    assert store.count() == 35
+
+
+def test_status_changes_reach_transition_listeners_but_not_the_backfill(tmp_path):
+    service = FakeRuntimeService(num_jobs=30)
+    store, sync = make_sync(tmp_path, service, backfill=30)
+    transitions = []
+    sync.transition_listeners.append(transitions.extend)
+    asyncio.run(sync.sync_once())
+    assert transitions == []
+
+    pending = next(job for job in service._jobs if job._status in ("QUEUED", "RUNNING"))
+    previous = pending._status
+    pending._status = "DONE"
+    asyncio.run(sync.sync_once())
+    assert [(r["job_id"], r["previous_status"], r["status"]) for r in transitions] == [
+        (pending.job_id(), previous, "DONE")
+    ]
+
+
+def test_jobs_deleted_upstream_leave_tombstones(tmp_path):
+    service = FakeRuntimeService(num_jobs=30)
+    store, sync = make_sync(tmp_path, service, backfill=30)
+    removed = []
+    sync.removal_listeners.append(removed.extend)
+    asyncio.run(sync.sync_once())
+    version = store.version()
+
+    pending = next(job for job in service._jobs if job._status in ("QUEUED", "RUNNING"))
+    service._jobs.remove(pending)
+    asyncio.run(sync.sync_once())
+    assert removed == [pending.job_id()]
+    assert store.get_job(pending.job_id()) is None
+    _, changed, dropped = store.changes_since(version, limit=100)
+    assert changed == [] and dropped == [pending.job_id()]
+
+
+def test_follower_reports_the_leaders_changes(tmp_path):
+    service = FakeRuntimeService(num_jobs=30)
+    store, sync = make_sync(tmp_path, service, backfill=30)
+    asyncio.run(sync.sync_once())
+    follower = StoreFollower(JobStore(store.path))
+    transitions, removed = [], []
+    follower.transition_listeners.append(transitions.extend)
+    follower.removal_listeners.append(removed.extend)
+
+    pending = [job for job in service._jobs if job._status in ("QUEUED", "RUNNING")][:2]
+    pending[0]._status = "ERROR"
+    service._jobs.remove(pending[1])
+    asyncio.run(sync.sync_once())
+    asyncio.run(follower.follow_once())
+    assert [(r["job_id"], r["status"]) for r in transitions] == [(pending[0].job_id(), "ERROR")]
+    assert 0 < transitions[0]["seq"] <= store.version()
+    assert removed == [pending[1].job_id()]
+
+
+def test_unchanged_records_do_not_bump_the_version(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    record = {"job_id": "a", "status": "QUEUED", "submitted": datetime.now(timezone.utc).strftime(DATE_FORMAT)}
+    store.upsert_many([record])
+    version = store.version()
+    assert store.upsert_many([record]) == []
+    assert store.version() == version
+
+
+def test_every_changed_record_is_reported_with_its_previous_status(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    record = {"job_id": "a", "status": "RUNNING", "submitted": datetime.now(timezone.utc).strftime(DATE_FORMAT)}
+    store.upsert_many([record])
+    changed = store.upsert_many([{**record, "qpu_seconds": 1.5}])
+    assert [(r["job_id"], r["previous_status"], r["status"]) for r in changed] == [("a", "RUNNING", "RUNNING")]
+
+    # The event stream keeps to status transitions
+    hub = EventHub()
+    hub.publish_job_changes(changed + store.upsert_many([{**record, "status": "DONE"}]))
+    assert [(data["previous_status"], data["status"]) for _, _, _, data in hub.since(0)] == [("RUNNING", "DONE")]
@@ -0,0 +1,178 @@
+"""Job listing endpoints on the fake runtime: stream cursors, ?since= deltas with ETags and
+idempotent batch submission"""
+import json
+
+import pytest
+
+from job_streaming import encode_cursor
+
+BELL = 'OPENQASM 2.0;include "qelib1.inc";qreg q[2];creg c[2];h q[0];cx q[0],q[1];measure q -> c;'
+
+
+def stream_lines(response) -> list:
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+def synthetic_job(job_id: str, status: str = "QUEUED") -> dict:
+    """A stored record with no upstream job behind it, so the running sync never rewrites it"""
+    return {
+        "job_id": job_id,
+        "status": status,
+        "backend": "ibm_brisbane",
+        "submitted": "2024-06-01 00:00:00",
+    }
+
+
+# -------------------------
+# Stream cursors
+# -------------------------
+def test_stream_pages_resume_from_the_returned_cursor(client):
+    first = stream_lines(client.get("/api/jobs/stream", params={"limit": 50}))
+    cursor = first[-1]["next_cursor"]
+    assert len(first) == 51 and cursor
+    second = stream_lines(client.get("/api/jobs/stream", params={"limit": 50, "cursor": cursor}))
+    seen = {job["job_id"] for job in first[:-1]}
+    assert seen.isdisjoint(job["job_id"] for job in second[:-1])
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not-a-cursor!",
+        encode_cursor("o", "abc"),
+        encode_cursor("o", -1),
+        encode_cursor("o", 1.5),
+        encode_cursor("s", 5),
+        encode_cursor("s", [1.0, 2]),
+        encode_cursor("x", 0),
+    ],
+)
+def test_stream_rejects_malformed_cursors(client, cursor):
+    response = client.get("/api/jobs/stream", params={"cursor": cursor})
+    assert response.status_code == 400
+    assert response.json()["detail"]["error"] == "Invalid cursor"
+
+
+def test_store_cursor_is_refused_by_the_upstream_listing(client):
+    cursor = encode_cursor("s", [1735689600.0, "fake000001"])
+    response = client.get("/api/jobs/stream", params={"cursor": cursor, "lite": "false"})
+    assert response.status_code == 400
+
+
+# -------------------------
+# ETags and ?since= deltas
+# -------------------------
+def test_store_listing_revalidates_with_its_etag(client):
+    response = client.get("/api/jobs", params={"limit": 1000, "lite": "true"})
+    etag = response.headers["etag"]
+    assert response.status_code == 200 and etag
+    cached = client.get("/api/jobs", params={"limit": 1000, "lite": "true"}, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+
+
+def test_since_returns_only_what_changed_after_the_cursor(backend_app):
+    backend, client = backend_app
+    backend.job_store.upsert_many([synthetic_job("delta-kept"), synthetic_job("delta-dropped")])
+    first = client.get("/api/jobs", params={"limit": 1000, "since": ""}).json()
+    assert first["full"] is True and first["cursor"]
+
+    backend.job_store.upsert_many([synthetic_job("delta-kept", status="RUNNING")])
+    backend.job_store.delete_many(["delta-dropped"])
+    delta = client.get("/api/jobs", params={"limit": 1000, "since": first["cursor"]}).json()
+    assert delta["full"] is False
+    assert [job["job_id"] for job in delta["jobs"]] == ["delta-kept"]
+    assert delta["jobs"][0]["status"] == "RUNNING"
+    assert delta["removed"] == ["delta-dropped"]
+
+    # Nothing written since: same cursor, empty delta
+    again = client.get("/api/jobs", params={"limit": 1000, "since": delta["cursor"]}).json()
+    assert again["full"] is False and again["jobs"] == [] and again["removed"] == []
+
+
+def test_since_from_another_store_falls_back_to_a_full_listing(client):
+    response = client.get("/api/jobs", params={"limit": 1000, "since": "elsewhere.0"})
+    assert response.status_code == 200
+    assert response.json()["full"] is True
+
+
+@pytest.mark.parametrize("params", [{"since": "bad"}, {"since": "", "fields": "job_id"}])
+def test_since_rejects_bad_cursors_and_projections(client, params):
+    assert client.get("/api/jobs", params=params).status_code == 400
+
+
+# -------------------------
+# Batch submission
+# -------------------------
+class FakeSubmittedJob:
+    submitted = 0
+
+    def __init__(self):
+        FakeSubmittedJob.submitted += 1
+        self._job_id = f"batch{FakeSubmittedJob.submitted:03d}"
+
+    def job_id(self):
+        return self._job_id
+
+
+class FakeSampler:
+    def __init__(self, mode):
+        self.mode = mode
+
+    def run(self, pubs, shots=None):
+        return FakeSubmittedJob()
+
+
+@pytest.fixture
+def batch_client(backend_app, monkeypatch):
+    import batch_submit
+    from qiskit.providers.fake_provider import GenericBackendV2
+
+    backend, client = backend_app
+    device = GenericBackendV2(5, seed=1)
+    device.name = "fake_generic"
+    monkeypatch.setattr(batch_submit, "SamplerV2", FakeSampler)
+    monkeypatch.setattr(backend.service, "backend", lambda name: device, raising=False)
+    return backend, client
+
+
+def submission_claims(backend) -> list:
+    rows = backend.shared_cache._conn.execute("SELECT key FROM kv WHERE key LIKE 'submissions:%'").fetchall()
+    return sorted(key for key, in rows)
+
+
+def test_retried_batch_with_the_same_key_is_replayed(batch_client):
+    backend, client = batch_client
+    body = {"backend": "fake_generic", "circuits": [{"qasm": BELL}]}
+    first = client.post("/api/jobs/batch", json=body, headers={"Idempotency-Key": "retry-1"})
+    assert first.status_code == 200
+    submitted = FakeSubmittedJob.submitted
+
+    retry = client.post("/api/jobs/batch", json=body, headers={"Idempotency-Key": "retry-1"})
+    assert retry.status_code == 200
+    assert retry.json()["jobs"] == first.json()["jobs"]
+    assert retry.json()["replayed"] is True
+    assert FakeSubmittedJob.submitted == submitted
+
+
+def test_batch_without_a_key_is_not_recorded(batch_client):
+    backend, client = batch_client
+    before = submission_claims(backend)
+    response = client.post("/api/jobs/batch", json={"backend": "fake_generic", "circuits": [{"qasm": BELL}]})
+    assert response.status_code == 200
+    assert "idempotency_key" not in response.json()
+    assert submission_claims(backend) == before
+
+
+def test_failed_batch_releases_its_key_for_a_retry(batch_client):
+    backend, client = batch_client
+    bad = {"backend": "fake_generic", "circuits": [{"template": "nope"}], "idempotency_key": "retry-2"}
+    assert client.post("/api/jobs/batch", json=bad).status_code == 400
+    good = {
+        "backend": "fake_generic",
+        "circuits": [{"template": "real_amplitudes", "parameter_values": [[0.1] * 4]}],
+        "idempotency_key": "retry-2",
+    }
+    response = client.post("/api/jobs/batch", json=good)
+    assert response.status_code == 200
+    assert response.json()["idempotency_key"] == "retry-2"
@@ -0,0 +1,43 @@
+"""QueueETA stratum bookkeeping: removals and the queue depth history"""
+from queue_eta import ETA_DEPTH_HISTORY_SECONDS, QueueETA
+
+START = 1_760_000_000.0
+
+
+def job(job_id: str, backend: str, wait: float) -> dict:
+    return {
+        "job_id": job_id,
+        "backend": backend,
+        "submitted": "2025-10-09 09:00:00",
+        "status_and_usage": {"pending_time": f"{wait}s"},
+    }
+
+
+def test_removed_jobs_leave_only_their_own_strata_rebuilt():
+    eta = QueueETA(min_samples=1)
+    eta.ingest_many([job(f"a{i}", "ibm_kyoto", 10.0 * i) for i in range(1, 6)])
+    eta.ingest_many([job("b1", "ibm_fez", 7.0)])
+    untouched = eta._digests[("ibm_fez", None, None)]
+
+    eta.remove_many(["a5", "a4", "missing"])
+    assert eta.predict("ibm_kyoto", None)["samples"] == 3
+    assert eta.predict("ibm_kyoto", None)["eta_seconds"]["p95"] <= 30.0
+    assert eta._digests[("ibm_fez", None, None)] is untouched
+
+    eta.remove_many(["a1", "a2", "a3"])
+    assert eta.predict("ibm_kyoto", None)["stratum"] is None
+    assert eta.stats()["jobs"] == 1
+
+
+def test_depth_lookup_uses_the_latest_recent_observation():
+    eta = QueueETA()
+    for i in range(10):
+        eta.observe_depths({"ibm_kyoto": {"pending_jobs": i}}, now=START + 60 * i)
+    assert eta.depth_at("ibm_kyoto", START + 60 * 4 + 30) == 4
+    assert eta.depth_at("ibm_kyoto", START - 1) is None
+    # Past ETA_DEPTH_MAX_GAP the last observation is too stale to stratify by
+    assert eta.depth_at("ibm_kyoto", START + 60 * 9 + 3600) is None
+
+    eta.observe_depths({"ibm_kyoto": {"pending_jobs": 42}}, now=START + ETA_DEPTH_HISTORY_SECONDS + 60 * 5)
+    assert eta.stats()["depth_samples"] == 6
+    assert eta.depth_at("ibm_kyoto", START + 60 * 2) is None
@@ -0,0 +1,114 @@
+import asyncio
+import functools
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from instrumentation import cache_event
+
+logger = logging.getLogger("quantum-tracker")
+
+# -------------------------
+# Configuration
+# -------------------------
+# Seconds each class of backend data stays fresh; override with BACKEND_CACHE_TTL_<TIER>
+DEFAULT_TTLS = {
+    "backends": 300.0,       # service.backends() / service.backend(name) objects
+    "status": 10.0,          # operational flag, pending_jobs
+    "configuration": 3600.0, # basis gates, processor type, version
+    "properties": 900.0,     # calibration data, refreshed upstream roughly daily
+}
+BACKEND_CACHE_MAX_ENTRIES = int(os.getenv("BACKEND_CACHE_MAX_ENTRIES", "1024"))
+
+
+def ttls_from_env(defaults: Dict[str, float] = DEFAULT_TTLS) -> Dict[str, float]:
+    return {
+        tier: float(os.getenv(f"BACKEND_CACHE_TTL_{tier.upper()}", ttl))
+        for tier, ttl in defaults.items()
+    }
+
+
+class TieredTTLCache:
+    """LRU cache with a TTL per data tier and single-flight loading"""
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, max_entries: int = BACKEND_CACHE_MAX_ENTRIES):
+        self.ttls = ttls or ttls_from_env()
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, Hashable], asyncio.Future] = {}
+        self._counters = {tier: {"hits": 0, "misses": 0, "coalesced": 0, "evictions": 0} for tier in self.ttls}
+
+    def _count(self, tier: str, counter: str):
+        self._counters.setdefault(tier, {"hits": 0, "misses": 0, "coalesced": 0, "evictions": 0})[counter] += 1
+        cache_event("memory", tier, counter)
+
+    def get(self, tier: str, key: Hashable) -> Tuple[bool, Any]:
+        """Returns (found, value) without loading"""
+        entry = self._entries.get((tier, key))
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[(tier, key)]
+            return False, None
+        self._entries.move_to_end((tier, key))
+        return True, value
+
+    def set(self, tier: str, key: Hashable, value: Any):
+        ttl = self.ttls.get(tier, 0.0)
+        self._entries[(tier, key)] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end((tier, key))
+        while len(self._entries) > self.max_entries:
+            (evicted_tier, _), _ = self._entries.popitem(last=False)
+            self._count(evicted_tier, "evictions")
+
+    async def get_or_load(self, tier: str, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Returns the cached value or awaits loader(); concurrent misses share one load"""
+        found, value = self.get(tier, key)
+        if found:
+            self._count(tier, "hits")
+            return value
+
+        inflight = self._inflight.get((tier, key))
+        if inflight is not None and inflight.get_loop() is asyncio.get_running_loop():
+            self._count(tier, "coalesced")
+        else:
+            self._count(tier, "misses")
+            inflight = asyncio.ensure_future(self._load(tier, key, loader))
+            self._inflight[(tier, key)] = inflight
+            inflight.add_done_callback(functools.partial(self._settled, (tier, key)))
+        # The load runs as its own task: one caller giving up must not cancel it for the others
+        return await asyncio.shield(inflight)
+
+    async def _load(self, tier: str, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        value = await loader()
+        self.set(tier, key, value)
+        return value
+
+    def _settled(self, inflight_key: Tuple[str, Hashable], future: asyncio.Future):
+        if self._inflight.get(inflight_key) is future:
+            del self._inflight[inflight_key]
+        if not future.cancelled():
+            future.exception()  # Retrieved here in case every caller has gone
+
+    def invalidate(self, tier: Optional[str] = None, key: Optional[Hashable] = None):
+        for entry_key in list(self._entries):
+            if (tier is None or entry_key[0] == tier) and (key is None or entry_key[1] == key):
+                del self._entries[entry_key]
+
+    def stats(self) -> dict:
+        sizes: Dict[str, int] = {}
+        for tier, _ in self._entries:
+            sizes[tier] = sizes.get(tier, 0) + 1
+        tiers = {}
+        for tier, counters in self._counters.items():
+            lookups = counters["hits"] + counters["misses"] + counters["coalesced"]
+            tiers[tier] = {
+                **counters,
+                "ttl": self.ttls.get(tier),
+                "size": sizes.get(tier, 0),
+                "hit_rate": round((counters["hits"] + counters["coalesced"]) / lookups, 4) if lookups else None,
+            }
+        return {"entries": len(self._entries), "max_entries": self.max_entries, "tiers": tiers}
@@ -0,0 +1,258 @@
+import asyncio
+import contextvars
+import logging
+import math
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Deque, Dict, Iterator, Optional
+
+import instrumentation
+
+logger = logging.getLogger("quantum-tracker")
+
+# -------------------------
+# Configuration
+# -------------------------
+# Upstream calls per second across the SDK and REST client; 0 means unlimited until IBM answers 429
+UPSTREAM_RATE_LIMIT = float(os.getenv("UPSTREAM_RATE_LIMIT", "0"))
+UPSTREAM_BURST = int(os.getenv("UPSTREAM_BURST", "20"))
+# Floor of the adaptive rate after repeated 429 responses
+UPSTREAM_MIN_RATE = float(os.getenv("UPSTREAM_MIN_RATE", "0.5"))
+# Pause after a 429 without a Retry-After header
+UPSTREAM_THROTTLE_SECONDS = float(os.getenv("UPSTREAM_THROTTLE_SECONDS", "5"))
+
+# Highest priority first: detail views a user is waiting on, dashboard refreshes, background sync
+LANES = ("interactive", "dashboard", "background")
+# Window over which the call rate is measured when a 429 arrives while unlimited
+RECENT_WINDOW = 10.0
+
+current_lane: contextvars.ContextVar[str] = contextvars.ContextVar("upstream_lane", default="background")
+
+
+@contextmanager
+def lane(name: str) -> Iterator[None]:
+    """Runs the block's upstream calls in the given priority lane"""
+    token = current_lane.set(name)
+    try:
+        yield
+    finally:
+        current_lane.reset(token)
+
+
+def is_rate_limited(error: Optional[BaseException]) -> bool:
+    """True for HTTP 429 errors: a status code of 429 on the error (httpx, requests, qiskit-ibm-runtime's
+    RequestsApiError) or on an error it was raised from, as the SDK wraps RequestsApiError"""
+    while error is not None:
+        response = getattr(error, "response", None)
+        status = getattr(error, "status_code", None) or getattr(response, "status_code", None)
+        if status == 429:
+            return True
+        error = error.__cause__
+    return False
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    value = headers.get("retry-after") if hasattr(headers, "get") else None
+    return float(value) if value and str(value).isdigit() else None
+
+
+class UpstreamScheduler:
+    """Admits upstream calls by priority lane, within a concurrency cap and a token bucket.
+
+    A waiting call of a higher lane is always admitted before any of a lower one. On a
+    429 the rate is halved (starting from the measured rate when unlimited) and calls
+    pause for Retry-After; every successful call then raises it by 1/rate, i.e. about
+    one call per second each second, up to UPSTREAM_RATE_LIMIT.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        rate_limit: float = UPSTREAM_RATE_LIMIT,
+        burst: int = UPSTREAM_BURST,
+        min_rate: float = UPSTREAM_MIN_RATE,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.limit = rate_limit if rate_limit > 0 else math.inf
+        self.rate = self.limit
+        self.burst = max(1, burst)
+        self.min_rate = min_rate
+        self.tokens = float(self.burst)
+        self.active = 0
+        self.paused_until = 0.0
+        self.throttles = 0
+        self._refilled = time.monotonic()
+        self._granted: Deque[float] = deque()
+        self._waiters: Dict[str, Deque[asyncio.Future]] = {name: deque() for name in LANES}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lanes = {name: {"granted": 0, "wait_seconds": 0.0, "max_wait_seconds": 0.0} for name in LANES}
+
+    # -------------------------
+    # Admission
+    # -------------------------
+    def _refill(self, now: float):
+        if math.isfinite(self.rate):
+            # Nothing accrues during a pause, and a burst never exceeds one second of the rate
+            start = max(self._refilled, self.paused_until)
+            self.tokens = min(max(1.0, min(self.burst, self.rate)), self.tokens + max(0.0, now - start) * self.rate)
+        else:
+            self.tokens = float(self.burst)
+        self._refilled = now
+
+    def _available(self, now: float) -> bool:
+        self._refill(now)
+        return self.active < self.max_concurrency and now >= self.paused_until and self.tokens >= 1
+
+    def _grant(self, now: float):
+        self.active += 1
+        self.tokens -= 1
+        self._granted.append(now)
+        while self._granted and self._granted[0] < now - RECENT_WINDOW:
+            self._granted.popleft()
+
+    def _dispatch(self):
+        """Admits waiting calls, highest lane first, while slots and tokens allow"""
+        now = time.monotonic()
+        blocked = False
+        for name in LANES:
+            waiters = self._waiters[name]
+            while waiters and not blocked:
+                if waiters[0].done():
+                    waiters.popleft()  # Cancelled, not yet removed by its caller
+                elif self._available(now):
+                    self._grant(now)
+                    waiters.popleft().set_result(None)
+                else:
+                    blocked = True
+        if blocked:
+            self._schedule(now)
+        self._report_depths()
+
+    def _schedule(self, now: float):
+        # A free slot arrives with release(); a missing token or a pause needs a timer
+        if self.active >= self.max_concurrency:
+            return
+        loop = asyncio.get_running_loop()
+        if self._timer is not None and self._timer_loop is loop:
+            return
+        delay = max(self.paused_until - now, (1 - self.tokens) / self.rate if math.isfinite(self.rate) else 0.0)
+        self._timer, self._timer_loop = loop.call_later(delay, self._on_timer), loop
+
+    def _on_timer(self):
+        self._timer = None
+        self._dispatch()
+
+    def _report_depths(self):
+        for name in LANES:
+            instrumentation.registry.set_gauge(
+                "quantum_upstream_queue_depth", (("lane", name),), len(self._waiters[name])
+            )
+
+    async def acquire(self, lane_name: Optional[str] = None):
+        name = lane_name or current_lane.get()
+        queued = time.monotonic()
+        ahead = any(self._waiters[n] for n in LANES[:LANES.index(name) + 1])
+        if not ahead and self._available(queued):
+            self._grant(queued)
+        else:
+            future = asyncio.get_running_loop().create_future()
+            self._waiters[name].append(future)
+            self._report_depths()
+            self._dispatch()
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.cancelled():
+                    self._waiters[name].remove(future)
+                    self._report_depths()
+                else:
+                    # Admitted just as the caller was cancelled: hand the slot on
+                    self.release()
+                raise
+        wait = time.monotonic() - queued
+        stats = self._lanes[name]
+        stats["granted"] += 1
+        stats["wait_seconds"] += wait
+        stats["max_wait_seconds"] = max(stats["max_wait_seconds"], wait)
+        instrumentation.registry.observe("quantum_upstream_queue_wait_seconds", (("lane", name),), wait)
+
+    def release(self):
+        self.active -= 1
+        if any(self._waiters.values()):
+            self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, lane_name: Optional[str] = None):
+        await self.acquire(lane_name)
+        try:
+            yield
+        finally:
+            self.release()
+
+    # -------------------------
+    # Adaptive rate
+    # -------------------------
+    def throttled(self, seconds: Optional[float] = None):
+        """IBM answered 429: halve the rate and pause every lane"""
+        now = time.monotonic()
+        if now < self.paused_until:
+            # The rest of a burst that was already in flight: extend the pause only
+            self.paused_until = max(self.paused_until, now + (seconds or 0))
+            return
+        self.throttles += 1
+        if math.isfinite(self.rate):
+            current = self.rate
+        else:
+            # Calls admitted per second lately (over at least a second, so a burst is not overrated)
+            span = max(1.0, now - self._granted[0]) if self._granted else RECENT_WINDOW
+            current = len(self._granted) / span
+        self._refill(now)
+        self.rate = max(self.min_rate, current / 2)
+        self.tokens = min(self.tokens, 0.0)
+        self.paused_until = now + (seconds if seconds is not None else UPSTREAM_THROTTLE_SECONDS)
+        logger.warning(
+            f"🚦 Upstream rate limited: pausing {self.paused_until - now:.1f}s, then {self.rate:.1f} calls/s"
+        )
+
+    def succeeded(self):
+        if self.rate < self.limit:
+            self._refill(time.monotonic())
+            self.rate = min(self.limit, self.rate + 1 / self.rate)
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "active": self.active,
+            "rate_limit": self.limit if math.isfinite(self.limit) else None,
+            "rate": round(self.rate, 2) if math.isfinite(self.rate) else None,
+            "paused_for": round(max(0.0, self.paused_until - time.monotonic()), 2),
+            "throttles": self.throttles,
+            "lanes": {
+                name: {
+                    "waiting": len(self._waiters[name]),
+                    "granted": stats["granted"],
+                    "avg_wait_ms": round(stats["wait_seconds"] / stats["granted"] * 1e3, 2) if stats["granted"] else 0,
+                    "max_wait_ms": round(stats["max_wait_seconds"] * 1e3, 2),
+                }
+                for name, stats in self._lanes.items()
+            },
+        }
+
+
+class LaneMiddleware:
+    """Assigns each HTTP request's upstream calls to a lane chosen by classify(method, path)"""
+
+    def __init__(self, app, classify):
+        self.app = app
+        self.classify = classify
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with lane(self.classify(scope["method"], scope["path"])):
+            await self.app(scope, receive, send)
@@ -11,9 +11,13 @@ import 'server-only';
 import { ai } from '@/ai/genkit';
 import { z } from 'genkit';
 
+const API_BASE_URL = process.env.BACKEND_API_URL || "http://localhost:8000";
+
 const AnalyzeJobAnomaliesInputSchema = z.object({
   jobData: z.string().describe('JSON string containing an array of job objects, each with properties like status, backend, submitted time, elapsed time, etc.'),
   isDemo: z.boolean().optional().describe('If true, returns simulated anomaly data without calling the LLM.'),
+  jobsScreened: z.number().optional().describe('Number of jobs the backend screened to produce the candidates.'),
+  candidates: z.string().optional().describe('JSON string of the statistically pre-screened candidates from the backend /api/anomalies endpoint. When present, only these are explained instead of scanning jobData.'),
 });
 export type AnalyzeJobAnomaliesInput = z.infer<typeof AnalyzeJobAnomaliesInputSchema>;
 
@@ -40,6 +44,17 @@ const prompt = ai.definePrompt({
   output: { schema: AnalyzeJobAnomaliesOutputSchema },
   prompt: `You are an expert AI system administrator for a quantum computing platform. Your task is to analyze job data to detect and explain anomalies in a way that is clear for both students and expert researchers.
 
+{{#if candidates}}
+The backend has already screened the whole job history statistically and flagged the candidates below, worst first. Each candidate has a 'kind':
+- 'queue_time' / 'run_time': a job whose queue or execution time is far above its backend's median (robust z-score of log seconds, MAD based).
+- 'inconsistent_timeline': a job that started running before it was created (negative queue time).
+- 'error_burst': a window in which far more jobs failed on a backend than its overall error rate predicts; 'job_ids' lists the failed jobs.
+- 'calibration_regression': a backend whose latest calibration is much worse than its recent snapshots.
+
+Explain these candidates only; do not look for further anomalies. Use the candidate's job ID as 'jobId' (the first of 'job_ids' for an error burst, the backend name for a calibration regression) and keep its 'severity'. Mention in the summary that {{jobsScreened}} jobs were screened.
+
+The candidates are provided as a JSON string: {{{candidates}}}
+{{else}}
 Analyze the provided job data for anomalies like:
 - Unusually long queue times.
 - Unexpected or frequent failures.
@@ -48,9 +63,10 @@ Analyze the provided job data for anomalies like:
 
 Prioritize identifying anomalies that indicate system performance issues or potential hardware failures.
 
-For each anomaly, provide a detailed but easy-to-understand 'anomalyDescription'. Explain what the anomaly is, why it's a concern, and what it could indicate about the system or the job itself.
-
 The job data is provided as a JSON string: {{{jobData}}}
+{{/if}}
+
+For each anomaly, provide a detailed but easy-to-understand 'anomalyDescription'. Explain what the anomaly is, why it's a concern, and what it could indicate about the system or the job itself.
 
 Present your findings as a JSON object with:
 1. 'anomalies': array of specific findings.
@@ -76,7 +92,7 @@ const analyzeJobAnomaliesFlow = ai.defineFlow(
     }
 
     try {
-      const { output } = await prompt(input);
+      const { output } = await prompt({ ...input, ...(await fetchCandidates()) });
       return output!;
     } catch (error: any) {
       console.error('Error analyzing job anomalies:', error);
@@ -92,6 +108,23 @@ const analyzeJobAnomaliesFlow = ai.defineFlow(
   }
 );
 
+// Pre-screened candidates from the backend, so the prompt stays small however long the job history is.
+// Falls back to the client's job data when the backend is unreachable.
+async function fetchCandidates(): Promise<Partial<AnalyzeJobAnomaliesInput>> {
+  try {
+    const response = await fetch(`${API_BASE_URL}/api/anomalies?limit=25`, { cache: 'no-store' });
+    if (!response.ok) {
+      console.warn(`⚠️ Anomaly pre-screening unavailable (${response.status}). Analyzing raw job data.`);
+      return {};
+    }
+    const screened = await response.json();
+    return { candidates: JSON.stringify(screened.candidates), jobsScreened: screened.jobs_screened };
+  } catch (error) {
+    console.warn("⚠️ Anomaly pre-screening unavailable. Analyzing raw job data.", error);
+    return {};
+  }
+}
+
 // Helper for mock data
 function generateMockAnomalies(): AnalyzeJobAnomaliesOutput {
   return {
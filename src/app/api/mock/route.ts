@@ -5,6 +5,8 @@ import type { Job, Backend, Metrics, ChartData, DailyJobSummary, ConnectivityDat
 import { subMinutes, subHours, subDays, format, formatISO, parseISO, isSameDay, startOfDay, eachDayOfInterval, endOfWeek, startOfWeek, endOfMonth, startOfMonth, eachWeekOfInterval, addMinutes } from "date-fns";
 
 const API_BASE_URL = process.env.BACKEND_API_URL || "http://localhost:8000";
+// The rollups are labelled in local time, as date-fns computes them below when the backend has none
+const SERVER_TIME_ZONE = Intl.DateTimeFormat().resolvedOptions().timeZone;
 
 // ✅ Simple in-memory cache for mock data (optional)
 let mockCache: { data: any; timestamp: number } | null = null;
@@ -294,28 +296,117 @@ async function generateMockData(force = false) {
   return { ...data, source: "mock" };
 }
 
+function summaryToDashboard(summary: any) {
+  const counts = (bucket: any) => ({
+    COMPLETED: bucket.COMPLETED,
+    RUNNING: bucket.RUNNING,
+    QUEUED: bucket.QUEUED,
+    ERROR: bucket.ERROR,
+  });
+
+  const chartData: ChartData[] = summary.hourly.map((bucket: any) => ({ time: bucket.label, ...counts(bucket) }));
+  const periodicReportData: PeriodicReportData = {
+    weekly: summary.weekly.map((bucket: any) => ({ date: bucket.label, ...counts(bucket) })),
+    monthly: summary.monthly.map((bucket: any) => ({ date: bucket.label, ...counts(bucket) })),
+  };
+  const dailySummary: DailyJobSummary = {
+    date: summary.today.date,
+    totalCompleted: summary.today.totalCompleted,
+    completedByBackend: summary.today.completedByBackend.map((entry: { name: string; value: number }, i: number) => ({
+      ...entry,
+      fill: `hsl(var(--chart-${(i % 5) + 1}))`,
+    })),
+  };
+
+  return { chartData, dailySummary, periodicReportData };
+}
+
+// ✅ Last job listing and backend list, kept current with deltas and ETag revalidation
+// so a poll only downloads what changed
+const JOBS_LIMIT = 1000;
+let jobsState: { cursor: string | null; jobs: any[] } = { cursor: null, jobs: [] };
+let backendsState: { etag: string | null; data: any[] } = { etag: null, data: [] };
+
+async function fetchJobs(): Promise<any[]> {
+  // Recent jobs in lite mode; with a cursor only those changed since the last poll
+  const response = await fetch(
+    `${API_BASE_URL}/api/jobs?limit=${JOBS_LIMIT}&lite=true&since=${jobsState.cursor ?? ""}`,
+    { cache: 'no-store' }
+  );
+  if (!response.ok) {
+    throw new Error(`Jobs API Error: ${response.status} ${response.statusText}`);
+  }
+  const delta = await response.json();
+  if (delta.full) {
+    jobsState = { cursor: delta.cursor, jobs: delta.jobs };
+    return jobsState.jobs;
+  }
+
+  const replaced = new Set<string>([...delta.removed, ...delta.jobs.map((j: any) => j.job_id)]);
+  const jobs = [...delta.jobs, ...jobsState.jobs.filter(j => !replaced.has(j.job_id))];
+  // Newest first, as the backend lists them ("YYYY-MM-DD HH:MM:SS" sorts as text)
+  jobs.sort((a, b) => (b.submitted || "").localeCompare(a.submitted || "") || b.job_id.localeCompare(a.job_id));
+  jobsState = { cursor: delta.cursor, jobs: jobs.slice(0, JOBS_LIMIT) };
+  return jobsState.jobs;
+}
+
+async function fetchBackends(): Promise<any[]> {
+  const response = await fetch(`${API_BASE_URL}/api/backends`, {
+    cache: 'no-store',
+    headers: backendsState.etag ? { 'If-None-Match': backendsState.etag } : {},
+  });
+  if (response.status === 304) {
+    return backendsState.data;
+  }
+  if (!response.ok) {
+    throw new Error(`Backend API Error: ${response.status} ${response.statusText}`);
+  }
+  backendsState = { etag: response.headers.get('etag'), data: await response.json() };
+  return backendsState.data;
+}
+
+// ✅ Coupling graph from the backend's compact form (CSR arrays + per-edge/per-qubit calibration)
+async function fetchConnectivity(backendName: string): Promise<ConnectivityData> {
+  const response = await fetch(`${API_BASE_URL}/api/backends/${encodeURIComponent(backendName)}/connectivity`, {
+    cache: 'no-store',
+  });
+  if (!response.ok) {
+    throw new Error(`Connectivity API Error: ${response.status} ${response.statusText}`);
+  }
+  const graph = await response.json();
+  const { pairs, error } = graph.edges;
+
+  // Qubits of the best subgraph of the largest precomputed size form the core
+  const sizes = Object.keys(graph.subgraphs).map(Number).sort((a, b) => b - a);
+  const core = new Set<number>(graph.subgraphs[sizes[0]]?.[0]?.qubits ?? []);
+  const nodes = Array.from({ length: graph.num_qubits }, (_, id) => ({
+    id,
+    group: core.has(id) ? 'core' : 'ancillary',
+  }));
+  const links = error.map((e: number | null, i: number) => ({
+    source: pairs[2 * i],
+    target: pairs[2 * i + 1],
+    value: e === null ? 0 : 1 - e, // 2Q gate fidelity
+  }));
+
+  return { nodes, links, chains: graph.chains, subgraphs: graph.subgraphs };
+}
+
 async function getRealData() {
   const startTime = Date.now();
-  const [backendsResponse, jobsResponse, metricsResponse] = await Promise.all([
-    fetch(`${API_BASE_URL}/api/backends`),
-    fetch(`${API_BASE_URL}/api/jobs?limit=1000&lite=true`), // Fetch recent jobs with lite mode for speed
-    fetch(`${API_BASE_URL}/api/metrics`)
+  const [apiBackends, apiJobs, metricsResponse, summaryResponse] = await Promise.all([
+    fetchBackends(),
+    fetchJobs(),
+    fetch(`${API_BASE_URL}/api/metrics`),
+    // Chart and report rollups over the whole job history, bucketed in this server's time zone
+    fetch(`${API_BASE_URL}/api/dashboard/summary?tz=${encodeURIComponent(SERVER_TIME_ZONE)}`)
   ]);
   const endTime = Date.now();
 
-  if (!backendsResponse.ok) {
-    throw new Error(`Backend API Error: ${backendsResponse.status} ${backendsResponse.statusText}`);
-  }
-  if (!jobsResponse.ok) {
-    throw new Error(`Jobs API Error: ${jobsResponse.status} ${jobsResponse.statusText}`);
-  }
   if (!metricsResponse.ok) {
     throw new Error(`Metrics API Error: ${metricsResponse.status} ${metricsResponse.statusText}`);
   }
 
-
-  const apiBackends = await backendsResponse.json();
-  const apiJobs = await jobsResponse.json();
   const apiMetrics: Metrics = await metricsResponse.json();
 
   const backends: Backend[] = apiBackends.map((b: any) => ({
@@ -346,6 +437,13 @@ async function getRealData() {
     api_speed: endTime - startTime,
   };
 
+  // ✅ Rollups computed by the backend in one pass; recomputed here only from the jobs above if unavailable
+  if (summaryResponse.ok) {
+    const summary = await summaryResponse.json();
+    const { chartData, dailySummary, periodicReportData } = summaryToDashboard(summary);
+    return { jobs, backends, metrics, chartData, dailySummary, periodicReportData, source: "real" };
+  }
+
   const now = new Date();
   const chartData: ChartData[] = Array.from({ length: 12 }, (_, i) => {
     const time = subHours(now, 11 - i);
@@ -377,10 +475,22 @@ export async function GET(request: NextRequest) {
   const force = searchParams.get('force') === 'true';
 
 
-  // Handle connectivity request for mock API
+  // Handle connectivity request: real coupling graph, or mock in demo mode
   const connectivityMatch = pathname.match(/\/api\/backends\/(.+)\/connectivity/);
-  if (isDemo && connectivityMatch && connectivityMatch[1]) {
+  if (connectivityMatch && connectivityMatch[1]) {
     const backendName = connectivityMatch[1];
+    if (!isDemo) {
+      try {
+        console.log(`✅ Fetching connectivity of ${backendName} from Python backend...`);
+        return NextResponse.json(await fetchConnectivity(backendName));
+      } catch (error: any) {
+        console.error("❌ Error fetching connectivity:", error);
+        return NextResponse.json({
+          ...generateMockConnectivity(backendName),
+          note: `Could not connect to the real backend: ${error.message}. Displaying mock data instead.`,
+        });
+      }
+    }
     console.log(`⚡️ Fetching mock connectivity data for ${backendName}...`);
     const connectivityData = generateMockConnectivity(backendName);
     return NextResponse.json(connectivityData);
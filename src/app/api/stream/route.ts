@@ -0,0 +1,34 @@
+import { NextResponse } from 'next/server';
+import type { NextRequest } from 'next/server';
+
+const API_BASE_URL = process.env.BACKEND_API_URL || "http://localhost:8000";
+
+// Never prerendered or cached: every request is a long-lived event stream
+export const dynamic = 'force-dynamic';
+
+// ✅ Relays the Python backend's server-sent events (job transitions, backend status deltas)
+// to the browser, which cannot reach BACKEND_API_URL itself
+export async function GET(request: NextRequest) {
+  // EventSource reconnects send the last event id; the backend replays what was missed
+  const lastEventId = request.headers.get('last-event-id');
+  try {
+    const upstream = await fetch(`${API_BASE_URL}/api/stream`, {
+      cache: 'no-store',
+      headers: lastEventId ? { 'Last-Event-ID': lastEventId } : {},
+      signal: request.signal,
+    });
+    if (!upstream.ok || !upstream.body) {
+      return NextResponse.json({ error: `Stream API Error: ${upstream.status} ${upstream.statusText}` }, { status: 502 });
+    }
+    return new Response(upstream.body, {
+      headers: {
+        'Content-Type': 'text/event-stream',
+        'Cache-Control': 'no-cache, no-transform',
+        'X-Accel-Buffering': 'no',
+      },
+    });
+  } catch (error: any) {
+    console.error("❌ Error opening event stream:", error);
+    return NextResponse.json({ error: `Could not connect to the real backend: ${error.message}` }, { status: 502 });
+  }
+}
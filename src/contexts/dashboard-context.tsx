@@ -1,7 +1,7 @@
 
 "use client";
 
-import { createContext, useContext, useState, useCallback, useEffect, ReactNode } from "react";
+import { createContext, useContext, useState, useCallback, useEffect, useRef, ReactNode } from "react";
 import { useToast } from "@/hooks/use-toast";
 import type { Job, Backend, Metrics, ChartData, DailyJobSummary, PeriodicReportData } from "@/lib/types";
 
@@ -26,6 +26,11 @@ interface DashboardContextType {
 
 const DashboardContext = createContext<DashboardContextType | undefined>(undefined);
 
+// Demo data, or live data while the event stream is down, is polled at this interval
+const POLL_INTERVAL_MS = 30000;
+// Stream events arriving within this window are folded into one refetch
+const STREAM_REFRESH_DELAY_MS = 1000;
+
 export function DashboardProvider({ children }: { children: ReactNode }) {
   const [isDemo, setIsDemo] = useState(true);
   const [autoRefresh, setAutoRefresh] = useState(true);
@@ -91,11 +96,49 @@ export function DashboardProvider({ children }: { children: ReactNode }) {
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [isDemo]);
 
+  // The stream handlers outlive renders, so they call the latest fetchData through a ref
+  const fetchDataRef = useRef(fetchData);
+  useEffect(() => {
+    fetchDataRef.current = fetchData;
+  }, [fetchData]);
+
   useEffect(() => {
     if (!autoRefresh) return;
-    const interval = setInterval(() => fetchData(), 30000); // Poll every 30 seconds
-    return () => clearInterval(interval);
-  }, [autoRefresh, fetchData]);
+    // Demo data has no backend to stream from
+    if (isDemo || typeof EventSource === 'undefined') {
+      const interval = setInterval(() => fetchDataRef.current(), POLL_INTERVAL_MS);
+      return () => clearInterval(interval);
+    }
+
+    // Live data refetches when the backend reports a job transition or backend status change
+    // (or a reset, after missing events); the route then only downloads the delta
+    let pending: ReturnType<typeof setTimeout> | null = null;
+    let poll: ReturnType<typeof setInterval> | null = null;
+    const refresh = () => {
+      if (pending) return;
+      pending = setTimeout(() => {
+        pending = null;
+        fetchDataRef.current();
+      }, STREAM_REFRESH_DELAY_MS);
+    };
+    const events = new EventSource('/api/stream');
+    ["job", "backend", "reset"].forEach(type => events.addEventListener(type, refresh));
+    events.onopen = () => {
+      if (poll) {
+        clearInterval(poll);
+        poll = null;
+      }
+    };
+    // EventSource reconnects by itself, resuming from its last event id; poll until it does
+    events.onerror = () => {
+      if (!poll) poll = setInterval(() => fetchDataRef.current(), POLL_INTERVAL_MS);
+    };
+    return () => {
+      events.close();
+      if (pending) clearTimeout(pending);
+      if (poll) clearInterval(poll);
+    };
+  }, [autoRefresh, isDemo]);
 
   const value = {
     isDemo,
@@ -67,9 +67,18 @@ export interface QubitLink {
   value: number; // Represents entanglement strength/fidelity
 }
 
+export interface QubitLayout {
+  qubits: number[];
+  fidelity: number; // Estimated: readout of every qubit and one 2Q gate per edge used
+  mean_2q_error: number | null;
+}
+
 export interface ConnectivityData {
   nodes: QubitNode[];
   links: QubitLink[];
+  // Precomputed by the backend per calibration, keyed by qubit count
+  chains?: Record<string, QubitLayout[]>;
+  subgraphs?: Record<string, QubitLayout[]>;
 }
 
 export interface PeriodicReportDataPoint {